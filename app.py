@@ -1,7 +1,12 @@
+import os
 import streamlit as st
 import pandas as pd
-from io import StringIO, BytesIO
-from processor import procesar_global
+from processor import completar_diario, construir_vistas
+from export import FORMATOS
+from cache import file_hash
+from ingesta import ErrorLectura, ingerir
+from store import STORE_PATH, KpiStore
+from perfilado import Tracer, activar, etapa
 
 # =====================================================
 # 🔧 CONFIGURACIÓN DE PÁGINA
@@ -9,24 +14,6 @@ from processor import procesar_global
 st.set_page_config(page_title="CLAIRPORT – Consolidado Global", layout="wide")
 st.title("📊 Consolidado Global Aeroportuario – CLAIRPORT")
 
-# =====================================================
-# 📥 FUNCIONES DE LECTURA
-# =====================================================
-
-def read_generic_csv(uploaded_file):
-    raw = uploaded_file.read()
-    uploaded_file.seek(0)
-    text = raw.decode("latin-1").replace("ï»¿","").replace("\ufeff","")
-    sep = ";" if text.count(";") > text.count(",") else ","
-    return pd.read_csv(StringIO(text), sep=sep, engine="python")
-
-def read_auditorias_csv(uploaded_file):
-    raw = uploaded_file.read()
-    uploaded_file.seek(0)
-    text = raw.decode("latin-1").replace("ï»¿","").replace("\ufeff","")
-    # Auditorías viene tabulado con ';'
-    return pd.read_csv(StringIO(text), sep=";", engine="python")
-
 # =====================================================
 # 📁 CARGA DE ARCHIVOS
 # =====================================================
@@ -67,103 +54,225 @@ if not date_from or not date_to:
 date_from = pd.to_datetime(date_from)
 date_to = pd.to_datetime(date_to)
 
+usar_historico = st.checkbox(
+    "📚 Acumular en histórico local y consolidar desde él",
+    help=f"Los KPIs diarios de cada carga se guardan en {STORE_PATH} (el período que cubre cada export reemplaza al guardado); "
+         "las vistas se arman con todo el histórico, no solo con los archivos subidos.",
+)
+
+perfilar = st.checkbox(
+    "🔬 Medir tiempo y memoria por etapa",
+    help="Registra tiempo, CPU, pico de memoria y filas de cada lector, process_*, merge, "
+         "vistas y Excel. Agrega overhead (tracemalloc): usar solo para diagnosticar.",
+)
+
 st.divider()
 
+# =====================================================
+# 🧠 LECTURA + PROCESAMIENTO (MEMOIZADO)
+# =====================================================
+
+# Resultados en memoria entre reruns de Streamlit
+MEMO_TTL = int(os.environ.get("CLAIRPORT_MEMO_TTL", "3600"))        # segundos
+MEMO_MAX_ENTRIES = int(os.environ.get("CLAIRPORT_MEMO_MAX", "8"))
+
+
+def hash_archivo(uploaded_file) -> str:
+    """Hash del contenido, calculado una sola vez por archivo subido."""
+    hashes = st.session_state.setdefault("_hashes", {})
+    if uploaded_file.file_id not in hashes:
+        hashes[uploaded_file.file_id] = file_hash(uploaded_file)
+    return hashes[uploaded_file.file_id]
+
+
+@st.cache_data(ttl=MEMO_TTL, max_entries=MEMO_MAX_ENTRIES, show_spinner="Procesando fuentes…")
+def cargar_diario(claves, perfilar, _archivos):
+    """
+    Etapa cara e independiente del rango: lectura + tablas diarias por fuente
+    y tabla diaria completa. Memoizada solo por el hash de cada archivo
+    (_archivos no participa de la clave). Sin efectos: el upsert al histórico
+    se hace una vez por clic en Procesar, fuera de la caché.
+    """
+    tracer = Tracer() if perfilar else None
+    with activar(tracer):
+        frames, tiempos, cache_stats = ingerir(
+            {k: (f.name, f.getvalue()) for k, f in _archivos.items()}
+        )
+        df_full = completar_diario(frames)
+    perfil = tracer.registros if tracer is not None else []
+    return frames, df_full, tiempos, cache_stats, perfil
+
+
+@st.cache_data(ttl=MEMO_TTL, max_entries=MEMO_MAX_ENTRIES, show_spinner="Armando vistas…")
+def consolidar(claves, usar_historico, perfilar, date_from, date_to, version_historico, _archivos):
+    """
+    Recorte por rango + vistas, memoizado por (hashes, histórico, rango).
+    Con histórico, la tabla diaria sale del KpiStore completo y version_historico
+    (KpiStore.version) invalida el resultado cuando otra carga lo modificó.
+    """
+    _, df_full, tiempos, cache_stats, perfil = cargar_diario(claves, perfilar, _archivos)
+
+    tracer = Tracer() if perfilar else None
+    with activar(tracer):
+        if usar_historico:
+            with etapa("histórico"):
+                df_full = KpiStore().construir_diario()
+        df_diario, df_sem, df_periodo, df_transp = construir_vistas(df_full, date_from, date_to)
+    if tracer is not None:
+        perfil = perfil + tracer.registros
+    return df_diario, df_sem, df_periodo, df_transp, tiempos, cache_stats, perfil
+
+
+@st.cache_data(ttl=MEMO_TTL, max_entries=MEMO_MAX_ENTRIES, show_spinner=False)
+def archivo_descarga(formato, perfilar, df_diario, df_sem, df_periodo, df_transp):
+    """
+    (archivo de descarga en el formato elegido, registros de perfilado).
+    Se genera recién al pedir la descarga y queda memoizado por el contenido
+    de las vistas (el hash de los DataFrames): volver a descargar el mismo
+    resultado no lo rearma. Con perfilar, la generación (p.ej. el writer del
+    Excel) se mide con un Tracer propio: corre en otro hilo, fuera del script.
+    """
+    generar, _, _ = FORMATOS[formato]
+    tracer = Tracer() if perfilar else None
+    with activar(tracer):
+        data = generar(df_diario, df_sem, df_periodo, df_transp)
+    return data, tracer.registros if tracer is not None else []
+
+
 # =====================================================
 # 🚀 BOTÓN PROCESAR
 # =====================================================
 
+archivos = {
+    "ventas": ventas_file, "perf": perf_file, "aud": auditorias_file, "off": offtime_file,
+    "dur90": dur90_file, "dur30": dur30_file, "ins": inspecciones_file,
+    "aband": abandonados_file, "resc": rescates_file, "wa": whatsapp_file,
+}
+
 if st.button("🚀 Procesar Consolidado Global", type="primary"):
 
     # Validar que todos estén cargados
-    required = [
-        ventas_file, perf_file, auditorias_file, offtime_file,
-        dur90_file, dur30_file, inspecciones_file,
-        abandonados_file, rescates_file, whatsapp_file
-    ]
-
-    if not all(required):
+    if not all(archivos.values()):
         st.error("❌ Debes cargar TODOS los archivos antes de procesar.")
         st.stop()
 
-    # =====================================================
-    # 📂 LECTURA SEGURA
-    # =====================================================
-
-    try:
-        df_ventas = (
-            pd.read_excel(ventas_file)
-            if ventas_file.name.endswith(".xlsx")
-            else read_generic_csv(ventas_file)
-        )
-        df_perf = read_generic_csv(perf_file)
-        df_aud = read_auditorias_csv(auditorias_file)
-        df_off = read_generic_csv(offtime_file)
-        df_dur90 = read_generic_csv(dur90_file)
-        df_dur30 = read_generic_csv(dur30_file)
-        df_ins = pd.read_excel(inspecciones_file)
-        df_aband = pd.read_excel(abandonados_file)
-        df_resc = read_generic_csv(rescates_file)
-        df_wa = read_generic_csv(whatsapp_file)
-
-    except Exception as e:
-        st.error(f"❌ Error leyendo archivos: {e}")
-        st.stop()
+    claves = tuple((k, hash_archivo(f)) for k, f in archivos.items())
+    st.session_state["consolidado"] = claves
+
+    # El histórico se escribe solo aquí, una vez por clic: un rerun (mover las
+    # fechas) o un acierto / expiración de la caché no vuelve a escribirlo
+    if usar_historico:
+        tracer = Tracer() if perfilar else None
+        try:
+            frames = cargar_diario(claves, perfilar, archivos)[0]
+            with activar(tracer):
+                with etapa("histórico upsert"):
+                    KpiStore().upsert_frames(frames)
+        except ErrorLectura as e:
+            st.error(f"❌ Error leyendo archivos: {e}")
+            st.stop()
+        except Exception as e:
+            st.error(f"❌ Error guardando en el histórico: {e}")
+            st.stop()
+        st.session_state["historico"] = (claves, tracer.registros if tracer is not None else [])
+
+# Una vez procesados los archivos, el resultado se mantiene en los reruns y
+# mover las fechas solo recorta la tabla diaria ya calculada
+claves = st.session_state.get("consolidado")
+if claves is None or not all(archivos.values()):
+    st.stop()
 
-    # =====================================================
-    # 🧠 PROCESAMIENTO GLOBAL
-    # =====================================================
+if tuple((k, hash_archivo(f)) for k, f in archivos.items()) != claves:
+    st.info("ℹ️ Cambiaron los archivos: vuelve a procesar para actualizar el consolidado.")
+    st.stop()
 
-    try:
-        df_diario, df_sem, df_periodo, df_transp = procesar_global(
-            df_ventas, df_perf, df_aud, df_off,
-            df_dur90, df_dur30, df_ins,
-            df_aband, df_resc, df_wa,
-            date_from, date_to
-        )
-    except Exception as e:
-        st.error(f"❌ Error procesando datos: {e}")
-        st.stop()
+historico = st.session_state.get("historico")
+if usar_historico and (historico is None or historico[0] != claves):
+    st.info("ℹ️ Esta carga no está en el histórico: vuelve a procesar para guardarla y consolidar desde él.")
+    st.stop()
 
-    st.success("✅ Consolidado generado con éxito")
+try:
+    version = KpiStore().version() if usar_historico else None
+    df_diario, df_sem, df_periodo, df_transp, tiempos, cs, perfil = consolidar(
+        claves, usar_historico, perfilar, date_from, date_to, version, archivos
+    )
+except ErrorLectura as e:
+    st.error(f"❌ Error leyendo archivos: {e}")
+    st.stop()
+except Exception as e:
+    st.error(f"❌ Error procesando datos: {e}")
+    st.stop()
 
-    st.subheader("📅 Diario")
-    st.dataframe(df_diario)
+if usar_historico:
+    perfil = perfil + historico[1]
+
+# Perfil de las descargas de este resultado: el callable de st.download_button
+# corre en otro hilo y no puede usar st.*, así que deja sus registros en este
+# dict de session_state y el panel los muestra en la corrida siguiente
+resultado = (claves, usar_historico, perfilar, date_from, date_to, version)
+descargas = st.session_state.get("perfil_descargas")
+if descargas is None or descargas["resultado"] != resultado:
+    descargas = st.session_state["perfil_descargas"] = {"resultado": resultado, "registros": {}}
+perfil = perfil + [r for registros in descargas["registros"].values() for r in registros]
+
+st.success("✅ Consolidado generado con éxito")
+st.caption(
+    f"💾 Caché de archivos: {cs['hits']} aciertos · {cs['misses']} lecturas nuevas · "
+    f"{cs['bytes_saved'] / 1024 ** 2:.1f} MB sin re-parsear"
+)
+
+with st.expander(f"⏱️ Tiempos por fuente (ingesta en paralelo: {cs['wall_s']:.2f} s)"):
+    st.dataframe(tiempos)
+
+if perfil:
+    tracer = Tracer()
+    tracer.extender(perfil)
+    with st.expander("🔬 Perfil por etapa (tiempo, CPU, memoria, filas)"):
+        st.caption(
+            "pico_mem_mb: pico de tracemalloc sobre lo asignado al inicio de la etapa · "
+            "rss_max_mb: máximo RSS del proceso al terminarla · nivel: anidamiento · "
+            "la generación de una descarga aparece en la corrida siguiente al clic en 💾 Descargar"
+        )
+        st.dataframe(tracer.to_frame())
+        st.download_button(
+            "⬇️ Exportar perfil (JSON)",
+            data=tracer.to_json(),
+            file_name="perfil_consolidado.json",
+            mime="application/json",
+        )
 
-    st.subheader("📆 Semanal")
-    st.dataframe(df_sem)
+st.subheader("📅 Diario")
+st.dataframe(df_diario)
 
-    st.subheader("📊 Periodo")
-    st.dataframe(df_periodo)
+st.subheader("📆 Semanal")
+st.dataframe(df_sem)
 
-    st.subheader("📐 Vista Traspuesta")
-    st.dataframe(df_transp)
+st.subheader("📊 Periodo")
+st.dataframe(df_periodo)
 
-    # =====================================================
-    # 📥 DESCARGA EXCEL
-    # =====================================================
+st.subheader("📐 Vista Traspuesta")
+st.dataframe(df_transp)
 
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-        df_diario.to_excel(writer, index=False, sheet_name="Diario")
-        df_sem.to_excel(writer, index=False, sheet_name="Semanal")
-        df_periodo.to_excel(writer, index=False, sheet_name="Periodo")
-        df_transp.to_excel(writer, index=False, sheet_name="Vista_Traspuesta")
+# =====================================================
+# 📥 DESCARGA
+# =====================================================
 
-        # Estilo Cabify
-        workbook = writer.book
-        ws = writer.sheets["Vista_Traspuesta"]
-        purple = workbook.add_format({"bg_color": "#4A2B8D", "font_color": "white", "bold": True})
+# El archivo se arma al hacer clic (no en cada corrida); CSV y Parquet son
+# más rápidos que el Excel con formato si solo se necesitan los datos
+formato = st.radio("Formato de descarga", list(FORMATOS), horizontal=True)
+_, file_name, mime = FORMATOS[formato]
 
-        for i, col in enumerate(df_transp.columns):
-            if isinstance(col, str) and col.startswith("Semana "):
-                ws.set_column(i, i, 22, purple)
 
-    st.download_button(
-        "💾 Descargar Excel",
-        data=output.getvalue(),
-        file_name="Consolidado_Global.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
+def generar_descarga(formato=formato, registros=descargas["registros"]):
+    data, perfil_descarga = archivo_descarga(formato, perfilar, df_diario, df_sem, df_periodo, df_transp)
+    if perfil_descarga:
+        registros[formato] = perfil_descarga
+    return data
 
 
+st.download_button(
+    f"💾 Descargar {formato}",
+    data=generar_descarga,
+    file_name=file_name,
+    mime=mime,
+)
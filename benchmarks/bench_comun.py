@@ -0,0 +1,62 @@
+"""
+Helpers comunes de los benchmarks de motores (bench_polars, bench_duckdb):
+exports CSV sintéticos, la referencia en pandas, cronómetro, comparación y el
+chequeo de los textos nulos que usan los motores.
+
+Solo depende de pandas: cada benchmark importa su propio motor opcional.
+"""
+import os
+import sys
+import time
+from io import BytesIO
+
+import pandas as pd
+from pandas._libs.parsers import STR_NA_VALUES
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from generadores import ARCHIVOS, generar_fuentes  # noqa: E402
+from ingesta import FUENTES, lector_para  # noqa: E402
+from readers import VALORES_NULOS  # noqa: E402
+
+
+def exports_csv(filas: int, dias: int, seed: int) -> dict:
+    """{fuente: bytes del CSV}, como los escribe escribir_exports."""
+    return {
+        fuente: b"\xef\xbb\xbf" + df.to_csv(index=False, sep=ARCHIVOS[fuente][1] or ",").encode("latin-1")
+        for fuente, df in generar_fuentes(filas, dias, seed).items()
+    }
+
+
+def con_pandas(nombre: str, data: bytes, date_from, date_to):
+    reader, kwargs = lector_para(nombre, f"{nombre}.csv")
+    return FUENTES[nombre](reader(BytesIO(data), **kwargs), date_from=date_from, date_to=date_to)
+
+
+def cronometrar(fn, *args, repeticiones: int = 3):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        mejor = min(mejor, time.perf_counter() - t0)
+    return out, mejor
+
+
+def iguales(a: pd.DataFrame, b: pd.DataFrame) -> bool:
+    # Mismos valores: un conteo puede quedar int en un motor y float en el otro
+    try:
+        pd.testing.assert_frame_equal(a, b, check_dtype=False, check_exact=False, rtol=1e-12)
+    except AssertionError as e:
+        print(e)
+        return False
+    return True
+
+
+def nulos_como_pandas() -> bool:
+    """readers.VALORES_NULOS (nulos de los motores) es la lista por defecto de read_csv."""
+    faltan = sorted(STR_NA_VALUES - set(VALORES_NULOS))
+    sobran = sorted(set(VALORES_NULOS) - STR_NA_VALUES)
+    if faltan or sobran:
+        print(f"VALORES_NULOS difiere de pandas: faltan {faltan}, sobran {sobran}")
+        return False
+    return True
@@ -0,0 +1,77 @@
+"""
+Benchmark + verificación: motor DuckDB (motor_duckdb) vs process_* de pandas.
+
+Para las fuentes que cubre el motor (Ventas, Performance, WhatsApp) compara:
+  - pandas: read_generic_csv + process_*
+  - duckdb: motor_duckdb.procesar (SQL sobre read_csv del CSV crudo)
+Verifica que:
+  - las tablas diarias tengan los mismos valores, con y sin rango de fechas
+  - con la ruta del CSV (como en el CLI) el resultado sea el mismo que con los bytes
+  - los textos nulos del motor (readers.VALORES_NULOS) sean los de read_csv
+Sale con código 1 si algo difiere.
+
+Uso:
+    python benchmarks/bench_duckdb.py --rows 100000 1000000 --days 365
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import motor_duckdb  # noqa: E402
+from bench_comun import con_pandas, cronometrar, exports_csv, iguales, nulos_como_pandas  # noqa: E402
+from generadores import INICIO  # noqa: E402
+from processor import _indexar_fecha  # noqa: E402
+
+
+def con_duckdb(nombre: str, data, date_from, date_to):
+    return motor_duckdb.procesar(nombre, data, date_from, date_to)[0]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000], help="Filas de Ventas (el resto escala)")
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--window", type=int, default=30, help="Días del rango verificado (al final del período)")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    fin = pd.Timestamp(INICIO) + pd.Timedelta(days=args.days - 1)
+    rangos = [(None, None), (fin - pd.Timedelta(days=args.window - 1), fin)]
+    ok = nulos_como_pandas()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for filas in args.rows:
+            datos = exports_csv(filas, args.days, args.seed)
+
+            print(f"\n{filas:,} filas de Ventas")
+            print(f"{'fuente':>8} {'MB':>7} {'pandas (ms)':>12} {'duckdb (ms)':>12} {'speedup':>8}")
+            for nombre in motor_duckdb.CONSULTAS:
+                data = datos[nombre]
+                for rango in rangos:
+                    a, t_pd = cronometrar(con_pandas, nombre, data, *rango, repeticiones=args.repeat)
+                    b, t_db = cronometrar(con_duckdb, nombre, data, *rango, repeticiones=args.repeat)
+                    if not iguales(_indexar_fecha(a), _indexar_fecha(b)):
+                        print(f"DIFERENCIA en {nombre} (rango {rango})")
+                        ok = False
+                    if rango == (None, None):
+                        mb = len(data) / 2 ** 20
+                        print(f"{nombre:>8} {mb:>7.1f} {t_pd * 1000:>12.1f} {t_db * 1000:>12.1f} {t_pd / t_db:>7.1f}x")
+                        ruta = os.path.join(tmp, f"{nombre}.csv")
+                        with open(ruta, "wb") as f:
+                            f.write(data)
+                        if not iguales(b, con_duckdb(nombre, ruta, *rango)):
+                            print(f"DIFERENCIA en {nombre} leyendo la ruta del CSV")
+                            ok = False
+
+    print("\nResultados idénticos" if ok else "\nHAY DIFERENCIAS")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark: lectura de las fuentes .xlsx (Ventas, Inspecciones, Abandonados).
+
+Compara pd.read_excel por defecto (openpyxl, todas las columnas) contra
+read_excel_source con proyección de columnas, con openpyxl y con calamine
+(si python-calamine está instalado), sobre libros sintéticos.
+
+Uso:
+    python benchmarks/bench_excel.py --rows 200000
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from readers import read_excel_source  # noqa: E402
+
+
+def libros_sinteticos(n: int, directorio: str, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    fechas = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365 * 86400, n), unit="s")
+
+    ventas = pd.DataFrame({
+        "tm_start_local_at": fechas,
+        "journey_id": rng.integers(0, n // 3 + 1, n).astype(str),
+        "ds_product_name": rng.choice(["van_compartida", "van_exclusive", "otro"], n),
+        "finishReason": rng.choice(["FINISH_REASON_DROPOFF", "FINISH_REASON_CANCEL"], n),
+        "qt_price_local": rng.integers(5000, 40000, n),
+    })
+    # Columnas que ningún processor usa (los exports BI traen decenas)
+    for i in range(10):
+        ventas[f"extra_{i}"] = rng.choice(["a", "b", "c"], n) if i % 2 else rng.random(n)
+
+    inspecciones = pd.DataFrame({
+        "Fecha": fechas,
+        "Patente": rng.choice(["AB1234", "CD5678", "EF9012"], n),
+        "Cumplimiento Exterior": rng.choice([100, 80, np.nan], n),
+        "Cumplimiento Interior": rng.choice([100, 50], n),
+        "Cumplimiento Conductor": rng.choice([100, 90], n),
+        "Observaciones": rng.choice(["", "Sucio", "OK"], n),
+    })
+
+    abandonados = pd.DataFrame({
+        "Marca temporal": fechas,
+        "Correo": rng.choice(["a@x.com", "b@x.com"], n),
+        "Motivo": rng.choice(["Espera", "Otro"], n),
+    })
+
+    rutas = {}
+    for nombre, df in [("ventas", ventas), ("ins", inspecciones), ("aband", abandonados)]:
+        ruta = os.path.join(directorio, f"{nombre}.xlsx")
+        with pd.ExcelWriter(ruta, engine="xlsxwriter", engine_kwargs={"options": {"constant_memory": True}}) as w:
+            df.to_excel(w, index=False)
+        rutas[nombre] = ruta
+    return rutas
+
+
+def leer_proyectado(ruta: str, nombre: str, motor: str) -> pd.DataFrame:
+    with open(ruta, "rb") as f:
+        return read_excel_source(f, fuente=nombre, engine=motor)
+
+
+def cronometrar(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=200_000)
+    args = ap.parse_args()
+
+    motores = ["openpyxl"]
+    if importlib.util.find_spec("python_calamine"):
+        motores.append("calamine")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rutas = libros_sinteticos(args.rows, tmp)
+
+        print(f"filas: {args.rows:,}")
+        print(f"{'fuente':>8} {'read_excel (s)':>15} " + " ".join(f"{m + '+usecols (s)':>20}" for m in motores))
+        for nombre, ruta in rutas.items():
+            base = cronometrar(lambda: pd.read_excel(ruta))
+            tiempos = [
+                cronometrar(lambda: leer_proyectado(ruta, nombre, m))
+                for m in motores
+            ]
+            print(f"{nombre:>8} {base:>15.2f} " + " ".join(f"{t:>20.2f}" for t in tiempos))
+
+
+if __name__ == "__main__":
+    main()
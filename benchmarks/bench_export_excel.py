@@ -0,0 +1,119 @@
+"""
+Benchmark: exportación del consolidado a .xlsx.
+
+Compara la exportación anterior (pd.ExcelWriter + to_excel por hoja en un
+BytesIO) contra export.escribir_excel (xlsxwriter en modo constant_memory,
+filas escritas con write_row desde los arrays de cada columna) sobre las
+vistas de construir_vistas para rangos de varios días.
+
+Se mide tiempo y pico de memoria Python (tracemalloc, en una corrida aparte)
+y se verifica que ambos libros tengan las mismas hojas, celdas y estilos
+(fechas y columnas "Semana " en morado) leyéndolos con openpyxl.
+
+Uso:
+    python benchmarks/bench_export_excel.py --days 90 365 730
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from io import BytesIO
+
+import openpyxl
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from export import escribir_excel  # noqa: E402
+from processor import construir_diario, construir_vistas  # noqa: E402
+from generadores import generar_fuentes  # noqa: E402
+
+
+def generar_excel_anterior(df_diario, df_sem, df_periodo, df_transp) -> bytes:
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
+        df_diario.to_excel(writer, index=False, sheet_name="Diario")
+        df_sem.to_excel(writer, index=False, sheet_name="Semanal")
+        df_periodo.to_excel(writer, index=False, sheet_name="Periodo")
+        df_transp.to_excel(writer, index=False, sheet_name="Vista_Traspuesta")
+
+        workbook = writer.book
+        ws = writer.sheets["Vista_Traspuesta"]
+        purple = workbook.add_format({"bg_color": "#4A2B8D", "font_color": "white", "bold": True})
+
+        for i, col in enumerate(df_transp.columns):
+            if isinstance(col, str) and col.startswith("Semana "):
+                ws.set_column(i, i, 22, purple)
+
+    return output.getvalue()
+
+
+def streaming(ruta, vistas) -> None:
+    escribir_excel(ruta, *vistas)
+
+
+def anterior(ruta, vistas) -> None:
+    with open(ruta, "wb") as f:
+        f.write(generar_excel_anterior(*vistas))
+
+
+def medir(fn, ruta, vistas, repeticiones: int):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        fn(ruta, vistas)
+        mejor = min(mejor, time.perf_counter() - t0)
+
+    tracemalloc.start()
+    fn(ruta, vistas)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return mejor, pico
+
+
+def celdas(ruta) -> dict:
+    """{hoja: [(valor, formato de número, negrita, relleno) por celda]}."""
+    wb = openpyxl.load_workbook(ruta)
+    out = {}
+    for ws in wb.worksheets:
+        out[ws.title] = [
+            (c.value, c.number_format, c.font.b, c.fill.fgColor.rgb if c.fill.fill_type else None)
+            for fila in ws.iter_rows() for c in fila
+        ]
+        # las columnas con estilo de columna (sin celda propia) se comparan aparte
+        out[ws.title + ":cols"] = sorted(
+            (k, d.width, d.style) for k, d in ws.column_dimensions.items() if d.customWidth
+        )
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--days", type=int, nargs="+", default=[90, 365, 730])
+    ap.add_argument("--rows-per-day", type=int, default=50, help="Filas de Ventas por día al generar")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    print(f"{'días':>6} {'celdas':>9} {'to_excel (ms)':>14} {'streaming (ms)':>15} {'speedup':>8} "
+          f"{'pico antes (MB)':>16} {'pico ahora (MB)':>16}")
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta_a = os.path.join(tmp, "anterior.xlsx")
+        ruta_b = os.path.join(tmp, "streaming.xlsx")
+        for dias in args.days:
+            diario = construir_diario(*generar_fuentes(dias * args.rows_per_day, dias).values())
+            vistas = construir_vistas(diario, diario["fecha"].min(), diario["fecha"].max())
+            n_celdas = sum(v.size for v in vistas)
+
+            t_a, pico_a = medir(anterior, ruta_a, vistas, args.repeat)
+            t_b, pico_b = medir(streaming, ruta_b, vistas, args.repeat)
+
+            assert celdas(ruta_a) == celdas(ruta_b), "los libros no coinciden"
+
+            print(f"{dias:>6} {n_celdas:>9,} {t_a * 1000:>14.1f} {t_b * 1000:>15.1f} {t_a / t_b:>7.1f}x "
+                  f"{pico_a / 2 ** 20:>16.1f} {pico_b / 2 ** 20:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: parser de fechas de Auditorías.
+
+Compara el apply fila a fila (_to_date_aud) contra parse_fecha_auditorias
+sobre una columna sintética con la mezcla de formatos que traen los exports.
+
+Uso:
+    python benchmarks/bench_fecha_auditorias.py --rows 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from processor import _to_date_aud, parse_fecha_auditorias  # noqa: E402
+
+
+def columna_sintetica(n: int, seed: int = 0) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    dias = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 730, n), unit="D")
+    fmt = rng.integers(0, 8, n)
+
+    out = np.empty(n, dtype=object)
+    plantillas = ["%d/%m/%Y", "%d-%m-%Y", "%d/%m/%y", "%d-%m-%y", "%Y-%m-%d", "%Y/%m/%d"]
+    for i, p in enumerate(plantillas):
+        m = fmt == i
+        out[m] = dias[m].strftime(p)
+    m = fmt == 6
+    out[m] = dias[m].strftime("%d/%m/%Y %H:%M")  # cae al fallback
+    m = fmt == 7
+    out[m] = None
+    return pd.Series(out)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    args = ap.parse_args()
+
+    col = columna_sintetica(args.rows)
+
+    t0 = time.perf_counter()
+    ref = col.apply(_to_date_aud)
+    ref = pd.to_datetime(ref[ref.notna()]).astype("datetime64[ns]")
+    t_apply = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    got = parse_fecha_auditorias(col)
+    got = got[got.notna()]
+    t_vec = time.perf_counter() - t0
+
+    assert ref.equals(got), "parse_fecha_auditorias difiere de _to_date_aud"
+
+    print(f"filas: {args.rows:,}")
+    print(f"apply (_to_date_aud):     {t_apply:8.2f} s")
+    print(f"parse_fecha_auditorias:   {t_vec:8.2f} s")
+    print(f"speedup:                  {t_apply / t_vec:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
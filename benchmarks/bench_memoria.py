@@ -0,0 +1,260 @@
+"""
+Benchmark: memoria de los processors con flags compactos.
+
+Compara el pico de tracemalloc de process_ventas / process_performance /
+process_offtime con flags bool y contadores por size() contra la versión
+anterior (flags int64 vía np.where / astype(int) y columnas constantes = 1),
+verificando que el resultado sea el mismo. Luego mide el pico de
+procesar_global completo respecto del tamaño de los datos de entrada.
+
+Chequeos de cota (código de salida 1 si fallan):
+  - clean_cols no copia datos: su pico es < 5% del DataFrame de entrada
+  - pico de procesar_global <= --limite * tamaño de la entrada
+
+Los datos salen de generadores.py, con las columnas y dtypes que entregan
+los lectores (proyección de esquemas.ESQUEMAS).
+
+Uso:
+    python benchmarks/bench_memoria.py --rows 2000000 --days 365
+    python benchmarks/bench_memoria.py --rows 200000 --limite 1.5
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from esquemas import ESQUEMAS, nombres_aceptados  # noqa: E402
+from generadores import generar_fuentes  # noqa: E402
+from processor import (  # noqa: E402
+    clean_cols,
+    procesar_global,
+    process_offtime,
+    process_performance,
+    process_ventas,
+)
+
+MB = 1024 ** 2
+
+
+def como_lectura(raws: dict) -> dict:
+    """Solo las columnas del esquema de cada fuente, con sus dtypes de lectura."""
+    out = {}
+    for fuente, df in raws.items():
+        aceptados = nombres_aceptados(fuente)
+        df = df[[c for c in df.columns if c in aceptados]]
+        out[fuente] = df.astype({c: t for c, t in ESQUEMAS[fuente]["dtypes"].items() if c in df.columns})
+    return out
+
+
+def medir(fn, *args):
+    """(resultado, segundos, pico en bytes); el tiempo se toma sin tracemalloc, que lo infla."""
+    t0 = time.perf_counter()
+    fn(*args)
+    dt = time.perf_counter() - t0
+    tracemalloc.start()
+    out = fn(*args)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return out, dt, pico
+
+
+# ------------------------------------------------------------
+# Versión anterior (flags int64)
+# ------------------------------------------------------------
+
+def process_ventas_anterior(df: pd.DataFrame) -> pd.DataFrame:
+    """process_ventas con flags int64 (antes de los dtypes compactos)."""
+    df = clean_cols(df)
+
+    # Fecha base para agrupar por día
+    if "tm_start_local_at" in df.columns:
+        df["fecha"] = pd.to_datetime(df["tm_start_local_at"], errors="coerce").dt.normalize()
+    elif "createdAt_local" in df.columns:
+        df["fecha"] = pd.to_datetime(df["createdAt_local"], errors="coerce").dt.normalize()
+    elif "date" in df.columns:
+        # En algunos exports 'date' viene como DD-MM-YYYY o similar
+        df["fecha"] = pd.to_datetime(df["date"], errors="coerce", dayfirst=True).dt.normalize()
+    else:
+        return pd.DataFrame(columns=[
+            "fecha",
+            "Ventas_Totales", "Ventas_Compartidas", "Ventas_Exclusivas",
+            "Q_journeys", "Q_pasajeros", "Q_pasajeros_exclusives", "Q_pasajeros_compartidas",
+        ])
+
+    # Monto / precio
+    if "qt_price_local" in df.columns:
+        df["qt_price_local"] = (
+            df["qt_price_local"]
+            .astype(str)
+            .str.replace(",", "", regex=False)
+            .str.replace(" ", "", regex=False)
+            .str.replace("$", "", regex=False)
+        )
+        df["qt_price_local"] = pd.to_numeric(df["qt_price_local"], errors="coerce")
+    else:
+        df["qt_price_local"] = np.nan
+
+    # Ventas (monto)
+    prod = df.get("ds_product_name", pd.Series([""] * len(df), index=df.index)).astype(str).str.lower().str.strip()
+
+    df["Ventas_Totales"] = df["qt_price_local"]
+    df["Ventas_Compartidas"] = np.where(prod == "van_compartida", df["qt_price_local"], 0)
+    df["Ventas_Exclusivas"] = np.where(prod == "van_exclusive", df["qt_price_local"], 0)
+
+    # Dropoff filter (finishReason)
+    fr_col = None
+    for c in ["finishReason", "finisReason", "FinishReason", "finish_reason", "Finish Reason"]:
+        if c in df.columns:
+            fr_col = c
+            break
+
+    if fr_col is None:
+        is_dropoff = pd.Series([False] * len(df), index=df.index)
+    else:
+        is_dropoff = df[fr_col].astype(str).str.strip().str.upper().eq("FINISH_REASON_DROPOFF")
+
+    # Volumen de pasajeros
+    df["Q_pasajeros"] = is_dropoff.astype(int)
+    df["Q_pasajeros_exclusives"] = np.where(is_dropoff & (prod == "van_exclusive"), 1, 0)
+    df["Q_pasajeros_compartidas"] = np.where(is_dropoff & (prod == "van_compartida"), 1, 0)
+
+    # Journeys (unique journey_id para dropoff)
+    if "journey_id" in df.columns:
+        jid = df["journey_id"].astype(str).str.strip()
+        df["_jid"] = jid
+    else:
+        df["_jid"] = ""
+
+    # Agregación diaria base
+    diario = df.groupby("fecha", as_index=False).agg({
+        "Ventas_Totales": "sum",
+        "Ventas_Compartidas": "sum",
+        "Ventas_Exclusivas": "sum",
+        "Q_pasajeros": "sum",
+        "Q_pasajeros_exclusives": "sum",
+        "Q_pasajeros_compartidas": "sum",
+    })
+
+    # Q_journeys (nunique)
+    if "journey_id" in df.columns:
+        qj = (
+            df[is_dropoff & df["_jid"].ne("") & df["_jid"].notna()]
+            .groupby("fecha")["_jid"]
+            .nunique()
+            .reset_index()
+            .rename(columns={"_jid": "Q_journeys"})
+        )
+        diario = diario.merge(qj, on="fecha", how="left")
+    else:
+        diario["Q_journeys"] = 0
+
+    diario["Q_journeys"] = diario["Q_journeys"].fillna(0)
+
+    return diario
+
+
+def process_performance_anterior(df: pd.DataFrame) -> pd.DataFrame:
+    df = clean_cols(df)
+
+    df = df.rename(columns={"% Firt": "firt_pct", "% Furt": "furt_pct"})
+
+    # Fecha de Referencia (MM/DD/YYYY)
+    df["fecha"] = pd.to_datetime(df["Fecha de Referencia"], errors="coerce").dt.normalize()
+
+    df["Q_Ticket"] = 1
+
+    # Resueltos = todo menos pending (criterio global actual)
+    status = df["Status"].astype(str).str.lower().str.strip()
+    df["Q_Tickets_Resueltos"] = np.where(status != "pending", 1, 0)
+
+    # Encuestas
+    df["Q_Encuestas"] = np.where(
+        df["CSAT"].notna() | df["NPS Score"].notna(),
+        1, 0
+    )
+
+    diario = df.groupby("fecha", as_index=False).agg({
+        "Q_Encuestas": "sum",
+        "CSAT": "mean",
+        "NPS Score": "mean",
+        "Firt (h)": "mean",
+        "firt_pct": "mean",
+        "Furt (h)": "mean",
+        "furt_pct": "mean",
+        "Reopen": "sum",
+        "Q_Ticket": "sum",
+        "Q_Tickets_Resueltos": "sum"
+    })
+
+    return diario
+
+
+def process_offtime_anterior(df: pd.DataFrame) -> pd.DataFrame:
+    df = clean_cols(df)
+    df["fecha"] = pd.to_datetime(df["tm_start_local_at"], errors="coerce").dt.normalize()
+    df["OFF_TIME"] = np.where(
+        df["Segment Arrived to Airport vs Requested"] != "02. A tiempo (0-20 min antes)",
+        1, 0
+    )
+    return df.groupby("fecha", as_index=False).agg({"OFF_TIME": "sum"})
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=2_000_000, help="Filas de Ventas (el resto escala)")
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--limite", type=float, default=1.5, help="Cota de pico / entrada para procesar_global")
+    args = ap.parse_args()
+
+    raws = como_lectura(generar_fuentes(args.rows, args.days, args.seed))
+
+    print(f"{'processor':<20} {'filas':>10} {'entrada (MB)':>13} {'pico antes':>11} {'pico ahora':>11} "
+          f"{'t antes':>8} {'t ahora':>8}")
+    for fuente, anterior, actual in [
+        ("ventas", process_ventas_anterior, process_ventas),
+        ("perf", process_performance_anterior, process_performance),
+        ("off", process_offtime_anterior, process_offtime),
+    ]:
+        df = raws[fuente]
+        a, t_a, m_a = medir(anterior, df)
+        b, t_b, m_b = medir(actual, df)
+        pd.testing.assert_frame_equal(a, b)
+        print(
+            f"{actual.__name__:<20} {len(df):>10,} {df.memory_usage(deep=True).sum() / MB:>13.1f} "
+            f"{m_a / MB:>10.1f}M {m_b / MB:>10.1f}M {t_a:>7.2f}s {t_b:>7.2f}s"
+        )
+
+    entrada = sum(df.memory_usage(deep=True).sum() for df in raws.values())
+    date_from = pd.Timestamp("2024-01-01")
+    date_to = date_from + pd.Timedelta(days=args.days - 1)
+    _, t, pico = medir(procesar_global, *raws.values(), date_from, date_to)
+    print(
+        f"\nprocesar_global: {t:.2f} s  pico {pico / MB:.1f} MB  "
+        f"entrada {entrada / MB:.1f} MB  (pico / entrada = {pico / entrada:.2f})"
+    )
+
+    ventas = raws["ventas"]
+    _, _, pico_clean = medir(clean_cols, ventas)
+    tam_ventas = ventas.memory_usage(deep=True).sum()
+    print(f"clean_cols(ventas): pico {pico_clean / MB:.2f} MB ({pico_clean / tam_ventas:.1%} de la entrada)")
+
+    fallas = []
+    if pico_clean > 0.05 * tam_ventas:
+        fallas.append("clean_cols copia los datos")
+    if pico > args.limite * entrada:
+        fallas.append(f"pico de procesar_global > {args.limite} x entrada")
+    if fallas:
+        print("FALLA: " + "; ".join(fallas))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
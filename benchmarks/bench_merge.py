@@ -0,0 +1,73 @@
+"""
+Benchmark: combinación de las fuentes diarias en procesar_global.
+
+Compara la cadena de merge(on="fecha", how="outer") contra
+combinar_por_fecha (un único concat por índice de fecha), variando el
+número de fuentes y el largo del rango de fechas.
+
+Uso:
+    python benchmarks/bench_merge.py --sources 5 10 20 40 --days 90 365 3650
+"""
+import argparse
+import os
+import sys
+import time
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from processor import combinar_por_fecha  # noqa: E402
+
+
+def fuentes_sinteticas(n_fuentes: int, n_dias: int, n_kpis: int = 4, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    dias = pd.date_range("2020-01-01", periods=n_dias, freq="D")
+    frames = []
+    for i in range(n_fuentes):
+        # Cada fuente cubre ~90% de los días (huecos distintos por fuente)
+        fechas = dias[rng.random(n_dias) < 0.9]
+        data = {"fecha": fechas}
+        for k in range(n_kpis):
+            data[f"src{i}_kpi{k}"] = rng.integers(0, 1000, len(fechas))
+        frames.append(pd.DataFrame(data))
+    return frames
+
+
+def merge_encadenado(frames):
+    return reduce(lambda a, b: a.merge(b, on="fecha", how="outer"), frames)
+
+
+def cronometrar(fn, frames, repeticiones: int = 3) -> float:
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        fn(frames)
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sources", type=int, nargs="+", default=[5, 10, 20, 40])
+    ap.add_argument("--days", type=int, nargs="+", default=[90, 365, 3650])
+    args = ap.parse_args()
+
+    print(f"{'fuentes':>8} {'días':>6} {'merge (ms)':>11} {'concat (ms)':>12} {'speedup':>8}")
+    for n_dias in args.days:
+        for n_fuentes in args.sources:
+            frames = fuentes_sinteticas(n_fuentes, n_dias)
+
+            esperado = merge_encadenado(frames).sort_values("fecha").reset_index(drop=True)
+            obtenido = combinar_por_fecha(frames)
+            pd.testing.assert_frame_equal(esperado, obtenido, check_dtype=False)
+
+            t_merge = cronometrar(merge_encadenado, frames)
+            t_concat = cronometrar(combinar_por_fecha, frames)
+            print(f"{n_fuentes:>8} {n_dias:>6} {t_merge * 1e3:>11.1f} {t_concat * 1e3:>12.1f} {t_merge / t_concat:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
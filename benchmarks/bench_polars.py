@@ -0,0 +1,82 @@
+"""
+Benchmark + verificación: motor Polars (motor_polars) vs process_* de pandas.
+
+Escribe los 10 exports como CSV (latin-1 con BOM, con el separador de cada
+export; inspecciones y abandonados también en CSV para cubrir sus 10
+consultas) y, por fuente:
+  - pandas: read_generic_csv / read_auditorias_csv + process_*
+  - polars: motor_polars.procesar (scan_csv lazy + group_by)
+Verifica que cada tabla diaria y la tabla diaria completa (completar_diario)
+tengan los mismos valores, con y sin rango de fechas, y que los textos nulos
+del motor (readers.VALORES_NULOS) sean los de read_csv. Sale con código 1 si
+alguna difiere.
+
+Uso:
+    python benchmarks/bench_polars.py --rows 100000 1000000 --days 365
+"""
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import motor_polars  # noqa: E402
+from bench_comun import con_pandas, cronometrar, exports_csv, iguales, nulos_como_pandas  # noqa: E402
+from generadores import INICIO  # noqa: E402
+from ingesta import FUENTES  # noqa: E402
+from processor import _indexar_fecha, completar_diario  # noqa: E402
+
+
+def con_polars(nombre: str, data: bytes, date_from, date_to):
+    return motor_polars.procesar(nombre, data, date_from, date_to)[0]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000], help="Filas de Ventas (el resto escala)")
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--window", type=int, default=30, help="Días del rango verificado (al final del período)")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    fin = pd.Timestamp(INICIO) + pd.Timedelta(days=args.days - 1)
+    rangos = [(None, None), (fin - pd.Timedelta(days=args.window - 1), fin)]
+    ok = nulos_como_pandas()
+
+    for filas in args.rows:
+        datos = exports_csv(filas, args.days, args.seed)
+
+        print(f"\n{filas:,} filas de Ventas")
+        print(f"{'fuente':>8} {'MB':>7} {'pandas (ms)':>12} {'polars (ms)':>12} {'speedup':>8}")
+        tot_pd = tot_pl = 0.0
+        for rango in rangos:
+            frames_pd, frames_pl = [], []
+            for nombre in FUENTES:
+                data = datos[nombre]
+                a, t_pd = cronometrar(con_pandas, nombre, data, *rango, repeticiones=args.repeat)
+                b, t_pl = cronometrar(con_polars, nombre, data, *rango, repeticiones=args.repeat)
+                if not iguales(_indexar_fecha(a), _indexar_fecha(b)):
+                    print(f"DIFERENCIA en {nombre} (rango {rango})")
+                    ok = False
+                frames_pd.append(a)
+                frames_pl.append(b)
+                if rango == (None, None):
+                    tot_pd += t_pd
+                    tot_pl += t_pl
+                    mb = len(data) / 2 ** 20
+                    print(f"{nombre:>8} {mb:>7.1f} {t_pd * 1000:>12.1f} {t_pl * 1000:>12.1f} {t_pd / t_pl:>7.1f}x")
+
+            if not iguales(completar_diario(frames_pd), completar_diario(frames_pl)):
+                print(f"DIFERENCIA en la tabla diaria (rango {rango})")
+                ok = False
+        print(f"{'total':>8} {'':>7} {tot_pd * 1000:>12.1f} {tot_pl * 1000:>12.1f} {tot_pd / tot_pl:>7.1f}x")
+
+    print("\nResultados idénticos" if ok else "\nHAY DIFERENCIAS")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
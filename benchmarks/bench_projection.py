@@ -0,0 +1,82 @@
+"""
+Benchmark: proyección de columnas por esquema (esquemas.ESQUEMAS).
+
+Lee un export ancho de Ventas (las columnas que usa process_ventas + N
+columnas que ningún processor consume) con read_generic_csv completo y con
+fuente="ventas", comparando tiempo, pico de memoria y memoria del DataFrame,
+y verificando que process_ventas entregue lo mismo.
+
+Uso:
+    python benchmarks/bench_projection.py --rows 200000 --extra-cols 60
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from processor import process_ventas  # noqa: E402
+from readers import read_generic_csv  # noqa: E402
+
+
+def export_ancho(n: int, extra: int, seed: int = 0) -> bytes:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "tm_start_local_at": (
+            pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365 * 86400, n), unit="s")
+        ).strftime("%Y-%m-%d %H:%M:%S"),
+        "journey_id": rng.integers(0, n // 3 + 1, n).astype(str),
+        "ds_product_name": rng.choice(["van_compartida", "van_exclusive", "otro"], n),
+        "finishReason": rng.choice(["FINISH_REASON_DROPOFF", "FINISH_REASON_CANCEL"], n),
+        "qt_price_local": rng.integers(5000, 40000, n),
+    })
+    for i in range(extra):
+        if i % 3 == 0:
+            df[f"dim_{i}"] = rng.choice(["Santiago", "Lima", "Bogotá", "CDMX"], n)
+        elif i % 3 == 1:
+            df[f"id_{i}"] = rng.integers(0, 10 ** 9, n).astype(str)
+        else:
+            df[f"metric_{i}"] = rng.random(n)
+    return b"\xef\xbb\xbf" + df.to_csv(index=False, sep=";").encode("latin-1")
+
+
+def medir(raw: bytes, **kwargs):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    df = read_generic_csv(BytesIO(raw), **kwargs)
+    dt = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df, dt, peak
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=200_000)
+    ap.add_argument("--extra-cols", type=int, default=60)
+    args = ap.parse_args()
+
+    raw = export_ancho(args.rows, args.extra_cols)
+
+    full, t_full, m_full = medir(raw)
+    proj, t_proj, m_proj = medir(raw, fuente="ventas")
+
+    pd.testing.assert_frame_equal(process_ventas(full), process_ventas(proj))
+
+    mb = 1024 ** 2
+    print(f"filas: {args.rows:,}  columnas: {full.shape[1]} -> {proj.shape[1]}  archivo: {len(raw) / mb:.1f} MB")
+    for nombre, df, t, m in [("completo", full, t_full, m_full), ("proyectado", proj, t_proj, m_proj)]:
+        print(
+            f"{nombre:>11}: {t:6.2f} s  pico {m / mb:8.1f} MB  "
+            f"DataFrame {df.memory_usage(deep=True).sum() / mb:8.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
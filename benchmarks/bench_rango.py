@@ -0,0 +1,71 @@
+"""
+Benchmark: rango de fechas empujado a los process_*.
+
+Compara armar la tabla diaria completa y recién después recortar al rango
+(construir_diario + construir_vistas, lo que hacía procesar_global) contra
+procesar_global con el rango empujado a cada process_* (recortar_rango),
+sobre exports de un año y ventanas de distinto largo al final del año.
+Verifica que las cuatro vistas tengan los mismos valores.
+
+Uso:
+    python benchmarks/bench_rango.py --rows 500000 --days 365 --windows 7 30 90 365
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from processor import construir_diario, construir_vistas, procesar_global  # noqa: E402
+from generadores import INICIO, generar_fuentes  # noqa: E402
+
+
+def sin_pushdown(raws, date_from, date_to):
+    return construir_vistas(construir_diario(*raws), date_from, date_to)
+
+
+def con_pushdown(raws, date_from, date_to):
+    return procesar_global(*raws, date_from, date_to)
+
+
+def cronometrar(fn, *args, repeticiones: int = 3):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        mejor = min(mejor, time.perf_counter() - t0)
+    return out, mejor
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=300_000, help="Filas de Ventas (el resto escala)")
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--windows", type=int, nargs="+", default=[7, 30, 90, 365], help="Largo del rango en días")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    raws = list(generar_fuentes(args.rows, args.days, args.seed).values())
+    fin = pd.Timestamp(INICIO) + pd.Timedelta(days=args.days - 1)
+
+    print(f"{'días':>6} {'completo (ms)':>14} {'pushdown (ms)':>14} {'speedup':>8}")
+    for dias in args.windows:
+        date_from = fin - pd.Timedelta(days=dias - 1)
+        a, t_a = cronometrar(sin_pushdown, raws, date_from, fin, repeticiones=args.repeat)
+        b, t_b = cronometrar(con_pushdown, raws, date_from, fin, repeticiones=args.repeat)
+
+        # Mismos valores (un KPI sin días faltantes en el rango puede quedar int en vez de float)
+        for x, y in zip(a, b):
+            pd.testing.assert_frame_equal(
+                x.reset_index(drop=True), y.reset_index(drop=True), check_dtype=False, check_exact=False, rtol=1e-12,
+            )
+
+        print(f"{dias:>6} {t_a * 1000:>14.1f} {t_b * 1000:>14.1f} {t_a / t_b:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
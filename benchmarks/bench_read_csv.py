@@ -0,0 +1,81 @@
+"""
+Benchmark: lectura de CSV (read_generic_csv).
+
+Compara el lector anterior (decode latin-1 + replace + StringIO + engine
+python) contra el lector por streaming de readers.py: tiempo y pico de
+memoria (tracemalloc) sobre un CSV sintético estilo export BI.
+
+Uso:
+    python benchmarks/bench_read_csv.py --rows 500000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from io import BytesIO, StringIO
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from readers import read_generic_csv  # noqa: E402
+
+
+def read_generic_csv_anterior(uploaded_file):
+    raw = uploaded_file.read()
+    uploaded_file.seek(0)
+    text = raw.decode("latin-1").replace("ï»¿", "").replace("\ufeff", "")
+    sep = ";" if text.count(";") > text.count(",") else ","
+    return pd.read_csv(StringIO(text), sep=sep, engine="python")
+
+
+def csv_sintetico(n: int, sep: str = ";", seed: int = 0) -> bytes:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "tm_start_local_at": (
+            pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365 * 24 * 60, n), unit="min")
+        ).strftime("%Y-%m-%d %H:%M:%S"),
+        "journey_id": rng.integers(0, n // 3 + 1, n).astype(str),
+        "ds_product_name": rng.choice(["van_compartida", "van_exclusive", "otro"], n),
+        "finishReason": rng.choice(["FINISH_REASON_DROPOFF", "FINISH_REASON_CANCEL"], n),
+        "qt_price_local": rng.integers(5000, 40000, n),
+        "comentario": rng.choice(["Llegó a tiempo", "Demora, tráfico", ""], n),
+    })
+    return b"\xef\xbb\xbf" + df.to_csv(index=False, sep=sep).encode("latin-1")
+
+
+def medir(fn, raw):
+    f = BytesIO(raw)
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    df = fn(f)
+    dt = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df, dt, peak
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=500_000)
+    ap.add_argument("--sep", default=";")
+    args = ap.parse_args()
+
+    raw = csv_sintetico(args.rows, sep=args.sep)
+
+    old, t_old, m_old = medir(read_generic_csv_anterior, raw)
+    new, t_new, m_new = medir(read_generic_csv, raw)
+
+    old.columns = old.columns.str.replace("ï»¿", "", regex=False)
+    pd.testing.assert_frame_equal(old, new)
+
+    mb = 1024 ** 2
+    print(f"filas: {args.rows:,}  archivo: {len(raw) / mb:.1f} MB  DataFrame: {new.memory_usage(deep=True).sum() / mb:.1f} MB")
+    print(f"anterior (python engine): {t_old:7.2f} s  pico {m_old / mb:8.1f} MB")
+    print(f"streaming (C engine):     {t_new:7.2f} s  pico {m_new / mb:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+Suite de benchmarks del processor con datos sintéticos de las 10 fuentes
+(ver generadores.py) y umbrales de regresión.
+
+Casos: cada process_* sobre su export crudo, procesar_global completo y
+build_transposed_view sobre la tabla diaria. Se reporta el mejor y la
+mediana de --repeat corridas (después de una de calentamiento); un caso de
+pocos milisegundos se corre varias veces seguidas por medición.
+
+Umbrales: cada corrida mide además un caso de referencia (trabajo fijo de
+pandas, sin código del repo; ver referencia) intercalado con cada caso, y el
+caso se expresa relativo a él (mediana de los cocientes caso / referencia):
+así el umbral no depende de la velocidad de la máquina ni de su deriva
+durante la suite. umbrales.json guarda esos relativos para una configuración
+(--rows/--days/--seed). Un caso es REGRESIÓN si su relativo supera
+umbral * (1 + --tolerance); en ese caso el script termina con código 1.
+La normalización no cubre diferencias de versión de pandas/numpy ni de CPU
+entre operaciones: si una máquina da regresiones sin cambios en el código,
+grabar umbrales locales con --save (y no commitearlos). Al aceptar una mejora,
+regenerar con --save y commitear umbrales.json.
+
+--legacy corre los mismos casos sobre las copias processor_*.py del repo
+(las que no compilan o fallan se informan y se saltan).
+
+Uso:
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --rows 500000 --days 365 --cases ventas global
+    python benchmarks/bench_suite.py --save
+    python benchmarks/bench_suite.py --legacy --rows 20000
+"""
+import argparse
+import gc
+import glob
+import importlib.util
+import inspect
+import json
+import math
+import os
+import statistics
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+RAIZ = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, RAIZ)
+
+import processor  # noqa: E402
+from generadores import generar_fuentes  # noqa: E402
+
+UMBRALES = os.path.join(os.path.dirname(__file__), "umbrales.json")
+
+# fuente -> nombre del process_* (mismo orden que ingesta.FUENTES)
+PROCESADORES = {
+    "ventas": "process_ventas",
+    "perf": "process_performance",
+    "aud": "process_auditorias",
+    "off": "process_offtime",
+    "dur90": "process_duracion",
+    "dur30": "process_duracion30",
+    "ins": "process_inspecciones",
+    "aband": "process_abandonados",
+    "resc": "process_rescates",
+    "wa": "process_whatsapp",
+}
+
+
+def casos(mod, raws: dict, date_from, date_to) -> dict:
+    """{nombre: callable sin argumentos} para el módulo processor dado."""
+    out = {}
+    for fuente, fn in PROCESADORES.items():
+        out[fn] = lambda f=getattr(mod, fn), df=raws[fuente]: f(df)
+
+    frames = list(raws.values())
+    out["procesar_global"] = lambda: mod.procesar_global(*frames, date_from, date_to)
+
+    # Tabla diaria de referencia (siempre la del processor actual) y columnas del módulo
+    diario = processor.construir_diario(*frames)
+    sum_cols = getattr(mod, "SUM_COLS", processor.SUM_COLS)
+    mean_cols = getattr(mod, "MEAN_COLS", processor.MEAN_COLS)
+    kwargs = {"sum_cols": sum_cols, "mean_cols": mean_cols}
+    if "pct_cols" in inspect.signature(mod.build_transposed_view).parameters:
+        kwargs["pct_cols"] = getattr(mod, "PCT_COLS", processor.PCT_COLS)
+    out["build_transposed_view"] = lambda: mod.build_transposed_view(diario, **kwargs)
+    return out
+
+
+def referencia(raws: dict):
+    """
+    Caso de referencia, sin código del repo: la misma mezcla de operaciones de
+    pandas que usan los processors (parseo de fechas, limpieza de texto,
+    factorize, groupby numérico) sobre el export de Ventas. No modificarlo:
+    cambiarlo invalida los umbrales guardados.
+    """
+    df = raws["ventas"]
+    claves = pd.Series(np.arange(len(df)) % 997)
+    valores = pd.Series(np.linspace(0, 1, len(df)))
+
+    def caso():
+        fecha = pd.to_datetime(df["tm_start_local_at"], format="%Y-%m-%d %H:%M:%S").dt.normalize()
+        precio = pd.to_numeric(df["qt_price_local"].str.replace("[$,]", "", regex=True))
+        precio.groupby(fecha).agg(["sum", "size"])
+        df["ds_product_name"].str.strip().str.lower().value_counts()
+        pd.factorize(df["journey_id"])
+        valores.groupby(claves).agg(["sum", "mean", "size"])
+
+    return caso
+
+
+# Duración mínima de cada medición: los casos más cortos se repiten en un
+# bucle (como timeit.autorange) para que el ruido del reloj no domine
+MIN_MEDICION_S = 0.05
+
+
+def _medir(fn, veces: int = 1) -> float:
+    """Segundos por llamada de fn, promediados sobre veces llamadas seguidas."""
+    t0 = time.perf_counter()
+    for _ in range(veces):
+        fn()
+    return (time.perf_counter() - t0) / veces
+
+
+def cronometrar(fn, repeticiones: int, ref=None):
+    """
+    (mejor, mediana) en segundos por llamada. Con ref, además la mediana de
+    los cocientes caso / ref: cada medición del caso va seguida de una de ref,
+    así cada cociente compara dos mediciones del mismo momento y la deriva de
+    la máquina durante la suite se cancela. Como timeit, sin recolector de
+    basura mientras se mide.
+    """
+    veces = max(1, math.ceil(MIN_MEDICION_S / _medir(fn)))  # la primera llamada calienta
+    gc.collect()
+    activo = gc.isenabled()
+    gc.disable()
+    try:
+        tiempos, cocientes = [], []
+        for _ in range(repeticiones):
+            t = _medir(fn, veces)
+            tiempos.append(t)
+            if ref is not None:
+                cocientes.append(t / _medir(ref))
+    finally:
+        if activo:
+            gc.enable()
+    if ref is None:
+        return min(tiempos), statistics.median(tiempos)
+    return min(tiempos), statistics.median(tiempos), statistics.median(cocientes)
+
+
+def filtrar(todos: dict, patrones) -> dict:
+    if not patrones:
+        return todos
+    return {k: v for k, v in todos.items() if any(p in k for p in patrones)}
+
+
+def cargar_legacy():
+    """{archivo: módulo} de las copias processor_*.py (o el error al importarlas)."""
+    mods = {}
+    for ruta in sorted(glob.glob(os.path.join(RAIZ, "processor_*.py"))):
+        nombre = os.path.basename(ruta)
+        spec = importlib.util.spec_from_file_location("legacy_" + nombre[:-3].replace(" ", "_"), ruta)
+        try:
+            mod = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(mod)
+            mods[nombre] = mod
+        except Exception as e:
+            mods[nombre] = e
+    return mods
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=100_000, help="Filas de Ventas (el resto escala)")
+    ap.add_argument("--days", type=int, default=90)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--cases", nargs="*", help="Solo los casos cuyo nombre contenga alguno de estos textos")
+    ap.add_argument("--thresholds", default=UMBRALES)
+    # Con la normalización, los relativos varían hasta ~±30% entre corridas en
+    # una VM compartida de 1 núcleo (sobre todo los casos de pocos ms)
+    ap.add_argument("--tolerance", type=float, default=0.5)
+    ap.add_argument("--save", action="store_true", help="Guardar los relativos actuales como umbrales")
+    ap.add_argument("--legacy", action="store_true", help="Comparar además las copias processor_*.py")
+    args = ap.parse_args()
+
+    config = {"rows": args.rows, "days": args.days, "seed": args.seed}
+    raws = generar_fuentes(args.rows, args.days, args.seed)
+    date_from = pd.Timestamp("2024-01-01")
+    date_to = date_from + pd.Timedelta(days=args.days - 1)
+
+    print("filas por fuente: " + ", ".join(f"{k}={len(v):,}" for k, v in raws.items()))
+
+    umbrales = {}
+    if os.path.exists(args.thresholds):
+        with open(args.thresholds, encoding="utf-8") as f:
+            guardado = json.load(f)
+        if guardado.get("config") == config and "casos_rel" in guardado:
+            umbrales = guardado["casos_rel"]
+        elif not args.save:
+            print(f"(umbrales de {args.thresholds} son para {guardado.get('config')} o de formato anterior: "
+                  "no se comparan)")
+
+    ref = referencia(raws)
+    ref_ms = cronometrar(ref, args.repeat)[0] * 1000
+    print(f"referencia: {ref_ms:.1f} ms (relativo: mediana de caso / referencia, medidos intercalados)")
+
+    # Una pasada de todos los casos antes de medir: el primero medido en un
+    # proceso recién iniciado sale más lento que el resto
+    seleccion = filtrar(casos(processor, raws, date_from, date_to), args.cases)
+    for fn in seleccion.values():
+        fn()
+
+    resultados, tiempos_ms = {}, {}
+    regresiones = []
+    print(f"\n{'caso':<24} {'mejor (ms)':>11} {'mediana (ms)':>13} {'relativo':>9} {'umbral':>7}  estado")
+    for nombre, fn in seleccion.items():
+        mejor, mediana, relativo = cronometrar(fn, args.repeat, ref)
+        tiempos_ms[nombre] = mejor * 1000
+        resultados[nombre] = relativo
+
+        umbral = umbrales.get(nombre)
+        if umbral is None:
+            estado, txt_umbral = "-", "-"
+        else:
+            txt_umbral = f"{umbral:.2f}"
+            estado = "OK" if relativo <= umbral * (1 + args.tolerance) else "REGRESIÓN"
+            if estado != "OK":
+                regresiones.append(nombre)
+        print(f"{nombre:<24} {mejor * 1000:>11.1f} {mediana * 1000:>13.1f} {relativo:>9.2f} {txt_umbral:>7}  {estado}")
+
+    if args.save:
+        umbrales.update(resultados)
+        with open(args.thresholds, "w", encoding="utf-8") as f:
+            json.dump({
+                "config": config,
+                "referencia_ms": round(ref_ms, 1),
+                "casos_rel": {k: round(v, 3) for k, v in umbrales.items()},
+            }, f, indent=2)
+            f.write("\n")
+        print(f"\numbrales guardados en {args.thresholds}")
+
+    if args.legacy:
+        tabla = {"processor.py": tiempos_ms}
+        for archivo, mod in cargar_legacy().items():
+            if isinstance(mod, Exception):
+                print(f"{archivo}: no se pudo importar ({type(mod).__name__}: {mod})")
+                continue
+            tabla[archivo] = {}
+            for nombre, fn in filtrar(casos(mod, raws, date_from, date_to), args.cases).items():
+                try:
+                    # las copias viejas llenan la salida de PerformanceWarning
+                    with warnings.catch_warnings():
+                        warnings.simplefilter("ignore")
+                        tabla[archivo][nombre] = cronometrar(fn, max(args.repeat // 2, 1))[0] * 1000
+                except Exception as e:
+                    print(f"{archivo} {nombre}: {type(e).__name__}: {e}")
+        print("\nmejor tiempo (ms) por copia del processor:")
+        print(pd.DataFrame(tabla).to_string(float_format=lambda x: f"{x:.1f}"))
+
+    if regresiones:
+        print(f"\nREGRESIÓN (> {args.tolerance:.0%} sobre el umbral): {', '.join(regresiones)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""
+Benchmark: build_transposed_view.
+
+Compara la implementación previa (una máscara booleana por día, por
+domingo y por cierre de mes) contra la vectorizada (groupby por clave +
+un único concat), verificando que la salida sea la misma.
+
+Uso:
+    python benchmarks/bench_transposed_view.py --days 90 365 730
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from processor import build_transposed_view  # noqa: E402
+
+SUM_COLS = [
+    "Q_Encuestas", "Reopen", "Q_Ticket", "Q_Tickets_Resueltos", "Q_Tickets_WA", "Q_Auditorias",
+    "Ventas_Totales", "Ventas_Compartidas", "Ventas_Exclusivas",
+    "Q_journeys", "Q_pasajeros", "Q_pasajeros_exclusives", "Q_pasajeros_compartidas",
+    "OFF_TIME", "Duracion_90", "Duracion_30", "Abandonados", "Rescates",
+    "Inspecciones_Q", "Cump_Exterior", "Incump_Exterior",
+    "Cump_Interior", "Incump_Interior", "Cump_Conductor", "Incump_Conductor",
+]
+MEAN_COLS = ["CSAT", "NPS Score", "Firt (h)", "Furt (h)", "firt_pct", "furt_pct", "Nota_Auditorias"]
+OPERATIVOS = ["OFF_TIME", "Duracion_90", "Duracion_30", "Abandonados", "Rescates"]
+PCT_COLS = [f"{op}_pct_pasajeros" for op in OPERATIVOS]
+
+
+def diario_sintetico(n_dias: int, seed: int = 0) -> pd.DataFrame:
+    """Tabla diaria con la forma de la salida de procesar_global (con huecos y NaN)."""
+    rng = np.random.default_rng(seed)
+    fechas = pd.date_range("2023-11-15", periods=n_dias, freq="D")
+    fechas = fechas[rng.random(n_dias) < 0.92]
+    n = len(fechas)
+
+    df = pd.DataFrame({"fecha": fechas})
+    for c in SUM_COLS:
+        df[c] = rng.integers(0, 500, n).astype(float)
+    df["Ventas_Totales"] = rng.random(n) * 1e7
+    df["Q_Auditorias"] = pd.Series([np.nan] * n, dtype=object)  # fuente vacía
+    df.loc[rng.random(n) < 0.05, "Q_pasajeros"] = 0
+    for c in MEAN_COLS:
+        v = rng.random(n) * 100
+        v[rng.random(n) < 0.1] = np.nan
+        df[c] = v
+    for op in OPERATIVOS:
+        df[f"{op}_pct_pasajeros"] = (100.0 * df[op] / df["Q_pasajeros"].replace(0, np.nan)).round(4)
+    return df
+
+
+def build_transposed_view_anterior(df_diario, sum_cols, mean_cols, pct_cols=None):
+    """Implementación previa (bucle por fecha con máscaras booleanas)."""
+    if df_diario is None or df_diario.empty:
+        return pd.DataFrame()
+
+    df = df_diario.copy()
+    df["fecha"] = pd.to_datetime(df["fecha"]).dt.normalize()
+    df = df.sort_values("fecha")
+
+    # KPIs = todas las columnas excepto fecha
+    kpis = [c for c in df.columns if c != "fecha"]
+
+    # Ratios por pasajeros (si no vienen desde procesar_global, los inferimos)
+    operativos = ["OFF_TIME", "Duracion_90", "Duracion_30", "Abandonados", "Rescates"]
+    if pct_cols is None:
+        pct_cols = [f"{op}_pct_pasajeros" for op in operativos if f"{op}_pct_pasajeros" in df.columns]
+    else:
+        pct_cols = [c for c in pct_cols if c in df.columns]
+
+    meses = {
+        1: "Enero", 2: "Febrero", 3: "Marzo", 4: "Abril", 5: "Mayo", 6: "Junio",
+        7: "Julio", 8: "Agosto", 9: "Septiembre", 10: "Octubre", 11: "Noviembre", 12: "Diciembre"
+    }
+
+    def week_label(start_date, end_date):
+        return f"Semana {start_date.day:02d} al {end_date.day:02d} {meses[end_date.month]} {end_date.year}"
+
+    def month_label(any_date):
+        return f"Mes {meses[any_date.month]} {any_date.year}"
+
+    def recompute_pct(subdf, op_name):
+        denom = subdf.get("Q_pasajeros", pd.Series([0] * len(subdf), index=subdf.index)).sum()
+        if denom == 0:
+            return np.nan
+        return (subdf[op_name].sum() / denom) * 100.0
+
+    all_dates = sorted(df["fecha"].unique())
+    all_dates = [pd.to_datetime(d).normalize() for d in all_dates]
+
+    result = pd.DataFrame(index=kpis)
+
+    for i, d in enumerate(all_dates):
+        day_df = df[df["fecha"] == d]
+        col_day = d.strftime("%d/%m/%Y")
+
+        # Columna diaria
+        row = day_df[kpis]
+        result[col_day] = row.iloc[0] if len(row) > 0 else np.nan
+
+        # Columna semanal (si domingo)
+        if d.weekday() == 6:
+            ws = d - pd.Timedelta(days=6)
+            week_df = df[(df["fecha"] >= ws) & (df["fecha"] <= d)]
+
+            label = week_label(ws, d)
+            vals = []
+            for k in kpis:
+                if k in pct_cols:
+                    op = k.replace("_pct_pasajeros", "")
+                    vals.append(recompute_pct(week_df, op))
+                elif k in sum_cols:
+                    vals.append(week_df[k].sum())
+                elif k in mean_cols:
+                    vals.append(week_df[k].mean())
+                else:
+                    vals.append(np.nan)
+            result[label] = vals
+
+        # Columna mensual (cuando cambia el mes EN LA SERIE)
+        next_d = all_dates[i + 1] if i + 1 < len(all_dates) else None
+        is_month_boundary = (next_d is None) or (next_d.month != d.month) or (next_d.year != d.year)
+        if is_month_boundary:
+            ms = d.replace(day=1)
+            month_df = df[(df["fecha"] >= ms) & (df["fecha"] <= d)]
+
+            label = month_label(d)
+            vals = []
+            for k in kpis:
+                if k in pct_cols:
+                    op = k.replace("_pct_pasajeros", "")
+                    vals.append(recompute_pct(month_df, op))
+                elif k in sum_cols:
+                    vals.append(month_df[k].sum())
+                elif k in mean_cols:
+                    vals.append(month_df[k].mean())
+                else:
+                    vals.append(np.nan)
+            result[label] = vals
+
+    # Grupos de KPI (mantener orden + asegurar KPIs nuevos)
+    grupos = {
+        "VENTAS (MONTO)": ["Ventas_Totales", "Ventas_Compartidas", "Ventas_Exclusivas"],
+        "VENTAS (VOLUMEN)": ["Q_journeys", "Q_pasajeros", "Q_pasajeros_exclusives", "Q_pasajeros_compartidas"],
+        "PERFORMANCE": ["Q_Ticket", "Q_Tickets_WA", "Q_Tickets_Resueltos", "Reopen"],
+        "CALIDAD (ENCUESTAS & SLA)": [
+            "Q_Encuestas", "CSAT", "NPS Score",
+            "Firt (h)", "firt_pct",
+            "Furt (h)", "furt_pct",
+            "Q_Auditorias", "Nota_Auditorias"
+        ],
+        "INSPECCIONES": [
+            "Inspecciones_Q",
+            "Cump_Exterior", "Incump_Exterior",
+            "Cump_Interior", "Incump_Interior",
+            "Cump_Conductor", "Incump_Conductor"
+        ],
+        "OTROS (OPERATIVOS)": [
+            "OFF_TIME", "OFF_TIME_pct_pasajeros",
+            "Duracion_90", "Duracion_90_pct_pasajeros",
+            "Duracion_30", "Duracion_30_pct_pasajeros",
+            "Abandonados", "Abandonados_pct_pasajeros",
+            "Rescates", "Rescates_pct_pasajeros",
+        ],
+    }
+
+    k_present = list(result.index)
+    used = set()
+    new_index = []
+
+    for gr, lista in grupos.items():
+        pres = [k for k in lista if k in k_present]
+        if pres:
+            new_index.append(f"=== {gr} ===")
+            new_index.extend(pres)
+            used.update(pres)
+
+    restantes = [k for k in k_present if k not in used]
+    if restantes:
+        new_index.append("=== OTROS KPI ===")
+        new_index.extend(restantes)
+
+    result = result.reindex(new_index)
+    result.insert(0, "KPI", result.index)
+
+    return result.reset_index(drop=True)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--days", type=int, nargs="+", default=[90, 365, 730])
+    args = ap.parse_args()
+
+    # La implementación previa inserta columnas una a una
+    warnings.simplefilter("ignore", pd.errors.PerformanceWarning)
+
+    print(f"{'días':>6} {'anterior (s)':>13} {'vectorizada (s)':>16} {'speedup':>8}")
+    for n_dias in args.days:
+        df = diario_sintetico(n_dias)
+
+        t0 = time.perf_counter()
+        esperado = build_transposed_view_anterior(df, SUM_COLS, MEAN_COLS, PCT_COLS)
+        t_old = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        obtenido = build_transposed_view(df, SUM_COLS, MEAN_COLS, PCT_COLS)
+        t_new = time.perf_counter() - t0
+
+        # Las sumas de groupby usan suma compensada: se toleran diferencias de redondeo
+        pd.testing.assert_frame_equal(esperado, obtenido, check_dtype=False, rtol=1e-12)
+        print(f"{n_dias:>6} {t_old:>13.3f} {t_new:>16.3f} {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
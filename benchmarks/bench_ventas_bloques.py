@@ -0,0 +1,116 @@
+"""
+Benchmark: Ventas por bloques (process_ventas_por_bloques) vs archivo entero.
+
+Escribe un CSV de Ventas sintético y lo procesa como el CLI (la ruta del
+archivo a ingesta.procesar_fuente, sin caché) de dos formas, cada una en un
+proceso aparte para medir el pico de RSS (VmHWM) de forma aislada:
+  - completo: CLAIRPORT_VENTAS_BLOQUES_MB=0 (read_generic_csv + process_ventas)
+  - bloques:  bloques de --chunk filas (read_csv_por_bloques + process_ventas_por_bloques)
+Verifica que ambas tablas diarias sean iguales (Q_journeys exacto aunque los
+journeys crucen bloques) y muestra cómo el pico de los bloques depende del
+tamaño del bloque y no del archivo.
+
+Uso:
+    python benchmarks/bench_ventas_bloques.py --rows 1000000 3000000 --chunk 100000 250000
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from generadores import gen_ventas  # noqa: E402
+
+
+def escribir_csv(ruta: str, filas: int, dias: int, seed: int, lote: int = 500_000) -> None:
+    """CSV de Ventas escrito por lotes (el generador tampoco tiene el archivo entero)."""
+    rng = np.random.default_rng(seed)
+    with open(ruta, "wb") as f:
+        for i, inicio in enumerate(range(0, filas, lote)):
+            df = gen_ventas(rng, min(lote, filas - inicio), dias)
+            # journeys distintos entre lotes
+            df["journey_id"] = (df["journey_id"].astype(np.int64) + inicio).astype(str)
+            f.write(df.to_csv(index=False, header=i == 0).encode("latin-1"))
+
+
+def pico_rss_mb() -> float:
+    """Pico de RSS de este proceso: VmHWM en Linux (ru_maxrss arrastra el del padre tras fork+exec)."""
+    try:
+        with open("/proc/self/status") as f:
+            for linea in f:
+                if linea.startswith("VmHWM:"):
+                    return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def medir(ruta: str, salida: str) -> None:
+    """
+    Procesa Ventas (en este proceso) como lo hace el CLI y escribe tiempo,
+    pico RSS y resultado. El modo sale de CLAIRPORT_VENTAS_BLOQUES_MB /
+    CLAIRPORT_VENTAS_BLOQUE_FILAS, que ingesta lee al importarse.
+    """
+    from ingesta import procesar_fuente
+
+    t0 = time.perf_counter()
+    _, diario, _, _, _ = procesar_fuente("ventas", os.path.basename(ruta), ruta, usar_cache=False, motor="pandas")
+    segundos = time.perf_counter() - t0
+    diario.to_parquet(salida + ".parquet")
+    rss_mb = pico_rss_mb()
+    with open(salida + ".json", "w") as f:
+        json.dump({"segundos": segundos, "rss_mb": rss_mb}, f)
+
+
+def correr(modo: str, ruta: str, chunk: int, tmp: str):
+    salida = os.path.join(tmp, f"{modo}-{chunk}")
+    env = dict(os.environ, CLAIRPORT_VENTAS_BLOQUE_FILAS=str(chunk or 1))
+    # completo: nunca por bloques; bloques: siempre (cualquier tamaño)
+    env["CLAIRPORT_VENTAS_BLOQUES_MB"] = "0" if modo == "completo" else "0.000001"
+    subprocess.run([sys.executable, __file__, "--medir", "--csv", ruta, "--salida", salida], check=True, env=env)
+    with open(salida + ".json") as f:
+        r = json.load(f)
+    return r, pd.read_parquet(salida + ".parquet")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[500_000, 1_500_000])
+    ap.add_argument("--chunk", type=int, nargs="+", default=[100_000, 250_000], help="Filas por bloque")
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--seed", type=int, default=0)
+    # uso interno: un modo por proceso
+    ap.add_argument("--medir", action="store_true", help=argparse.SUPPRESS)
+    ap.add_argument("--csv", help=argparse.SUPPRESS)
+    ap.add_argument("--salida", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.medir:
+        medir(args.csv, args.salida)
+        return
+
+    print(f"{'filas':>10} {'CSV (MB)':>9} {'modo':>16} {'tiempo (s)':>11} {'pico RSS (MB)':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for filas in args.rows:
+            ruta = os.path.join(tmp, "ventas.csv")
+            escribir_csv(ruta, filas, args.days, args.seed)
+            mb = os.path.getsize(ruta) / 2 ** 20
+
+            ref, diario_ref = correr("completo", ruta, 0, tmp)
+            print(f"{filas:>10,} {mb:>9.1f} {'completo':>16} {ref['segundos']:>11.2f} {ref['rss_mb']:>14.0f}")
+            for chunk in args.chunk:
+                r, diario = correr("bloques", ruta, chunk, tmp)
+                pd.testing.assert_frame_equal(diario_ref, diario)
+                print(f"{'':>10} {'':>9} {f'bloques {chunk:,}':>16} {r['segundos']:>11.2f} {r['rss_mb']:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
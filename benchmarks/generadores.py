@@ -0,0 +1,233 @@
+"""
+Generadores sintéticos (con semilla) de los 10 exports, con las columnas,
+formatos y rarezas de los archivos reales: BOM, '$' y miles en precios,
+fechas MM/DD/YYYY en Performance, DD/MM/YYYY y DD-MM-YY en Auditorías,
+notas con coma decimal y '%', emails con mayúsculas / espacios, etc.
+Además de las columnas que consume cada process_*, cada fuente trae columnas
+de relleno como los exports BI.
+
+    from generadores import generar_fuentes, escribir_exports
+    raws = generar_fuentes(filas=100_000, dias=365, seed=0)   # {fuente: DataFrame}
+    escribir_exports("/tmp/exports", filas=100_000, dias=365)  # CSV/XLSX reconocibles por el CLI
+
+filas es el tamaño de Ventas; el resto escala con PROPORCION (aprox. lo que
+se ve en un mes real).
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+INICIO = "2024-01-01"
+
+PROPORCION = {
+    "ventas": 1.0,
+    "perf": 0.5,
+    "aud": 0.02,
+    "off": 1.0,
+    "dur90": 0.05,
+    "dur30": 0.2,
+    "ins": 0.02,
+    "aband": 0.01,
+    "resc": 0.02,
+    "wa": 0.3,
+}
+
+# nombre de archivo (reconocible por clairport.PATRONES), separador; None = .xlsx
+ARCHIVOS = {
+    "ventas": ("ventas.csv", ","),
+    "perf": ("performance.csv", ";"),
+    "aud": ("auditorias.csv", ";"),
+    "off": ("off_time.csv", ","),
+    "dur90": ("duracion_90.csv", ","),
+    "dur30": ("duracion_30.csv", ","),
+    "ins": ("inspecciones.xlsx", None),
+    "aband": ("abandonados.xlsx", None),
+    "resc": ("rescates.csv", ";"),
+    "wa": ("whatsapp.csv", ","),
+}
+
+
+def _momentos(rng, n: int, dias: int) -> pd.DatetimeIndex:
+    """n instantes al azar en [INICIO, INICIO + dias), más densos de día."""
+    dia = rng.integers(0, dias, n)
+    hora = np.clip(rng.normal(13, 4, n), 0, 23.99)
+    return pd.Timestamp(INICIO) + pd.to_timedelta(dia * 86400 + (hora * 3600).astype(np.int64), unit="s")
+
+
+def _relleno(rng, n: int, k: int, prefijo: str) -> dict:
+    """k columnas de relleno (ids, textos y números) como las de los exports BI."""
+    cols = {}
+    for i in range(k):
+        if i % 3 == 0:
+            cols[f"{prefijo}_id_{i}"] = rng.integers(10 ** 6, 10 ** 7, n).astype(str)
+        elif i % 3 == 1:
+            cols[f"{prefijo}_txt_{i}"] = rng.choice(["SCL", "LIM", "BOG", "MEX", ""], n)
+        else:
+            cols[f"{prefijo}_num_{i}"] = rng.random(n).round(3)
+    return cols
+
+
+def gen_ventas(rng, n, dias):
+    t = _momentos(rng, n, dias)
+    producto = rng.choice(["van_compartida", "Van_Exclusive ", "VAN_COMPARTIDA", "otro"], n, p=[0.55, 0.25, 0.1, 0.1])
+    motivo = rng.choice(
+        ["FINISH_REASON_DROPOFF", "finish_reason_dropoff ", "FINISH_REASON_CANCEL", "FINISH_REASON_NO_SHOW"],
+        n, p=[0.75, 0.05, 0.15, 0.05],
+    )
+    # varios pasajeros por journey
+    journey = rng.integers(0, max(n // 3, 1), n).astype(str)
+    precio = rng.integers(5_000, 45_000, n)
+    return pd.DataFrame({
+        "journey_id": journey,
+        "tm_start_local_at": t.strftime("%Y-%m-%d %H:%M:%S"),
+        "qt_price_local": [f"${p:,}" for p in precio],
+        "ds_product_name": producto,
+        "finishReason": motivo,
+        **_relleno(rng, n, 12, "v"),
+    })
+
+
+def gen_performance(rng, n, dias):
+    t = _momentos(rng, n, dias)
+    encuestado = rng.random(n) < 0.3
+    return pd.DataFrame({
+        "Ticket ID": rng.integers(10 ** 7, 10 ** 8, n),
+        "Fecha de Referencia": t.strftime("%m/%d/%Y"),
+        "Status": rng.choice(["pending", "solved", "Closed", "Pending "], n, p=[0.1, 0.6, 0.25, 0.05]),
+        "CSAT": np.where(encuestado, rng.integers(1, 6, n), np.nan),
+        "NPS Score": np.where(encuestado & (rng.random(n) < 0.8), rng.integers(0, 11, n), np.nan),
+        "Firt (h)": (rng.exponential(3, n)).round(2),
+        "% Firt": rng.random(n).round(4),
+        "Furt (h)": (rng.exponential(12, n)).round(2),
+        "% Furt": rng.random(n).round(4),
+        "Reopen": rng.integers(0, 2, n),
+        **_relleno(rng, n, 8, "p"),
+    })
+
+
+def gen_auditorias(rng, n, dias):
+    t = _momentos(rng, n, dias)
+    fecha = np.asarray(t.strftime("%d/%m/%Y"), dtype=object)
+    # algunas filas vienen con año corto
+    corto = rng.random(n) < 0.1
+    fecha[corto] = np.asarray(t.strftime("%d-%m-%y"), dtype=object)[corto]
+    nota = rng.uniform(40, 100, n)
+    return pd.DataFrame({
+        "Date Time Reference": fecha,
+        "Auditor": rng.choice(["ana", "luis", "maria"], n),
+        "Total Audit Score": [f"{x:.1f}%".replace(".", ",") for x in nota],
+        **_relleno(rng, n, 4, "a"),
+    })
+
+
+def gen_offtime(rng, n, dias):
+    t = _momentos(rng, n, dias)
+    return pd.DataFrame({
+        "journey_id": rng.integers(0, 10 ** 6, n).astype(str),
+        "tm_start_local_at": t.strftime("%Y-%m-%d %H:%M:%S"),
+        "Segment Arrived to Airport vs Requested": rng.choice(
+            ["02. A tiempo (0-20 min antes)", "01. Temprano (+20 min antes)", "03. Tarde", "04. Muy tarde"],
+            n, p=[0.7, 0.15, 0.1, 0.05],
+        ),
+        **_relleno(rng, n, 6, "o"),
+    })
+
+
+def gen_duracion90(rng, n, dias):
+    t = _momentos(rng, n, dias)
+    return pd.DataFrame({
+        "Journey Id": rng.integers(0, 10 ** 6, n).astype(str),
+        "Start At Local Dt": t.strftime("%Y-%m-%d"),
+        "Duration (Minutes)": rng.integers(60, 240, n),
+        **_relleno(rng, n, 4, "d"),
+    })
+
+
+def gen_duracion30(rng, n, dias):
+    t = _momentos(rng, n, dias)
+    return pd.DataFrame({
+        "Journey Id": rng.integers(0, 10 ** 6, n).astype(str),
+        "Day of tm_start_local_at": t.strftime("%Y-%m-%d"),
+        **_relleno(rng, n, 4, "d"),
+    })
+
+
+def gen_inspecciones(rng, n, dias):
+    t = _momentos(rng, n, dias)
+    return pd.DataFrame({
+        "Fecha": t,
+        "Patente": rng.choice(["ABCD12", "EFGH34", "IJKL56"], n),
+        "Cumplimiento Exterior": rng.choice([100, 90, 75, np.nan], n, p=[0.7, 0.15, 0.1, 0.05]),
+        "Cumplimiento Interior": rng.choice([100, 80, 50], n, p=[0.75, 0.2, 0.05]),
+        "Cumplimiento Conductor": rng.choice([100, 90], n, p=[0.85, 0.15]),
+    })
+
+
+def gen_abandonados(rng, n, dias):
+    t = _momentos(rng, n, dias)
+    return pd.DataFrame({
+        "Marca temporal": t,
+        "Terminal": rng.choice(["Nacional", "Internacional"], n),
+        "Comentario": rng.choice(["no llegó", "se fue en taxi", ""], n),
+    })
+
+
+def gen_rescates(rng, n, dias):
+    t = _momentos(rng, n, dias)
+    return pd.DataFrame({
+        "Start At Local Dttm": t.strftime("%Y-%m-%d %H:%M:%S"),
+        "User Email": rng.choice(
+            ["Emergencias.excellence.cl@cabify.com ", "emergencias.excellence.cl@cabify.com", "otro@cabify.com"],
+            n, p=[0.4, 0.3, 0.3],
+        ),
+        **_relleno(rng, n, 4, "r"),
+    })
+
+
+def gen_whatsapp(rng, n, dias):
+    t = _momentos(rng, n, dias)
+    return pd.DataFrame({
+        "Conversation Id": rng.integers(10 ** 8, 10 ** 9, n).astype(str),
+        "Created At Local Dt": t.strftime("%Y-%m-%d"),
+        **_relleno(rng, n, 4, "w"),
+    })
+
+
+GENERADORES = {
+    "ventas": gen_ventas,
+    "perf": gen_performance,
+    "aud": gen_auditorias,
+    "off": gen_offtime,
+    "dur90": gen_duracion90,
+    "dur30": gen_duracion30,
+    "ins": gen_inspecciones,
+    "aband": gen_abandonados,
+    "resc": gen_rescates,
+    "wa": gen_whatsapp,
+}
+
+
+def generar_fuentes(filas: int = 100_000, dias: int = 90, seed: int = 0) -> dict:
+    """{fuente: DataFrame crudo} en el orden de ingesta.FUENTES."""
+    rng = np.random.default_rng(seed)
+    return {
+        fuente: gen(rng, max(int(filas * PROPORCION[fuente]), 1), dias)
+        for fuente, gen in GENERADORES.items()
+    }
+
+
+def escribir_exports(directorio: str, filas: int = 100_000, dias: int = 90, seed: int = 0) -> dict:
+    """Escribe los 10 exports (CSV latin-1 con BOM / XLSX). Retorna {fuente: ruta}."""
+    os.makedirs(directorio, exist_ok=True)
+    rutas = {}
+    for fuente, df in generar_fuentes(filas, dias, seed).items():
+        nombre, sep = ARCHIVOS[fuente]
+        ruta = os.path.join(directorio, nombre)
+        if sep is None:
+            df.to_excel(ruta, index=False)
+        else:
+            with open(ruta, "wb") as f:
+                f.write(b"\xef\xbb\xbf" + df.to_csv(index=False, sep=sep).encode("latin-1"))
+        rutas[fuente] = ruta
+    return rutas
@@ -0,0 +1,118 @@
+"""
+Verificación: histórico incremental (KpiStore) con cargas que se solapan.
+
+Escenarios, cada uno sobre un SQLite temporal:
+  - corrección: una carga y luego un re-export corregido de los mismos días
+    donde un día de Rescates queda sin filas (y otro donde Rescates queda
+    vacío en toda la carga, guardado con el período explícito): el histórico
+    debe quedar igual a la segunda carga, sin arrastrar el Rescates de la
+    primera
+  - acumulado: una carga de un período anterior no se toca al subir otra
+    posterior; la tabla diaria del histórico es la de ambas cargas juntas
+  - fuentes con distinto período: en la carga posterior, Inspecciones trae
+    también los últimos días del período anterior; las demás fuentes de esos
+    días se conservan
+Sale con código 1 si algún escenario difiere.
+
+Uso:
+    python benchmarks/verificar_store.py --rows 20000 --days 30
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from generadores import generar_fuentes  # noqa: E402
+from ingesta import FUENTES  # noqa: E402
+from processor import completar_diario  # noqa: E402
+from store import KpiStore  # noqa: E402
+
+EMAIL = "emergencias.excellence.cl@cabify.com"
+
+
+def diarios(raws: dict) -> list:
+    return [FUENTES[n](raws[n]) for n in FUENTES]
+
+
+def sin_rescates(raws: dict, dia=None) -> dict:
+    """Copia de raws sin rescates válidos ese día (o en toda la carga con dia=None)."""
+    resc = raws["resc"].copy()
+    fecha = pd.to_datetime(resc["Start At Local Dttm"]).dt.normalize()
+    quitar = fecha == pd.Timestamp(dia) if dia is not None else pd.Series(True, index=resc.index)
+    resc.loc[quitar, "User Email"] = "otro@cabify.com"
+    return {**raws, "resc": resc}
+
+
+def desplazar(frames: list, dias: int) -> list:
+    """Las mismas tablas diarias corridas dias días (otro período)."""
+    return [df.assign(fecha=pd.to_datetime(df["fecha"]) + pd.Timedelta(days=dias)) for df in frames]
+
+
+def comparar(nombre: str, esperado: pd.DataFrame, obtenido: pd.DataFrame) -> bool:
+    try:
+        pd.testing.assert_frame_equal(
+            esperado.reset_index(drop=True), obtenido.reset_index(drop=True),
+            check_dtype=False, check_exact=False, rtol=1e-9,
+        )
+    except AssertionError as e:
+        print(f"{nombre}: DIFERENCIA\n{e}")
+        return False
+    print(f"{nombre}: OK")
+    return True
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=20_000, help="Filas de Ventas (el resto escala)")
+    ap.add_argument("--days", type=int, default=30)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    raws = generar_fuentes(args.rows, args.days, args.seed)
+    primero = diarios(raws)
+    dia = primero[list(FUENTES).index("resc")]["fecha"].iloc[1]
+    ok = True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Corrección de los mismos días: un día (y luego toda la carga) sin Rescates
+        inicio, fin = primero[0]["fecha"].min(), primero[0]["fecha"].max()
+        for i, (escenario, corregido, periodo) in enumerate([
+            (f"corrección sin rescates el {dia:%Y-%m-%d}", sin_rescates(raws, dia), {}),
+            ("corrección sin rescates en toda la carga", sin_rescates(raws), {"desde": inicio, "hasta": fin}),
+        ]):
+            store = KpiStore(os.path.join(tmp, f"correccion{i}.sqlite"))
+            store.upsert_frames(primero)
+            segundo = diarios(corregido)
+            store.upsert_frames(segundo, **periodo)
+            ok &= comparar(escenario, completar_diario(segundo), store.construir_diario())
+
+        # Cargas de períodos distintos: la anterior se conserva
+        posterior = desplazar(diarios(generar_fuentes(args.rows, args.days, args.seed + 1)), args.days + 7)
+        juntos = completar_diario([pd.concat([a, b], ignore_index=True) for a, b in zip(primero, posterior)])
+
+        store = KpiStore(os.path.join(tmp, "acumulado.sqlite"))
+        store.upsert_frames(primero)
+        store.upsert_frames(posterior)
+        ok &= comparar("acumulado de dos períodos", juntos, store.construir_diario())
+
+        # Inspecciones de la carga posterior empieza 5 días antes (mismos valores)
+        ins = list(FUENTES).index("ins")
+        antes = primero[ins][primero[ins]["fecha"] > primero[ins]["fecha"].max() - pd.Timedelta(days=5)]
+        solapado = list(posterior)
+        solapado[ins] = pd.concat([antes, posterior[ins]], ignore_index=True)
+
+        store = KpiStore(os.path.join(tmp, "solapado.sqlite"))
+        store.upsert_frames(primero)
+        store.upsert_frames(solapado)
+        ok &= comparar("fuente con período más largo", juntos, store.construir_diario())
+
+    print("\nHistórico correcto" if ok else "\nHAY DIFERENCIAS")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import hashlib
+import os
+import tempfile
+
+import pandas as pd
+
+from esquemas import ESQUEMAS
+from processor import clean_cols
+
+# ============================================================
+# 💾 CACHÉ DE ARCHIVOS PARSEADOS
+# ============================================================
+
+# Subir si cambia la forma en que se leen/normalizan los archivos
+CACHE_VERSION = "1"
+
+CACHE_DIR = os.environ.get(
+    "CLAIRPORT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "clairport_cache")
+)
+CACHE_MAX_BYTES = int(float(os.environ.get("CLAIRPORT_CACHE_MAX_MB", "2048")) * 1024 ** 2)
+
+
+def file_hash(uploaded_file, block: int = 1024 * 1024) -> str:
+    """sha256 del contenido del archivo (lee por bloques y deja el cursor en 0)."""
+    h = hashlib.sha256()
+    uploaded_file.seek(0)
+    for chunk in iter(lambda: uploaded_file.read(block), b""):
+        h.update(chunk)
+    uploaded_file.seek(0)
+    return h.hexdigest()
+
+
+def _file_size(uploaded_file) -> int:
+    size = getattr(uploaded_file, "size", None)
+    if size is None:
+        uploaded_file.seek(0, os.SEEK_END)
+        size = uploaded_file.tell()
+        uploaded_file.seek(0)
+    return size
+
+
+class ParsedFileCache:
+    """
+    Guarda en disco (Parquet) el DataFrame ya leído y normalizado con clean_cols,
+    indexado por el hash del contenido del archivo + el lector usado.
+
+      - Hit: se carga el Parquet (no se vuelve a parsear el CSV/XLSX)
+      - Miss: se parsea, se guarda y se aplica eviction LRU por tamaño total
+      - Si no hay motor Parquet (pyarrow) o el frame no es serializable,
+        simplemente no se cachea
+    """
+
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, digest: str, reader, kwargs: dict) -> str:
+        tag = getattr(reader, "__name__", "reader")
+        if kwargs:
+            # Mismo archivo leído con otras opciones (p.ej. usecols) = otra entrada
+            opts = repr(sorted((k, sorted(v) if isinstance(v, (set, frozenset)) else v) for k, v in kwargs.items()))
+            # Con fuente, columnas, alias y dtypes salen de ESQUEMAS: editar el
+            # esquema invalida las entradas de esa fuente sin subir CACHE_VERSION
+            if kwargs.get("fuente") in ESQUEMAS:
+                opts += repr(ESQUEMAS[kwargs["fuente"]])
+            tag += "-" + hashlib.sha256(opts.encode()).hexdigest()[:12]
+        return os.path.join(self.directory, f"{digest}-{tag}-v{CACHE_VERSION}.parquet")
+
+    def load(self, uploaded_file, reader, **kwargs) -> pd.DataFrame:
+        """Devuelve clean_cols(reader(uploaded_file, **kwargs)), desde caché si existe."""
+        path = self._path(file_hash(uploaded_file), reader, kwargs)
+
+        if os.path.exists(path):
+            try:
+                df = pd.read_parquet(path)
+                os.utime(path)  # marca de uso para LRU
+                self.hits += 1
+                self.bytes_saved += _file_size(uploaded_file)
+                return df
+            except Exception:
+                # Entrada corrupta o sin motor parquet: se re-parsea
+                pass
+
+        self.misses += 1
+        df = clean_cols(reader(uploaded_file, **kwargs))
+        uploaded_file.seek(0)
+        self._store(df, path)
+        return df
+
+    def _store(self, df: pd.DataFrame, path: str) -> None:
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            df.to_parquet(tmp, index=False)
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """Elimina las entradas menos usadas hasta quedar bajo max_bytes."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".parquet"):
+                continue
+            p = os.path.join(self.directory, name)
+            try:
+                st = os.stat(p)
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(p)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "bytes_saved": self.bytes_saved}
@@ -0,0 +1,110 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# ============================================================
+# 📆 DIMENSIÓN CALENDARIO
+# ============================================================
+#
+# Una fila por día del rango con todo lo que usan los resúmenes por día,
+# semana y mes: claves enteras para agrupar y etiquetas en español ya
+# rotuladas (una vez por semana / mes, no por fila). Las vistas agrupan por
+# estas columnas en vez de recalcular fechas y armar strings fila a fila.
+
+MESES = {
+    1: "Enero", 2: "Febrero", 3: "Marzo", 4: "Abril", 5: "Mayo", 6: "Junio",
+    7: "Julio", 8: "Agosto", 9: "Septiembre", 10: "Octubre", 11: "Noviembre", 12: "Diciembre"
+}
+
+_EPOCA = pd.Timestamp("1970-01-01")
+
+
+def semana_humana(fecha: pd.Timestamp) -> str:
+    """Etiqueta de la semana (lun-dom) de fecha para la vista semanal: "1-7 Enero 2024"."""
+    lunes = fecha - pd.Timedelta(days=fecha.weekday())
+    domingo = lunes + pd.Timedelta(days=6)
+    return f"{lunes.day}-{domingo.day} {MESES[domingo.month]} {domingo.year}"
+
+
+def _por_clave(claves: np.ndarray, fn) -> np.ndarray:
+    """fn aplicada una vez por clave distinta y expandida a todas las filas."""
+    unicas, inversa = np.unique(claves, return_inverse=True)
+    return np.asarray([fn(k) for k in unicas], dtype=object)[inversa]
+
+
+@lru_cache(maxsize=16)
+def _calendario(inicio: pd.Timestamp, fin: pd.Timestamp) -> pd.DataFrame:
+    fechas = pd.date_range(inicio, fin, freq="D", name="fecha")
+    dia_semana = fechas.weekday.to_numpy()
+    lunes = fechas - pd.to_timedelta(dia_semana, unit="D")
+    domingo = lunes + pd.Timedelta(days=6)
+    iso = fechas.isocalendar()
+
+    clave_semana = (lunes - _EPOCA).days.to_numpy()
+    clave_mes = (fechas.year * 12 + fechas.month - 1).to_numpy()
+
+    def etiqueta_semana_traspuesta(k):
+        lun = _EPOCA + pd.Timedelta(days=int(k))
+        dom = lun + pd.Timedelta(days=6)
+        return f"Semana {lun.day:02d} al {dom.day:02d} {MESES[dom.month]} {dom.year}"
+
+    def etiqueta_mes(k):
+        return f"Mes {MESES[k % 12 + 1]} {k // 12}"
+
+    cal = pd.DataFrame(
+        {
+            "dia_semana": dia_semana,
+            "iso_anio": iso["year"].to_numpy(),
+            "iso_semana": iso["week"].to_numpy(),
+            "lunes": lunes,
+            "domingo": domingo,
+            "clave_semana": clave_semana,
+            "clave_mes": clave_mes,
+            "etiqueta_dia": fechas.strftime("%d/%m/%Y"),
+            "etiqueta_semana": _por_clave(
+                clave_semana, lambda k: semana_humana(_EPOCA + pd.Timedelta(days=int(k)))
+            ),
+            "etiqueta_semana_traspuesta": _por_clave(clave_semana, etiqueta_semana_traspuesta),
+            "etiqueta_mes": _por_clave(clave_mes, etiqueta_mes),
+        },
+        index=fechas,
+    )
+    return cal.astype({
+        "etiqueta_semana": str, "etiqueta_semana_traspuesta": str, "etiqueta_mes": str,
+    })
+
+
+def calendario(inicio, fin) -> pd.DataFrame:
+    """
+    Dimensión calendario (índice fecha, un día por fila) de inicio a fin.
+    Se construye una vez por rango y queda en caché: no modificarla.
+    """
+    return _calendario(pd.Timestamp(inicio).normalize(), pd.Timestamp(fin).normalize())
+
+
+def dimension_fechas(fechas: pd.Series) -> pd.DataFrame:
+    """
+    Filas del calendario para cada valor de fechas (mismo índice y largo),
+    más las marcas que dependen de la serie y no solo del calendario:
+      - domingo_en_serie: la fecha es domingo (cierra una semana presente)
+      - fin_mes_en_serie: última fecha del mes presente en la serie
+    """
+    fechas = pd.to_datetime(fechas).dt.normalize()
+    presentes = pd.DatetimeIndex(fechas.dropna().unique()).sort_values()
+    if len(presentes) == 0:
+        cal = calendario(_EPOCA, _EPOCA).iloc[:0]
+    else:
+        cal = calendario(presentes[0], presentes[-1])
+
+    meses = cal["clave_mes"].reindex(presentes).to_numpy()
+    fin_mes = pd.Series(
+        np.append(meses[1:] != meses[:-1], True) if len(meses) else np.zeros(0, dtype=bool),
+        index=presentes,
+    )
+
+    out = cal.reindex(fechas.to_numpy())
+    out["domingo_en_serie"] = (out["dia_semana"] == 6).to_numpy()
+    out["fin_mes_en_serie"] = fin_mes.reindex(fechas.to_numpy(), fill_value=False).to_numpy()
+    out.index = fechas.index
+    return out
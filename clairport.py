@@ -0,0 +1,207 @@
+"""
+CLI batch del consolidado (sin Streamlit).
+
+    python -m clairport consolidate --inputs exports/2024-09/ --from 2024-09-01 --to 2024-09-30 --out Consolidado.xlsx
+    python -m clairport consolidate --inputs exports/scl/ exports/lim/ --jobs 2 --out salidas/
+    python -m clairport consolidate --inputs exports/2024-09/ --out Consolidado.xlsx --perfil
+
+Cada directorio de entrada debe traer los 10 exports; se reconocen por el
+nombre de archivo (ver PATRONES). Con varios directorios, --out es un
+directorio y se escribe un <nombre_directorio>.xlsx por cada uno.
+Con --store se acepta un solo directorio: el histórico es de un aeropuerto.
+Con --perfil, además se escribe <salida>.perfil.json con tiempo, CPU,
+memoria y filas de cada etapa (ver perfilado.py).
+"""
+import argparse
+import os
+import re
+import sys
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from export import escribir_excel
+from ingesta import FUENTES, MOTOR, MOTORES, ingerir
+from perfilado import Tracer, activar
+from processor import completar_diario, construir_vistas
+from store import KpiStore
+
+# ============================================================
+# 🔎 DETECCIÓN DE FUENTES POR NOMBRE DE ARCHIVO
+# ============================================================
+
+# Se evalúan en este orden; >90 y >30 al final porque "90"/"30" pueden
+# aparecer en fechas dentro del nombre de otros exports
+PATRONES = {
+    "ventas": r"venta",
+    "perf": r"perform",
+    "aud": r"auditor",
+    "off": r"off.?time",
+    "ins": r"inspecc",
+    "aband": r"abandon",
+    "resc": r"rescat",
+    "wa": r"whats.?app",
+    "dur90": r"90",
+    "dur30": r"30",
+}
+
+EXTENSIONES = (".csv", ".xlsx")
+
+
+def _normalizar(nombre: str) -> str:
+    s = unicodedata.normalize("NFKD", nombre).encode("ascii", "ignore").decode()
+    return s.lower()
+
+
+def buscar_fuentes(directorio: str) -> dict:
+    """{fuente: ruta} para los 10 exports del directorio (ValueError si falta o sobra alguno)."""
+    encontrados = {k: [] for k in FUENTES}
+    for nombre in sorted(os.listdir(directorio)):
+        if not nombre.lower().endswith(EXTENSIONES):
+            continue
+        base = _normalizar(os.path.splitext(nombre)[0])
+        fuente = next((k for k, pat in PATRONES.items() if re.search(pat, base)), None)
+        if fuente is not None:
+            encontrados[fuente].append(os.path.join(directorio, nombre))
+
+    faltan = [k for k, v in encontrados.items() if not v]
+    repetidos = {k: v for k, v in encontrados.items() if len(v) > 1}
+    if faltan or repetidos:
+        raise ValueError(f"{directorio}: faltan {faltan or '-'}; ambiguos {repetidos or '-'}")
+    return {k: v[0] for k, v in encontrados.items()}
+
+
+# ============================================================
+# 🧮 CONSOLIDACIÓN DE UN DIRECTORIO
+# ============================================================
+
+def consolidar_directorio(directorio, date_from, date_to, out, workers=None, usar_cache=True, store=None,
+                          perfil=False, motor=MOTOR):
+    """
+    Lee, procesa y escribe el Excel de un directorio. Retorna tiempos por etapa.
+    Con store (ruta SQLite), los días del directorio se agregan al histórico y
+    las vistas se arman desde él. Con perfil, escribe <out>.perfil.json.
+    motor: "pandas", "polars" o "duckdb" para los CSV (ver ingesta.procesar_fuente).
+    """
+    tracer = Tracer() if perfil else None
+    with activar(tracer):
+        etapas = _consolidar(directorio, date_from, date_to, out, workers, usar_cache, store, motor)
+    if tracer is not None:
+        with open(os.path.splitext(out)[0] + ".perfil.json", "w", encoding="utf-8") as f:
+            f.write(tracer.to_json())
+    return etapas
+
+
+def _consolidar(directorio, date_from, date_to, out, workers, usar_cache, store, motor):
+    etapas = []
+
+    def marcar(etapa, t0, **extra):
+        etapas.append({"directorio": directorio, "etapa": etapa, "segundos": time.perf_counter() - t0, **extra})
+
+    t0 = time.perf_counter()
+    # Rutas, no bytes: cada lector abre su archivo (Ventas grande, por bloques)
+    archivos = {k: (os.path.basename(ruta), ruta) for k, ruta in buscar_fuentes(directorio).items()}
+    marcar("descubrir", t0)
+
+    # Sin histórico, el rango pedido se empuja a los process_*; con histórico se
+    # guardan todos los días del directorio y el recorte se hace al armar las vistas
+    rango = {} if store else {"date_from": date_from or None, "date_to": date_to or None}
+
+    t0 = time.perf_counter()
+    frames, tiempos, stats = ingerir(archivos, max_workers=workers, usar_cache=usar_cache, motor=motor, **rango)
+    for r in tiempos.itertuples():
+        etapas.append({"directorio": directorio, "etapa": f"lectura {r.fuente}", "segundos": r.lectura_s, "filas": r.filas_in})
+        etapas.append({"directorio": directorio, "etapa": f"proceso {r.fuente}", "segundos": r.proceso_s, "filas": r.filas_out})
+    marcar(f"ingesta (wall, {stats['hits']} hits de caché)", t0)
+
+    t0 = time.perf_counter()
+    if store:
+        historico = KpiStore(store)
+        dias = sum(historico.upsert_frames(frames).values())
+        marcar("histórico upsert", t0, filas=dias)
+        t0 = time.perf_counter()
+        df_full = historico.construir_diario()
+    else:
+        df_full = completar_diario(frames)
+    marcar("combinar", t0, filas=len(df_full))
+
+    date_from = pd.Timestamp(date_from) if date_from else df_full["fecha"].min()
+    date_to = pd.Timestamp(date_to) if date_to else df_full["fecha"].max()
+
+    t0 = time.perf_counter()
+    vistas = construir_vistas(df_full, date_from, date_to)
+    marcar("vistas", t0, filas=len(vistas[0]))
+
+    t0 = time.perf_counter()
+    escribir_excel(out, *vistas)
+    marcar("excel", t0)
+
+    return etapas
+
+
+def _job(args):
+    return consolidar_directorio(*args)
+
+
+# ============================================================
+# 🖥️ CLI
+# ============================================================
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="clairport", description="Consolidado Global CLAIRPORT")
+    sub = ap.add_subparsers(dest="comando", required=True)
+
+    c = sub.add_parser("consolidate", help="Consolida uno o más directorios de exports")
+    c.add_argument("--inputs", nargs="+", required=True, help="Directorio(s) con los 10 exports")
+    c.add_argument("--from", dest="date_from", help="YYYY-MM-DD (por defecto, primera fecha con datos)")
+    c.add_argument("--to", dest="date_to", help="YYYY-MM-DD (por defecto, última fecha con datos)")
+    c.add_argument("--out", required=True, help="Archivo .xlsx (o directorio si hay varios --inputs)")
+    c.add_argument("--jobs", type=int, default=1, help="Directorios procesados en paralelo")
+    c.add_argument("--workers", type=int, default=None,
+                   help="Workers de ingesta por directorio (por defecto: CPUs, o 1 si --jobs > 1)")
+    c.add_argument("--no-cache", action="store_true", help="No usar la caché de archivos parseados")
+    c.add_argument("--store", help="SQLite del histórico incremental de KPIs diarios (ver store.py); un solo --inputs")
+    c.add_argument("--perfil", action="store_true",
+                   help="Escribe <salida>.perfil.json con tiempo, CPU, memoria y filas por etapa")
+    c.add_argument("--motor", choices=MOTORES, default=MOTOR,
+                   help="Motor de los process_* para los CSV (por defecto CLAIRPORT_MOTOR o pandas)")
+    args = ap.parse_args(argv)
+
+    # Las tablas del histórico solo tienen fecha como clave: cada directorio
+    # (aeropuerto) reemplazaría los días del otro
+    if args.store and len(args.inputs) > 1:
+        c.error("--store admite un solo directorio en --inputs (el histórico no distingue aeropuertos)")
+
+    if len(args.inputs) > 1:
+        os.makedirs(args.out, exist_ok=True)
+        salidas = [
+            os.path.join(args.out, os.path.basename(os.path.normpath(d)) + ".xlsx") for d in args.inputs
+        ]
+    else:
+        salidas = [args.out]
+
+    workers = args.workers if args.workers is not None else (1 if args.jobs > 1 else None)
+    tareas = [
+        (d, args.date_from, args.date_to, out, workers, not args.no_cache, args.store, args.perfil, args.motor)
+        for d, out in zip(args.inputs, salidas)
+    ]
+
+    t0 = time.perf_counter()
+    if args.jobs > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            resultados = list(pool.map(_job, tareas))
+    else:
+        resultados = [_job(t) for t in tareas]
+    total = time.perf_counter() - t0
+
+    etapas = pd.DataFrame([e for r in resultados for e in r])
+    etapas["filas"] = etapas["filas"].map(lambda x: "" if pd.isna(x) else int(x))
+    print(etapas.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+    print(f"\n{len(tareas)} directorio(s) en {total:.2f} s -> {', '.join(salidas)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+# ============================================================
+# 📋 ESQUEMA DE COLUMNAS POR FUENTE
+# ============================================================
+#
+# Para cada fuente: columnas que consume su process_* (las opcionales que no
+# vengan en el archivo simplemente no se leen), alias aceptados para una misma
+# columna y dtypes de lectura. Los lectores usan esto para no materializar el
+# resto de columnas de los exports BI.
+#
+# dtypes: solo "category" para textos de baja cardinalidad que los processors
+# usan vía .astype(str) / comparaciones, así el resultado no cambia.
+
+ESQUEMAS = {
+    "ventas": {
+        "columnas": [
+            "tm_start_local_at", "createdAt_local", "date",
+            "qt_price_local", "ds_product_name", "finishReason", "journey_id",
+        ],
+        "alias": {
+            "finishReason": ["finisReason", "FinishReason", "finish_reason", "Finish Reason"],
+        },
+        "dtypes": {"ds_product_name": "category", "finishReason": "category"},
+    },
+    "perf": {
+        "columnas": [
+            "Fecha de Referencia", "Status", "CSAT", "NPS Score",
+            "Firt (h)", "% Firt", "Furt (h)", "% Furt", "Reopen",
+        ],
+        "alias": {},
+        "dtypes": {"Status": "category"},
+    },
+    "aud": {
+        "columnas": ["Date Time Reference", "Total Audit Score"],
+        "alias": {"Date Time Reference": ["Date Time"]},
+        "dtypes": {},
+    },
+    "off": {
+        "columnas": ["tm_start_local_at", "Segment Arrived to Airport vs Requested"],
+        "alias": {},
+        "dtypes": {"Segment Arrived to Airport vs Requested": "category"},
+    },
+    "dur90": {
+        "columnas": ["Start At Local Dt", "Duration (Minutes)"],
+        "alias": {},
+        "dtypes": {},
+    },
+    "dur30": {
+        "columnas": ["Day of tm_start_local_at"],
+        "alias": {},
+        "dtypes": {},
+    },
+    "ins": {
+        "columnas": ["Fecha", "Cumplimiento Exterior", "Cumplimiento Interior", "Cumplimiento Conductor"],
+        "alias": {},
+        "dtypes": {},
+    },
+    "aband": {
+        "columnas": ["Marca temporal"],
+        "alias": {},
+        "dtypes": {},
+    },
+    "resc": {
+        "columnas": ["Start At Local Dttm", "User Email"],
+        "alias": {},
+        "dtypes": {"User Email": "category"},
+    },
+    "wa": {
+        "columnas": ["Created At Local Dt"],
+        "alias": {},
+        "dtypes": {},
+    },
+}
+
+
+def nombres_aceptados(fuente: str) -> dict:
+    """{nombre normalizado aceptado: nombre canónico} para la fuente."""
+    esquema = ESQUEMAS[fuente]
+    out = {c: c for c in esquema["columnas"]}
+    for canon, alias in esquema["alias"].items():
+        for a in alias:
+            out[a] = canon
+    return out
@@ -0,0 +1,115 @@
+import os
+import tempfile
+import zipfile
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+from perfilado import trazar
+
+# ============================================================
+# 📤 EXPORTACIÓN DEL CONSOLIDADO
+# ============================================================
+
+HOJAS = ("Diario", "Semanal", "Periodo", "Vista_Traspuesta")
+
+# Mismo formato de fechas que DataFrame.to_excel (encabezados sin estilo, como en pandas 3)
+FORMATO_FECHA = "YYYY-MM-DD HH:MM:SS"
+
+
+def _celdas(col: pd.Series) -> np.ndarray:
+    """
+    Valores de la columna como objetos Python listos para write_row:
+    NaN/NaT -> None (celda vacía), ±inf -> "inf"/"-inf" (como to_excel).
+    """
+    nulos = col.isna().to_numpy()
+    if col.dtype.kind == "M":
+        valores = np.array(col.dt.to_pydatetime(), dtype=object)
+    else:
+        valores = col.to_numpy(dtype=object, copy=True)
+        if col.dtype.kind == "f":
+            x = col.to_numpy()
+            valores[x == np.inf] = "inf"
+            valores[x == -np.inf] = "-inf"
+    valores[nulos] = None
+    return valores
+
+
+def _escribir_hoja(ws, df: pd.DataFrame) -> None:
+    ws.write_row(0, 0, [str(c) for c in df.columns])
+    columnas = [_celdas(df.iloc[:, j]) for j in range(df.shape[1])]
+    for i, fila in enumerate(zip(*columnas), start=1):
+        ws.write_row(i, 0, fila)
+
+
+@trazar()
+def escribir_excel(destino, df_diario, df_sem, df_periodo, df_transp) -> None:
+    """
+    Escribe el consolidado en destino (ruta o archivo binario) en modo
+    constant_memory de xlsxwriter: cada fila se vuelca a disco al escribirla,
+    así la memoria no crece con el tamaño del libro. Las celdas salen de los
+    arrays de cada columna con write_row, sin el formateo celda a celda de
+    to_excel; el contenido y el estilo son los mismos.
+    """
+    workbook = xlsxwriter.Workbook(destino, {"constant_memory": True, "default_date_format": FORMATO_FECHA})
+
+    for nombre, df in zip(HOJAS, (df_diario, df_sem, df_periodo, df_transp)):
+        ws = workbook.add_worksheet(nombre)
+
+        if nombre == "Vista_Traspuesta":
+            # Estilo Cabify
+            purple = workbook.add_format({"bg_color": "#4A2B8D", "font_color": "white", "bold": True})
+            for i, col in enumerate(df.columns):
+                if isinstance(col, str) and col.startswith("Semana "):
+                    ws.set_column(i, i, 22, purple)
+
+        _escribir_hoja(ws, df)
+
+    workbook.close()
+
+
+@trazar()
+def generar_excel(df_diario, df_sem, df_periodo, df_transp) -> bytes:
+    """Consolidado .xlsx como bytes (escrito en un archivo temporal y leído una vez)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, "consolidado.xlsx")
+        escribir_excel(ruta, df_diario, df_sem, df_periodo, df_transp)
+        with open(ruta, "rb") as f:
+            return f.read()
+
+
+def _zip(vistas, extension: str, escribir) -> bytes:
+    output = BytesIO()
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as z:
+        for nombre, df in zip(HOJAS, vistas):
+            with z.open(f"{nombre}.{extension}", "w") as f:
+                escribir(df, f)
+    return output.getvalue()
+
+
+@trazar()
+def generar_csv_zip(df_diario, df_sem, df_periodo, df_transp) -> bytes:
+    """Las cuatro vistas como CSV (UTF-8 con BOM, para abrirlos en Excel) en un .zip."""
+    return _zip(
+        (df_diario, df_sem, df_periodo, df_transp), "csv",
+        lambda df, f: f.write(df.to_csv(index=False).encode("utf-8-sig")),
+    )
+
+
+@trazar()
+def generar_parquet_zip(df_diario, df_sem, df_periodo, df_transp) -> bytes:
+    """Las cuatro vistas como Parquet (tipos preservados) en un .zip."""
+    return _zip((df_diario, df_sem, df_periodo, df_transp), "parquet", lambda df, f: df.to_parquet(f, index=False))
+
+
+# formato -> (generador, nombre de archivo, mime)
+FORMATOS = {
+    "Excel (.xlsx)": (
+        generar_excel, "Consolidado_Global.xlsx",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ),
+    "CSV (.zip)": (generar_csv_zip, "Consolidado_Global_csv.zip", "application/zip"),
+    "Parquet (.zip)": (generar_parquet_zip, "Consolidado_Global_parquet.zip", "application/zip"),
+}
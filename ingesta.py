@@ -0,0 +1,264 @@
+import importlib
+import importlib.util
+import os
+import time
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+
+import pandas as pd
+
+from cache import ParsedFileCache
+from perfilado import Tracer, activar, actual, etapa
+from processor import (
+    process_abandonados,
+    process_auditorias,
+    process_duracion,
+    process_duracion30,
+    process_inspecciones,
+    process_offtime,
+    process_performance,
+    process_rescates,
+    process_ventas,
+    process_ventas_por_bloques,
+    process_whatsapp,
+)
+from readers import read_auditorias_csv, read_csv_por_bloques, read_excel_source, read_generic_csv
+
+# ============================================================
+# ⚡ INGESTA CONCURRENTE DE LAS 10 FUENTES
+# ============================================================
+
+# Orden = orden de columnas en la tabla diaria (igual que construir_diario)
+FUENTES = {
+    "ventas": process_ventas,
+    "perf": process_performance,
+    "aud": process_auditorias,
+    "off": process_offtime,
+    "dur90": process_duracion,
+    "dur30": process_duracion30,
+    "ins": process_inspecciones,
+    "aband": process_abandonados,
+    "resc": process_rescates,
+    "wa": process_whatsapp,
+}
+
+# None = os.cpu_count()
+MAX_WORKERS = int(os.environ["CLAIRPORT_WORKERS"]) if os.environ.get("CLAIRPORT_WORKERS") else None
+
+# Un CSV de Ventas de más de VENTAS_BLOQUES_MB se lee y agrega de a
+# VENTAS_BLOQUE_FILAS filas (process_ventas_por_bloques) en vez de entero; 0 = nunca
+VENTAS_BLOQUES_MB = float(os.environ.get("CLAIRPORT_VENTAS_BLOQUES_MB", "256"))
+VENTAS_BLOQUE_FILAS = int(os.environ.get("CLAIRPORT_VENTAS_BLOQUE_FILAS", "250000"))
+
+
+# Motor de los process_* para los CSV: "pandas" (processor), "polars"
+# (motor_polars, las 10 fuentes) o "duckdb" (motor_duckdb: Ventas, Performance
+# y WhatsApp). Requieren su paquete; los .xlsx y las fuentes que el motor no
+# cubre siempre van por pandas.
+MOTORES = ("pandas", "polars", "duckdb")
+MOTOR = os.environ.get("CLAIRPORT_MOTOR", "pandas")
+
+
+class ErrorLectura(Exception):
+    pass
+
+
+def lector_para(nombre: str, filename: str):
+    """(reader, kwargs) para la fuente según la extensión del archivo."""
+    # fuente = clave de ESQUEMAS: proyección de columnas + dtypes en la lectura
+    if filename.lower().endswith(".xlsx"):
+        return read_excel_source, {"fuente": nombre}
+    if nombre == "aud":
+        return read_auditorias_csv, {"fuente": nombre}
+    return read_generic_csv, {"fuente": nombre}
+
+
+def cargar_motor(motor: str):
+    """Módulo del motor (None para pandas). ValueError si no existe o falta su paquete."""
+    if motor not in MOTORES:
+        raise ValueError(f"Motor desconocido: {motor!r} (opciones: {', '.join(MOTORES)})")
+    if motor == "pandas":
+        return None
+    if importlib.util.find_spec(motor) is None:
+        raise ValueError(f"El motor {motor} requiere el paquete {motor} (pip install {motor})")
+    return importlib.import_module(f"motor_{motor}")
+
+
+def _es_ruta(data) -> bool:
+    return isinstance(data, (str, os.PathLike))
+
+
+def _abrir(data):
+    """Archivo binario sobre data: bytes (subida de la app) o ruta en disco (CLI)."""
+    return open(data, "rb") if _es_ruta(data) else BytesIO(data)
+
+
+def leer_por_bloques(nombre: str, filename: str, data) -> bool:
+    """La fuente se procesa por bloques (solo Ventas en CSV de más de VENTAS_BLOQUES_MB)."""
+    tamano = os.path.getsize(data) if _es_ruta(data) else len(data)
+    return (
+        nombre == "ventas"
+        and VENTAS_BLOQUES_MB > 0
+        and not filename.lower().endswith(".xlsx")
+        and tamano > VENTAS_BLOQUES_MB * 1024 ** 2
+    )
+
+
+def _bloques_ventas(filename: str, data, cuenta: dict):
+    """
+    Bloques del CSV de Ventas; suma en cuenta las filas leídas y el tiempo de
+    lectura. Con una ruta, el archivo se lee del disco de a un bloque.
+    """
+    with _abrir(data) as f:
+        # journey_id como texto en todos los bloques (ver process_ventas_por_bloques)
+        lector = read_csv_por_bloques(f, VENTAS_BLOQUE_FILAS, fuente="ventas", dtype={"journey_id": str})
+        while True:
+            t0 = time.perf_counter()
+            try:
+                bloque = next(lector, None)
+            except Exception as e:
+                raise ErrorLectura(f"{filename}: {e}") from e
+            finally:
+                cuenta["lectura_s"] += time.perf_counter() - t0
+            if bloque is None:
+                return
+            cuenta["filas"] += len(bloque)
+            yield bloque
+
+
+def procesar_fuente(nombre: str, filename: str, data, usar_cache: bool = True, perfilar: bool = False,
+                    date_from=None, date_to=None, motor=MOTOR):
+    """
+    Lee y procesa una fuente (pensado para correr en un worker). data: bytes
+    del archivo o su ruta en disco.
+    Retorna (nombre, diario, tiempos, stats de caché, registros de perfilado).
+
+    date_from / date_to: rango que se empuja al process_* (la lectura y la
+    caché de archivos parseados son siempre del archivo completo).
+
+    perfilar: mide las etapas con un Tracer propio y devuelve sus registros
+    (para workers, que no comparten el Tracer del llamador). Sin perfilar, las
+    etapas van al Tracer activo en este hilo, si lo hay.
+
+    Un CSV de Ventas grande (ver leer_por_bloques) se lee y agrega por bloques,
+    sin pasar por la caché de archivos parseados (que guarda el archivo entero).
+    Con una ruta, el archivo nunca está entero en memoria.
+
+    motor: con "polars" o "duckdb", un CSV que el motor cubre se lee y procesa
+    como una consulta de motor_<motor> (lectura y proceso juntos, contados como
+    proceso; sin caché).
+    """
+    modulo = cargar_motor(motor)
+    externo = modulo is not None and nombre in modulo.CONSULTAS and not filename.lower().endswith(".xlsx")
+    reader, kwargs = lector_para(nombre, filename)
+    bloques = not externo and leer_por_bloques(nombre, filename, data)
+    cache = ParsedFileCache() if usar_cache and not bloques and not externo else None
+    propio = Tracer() if perfilar else None
+
+    with activar(propio) if propio is not None else nullcontext():
+        with etapa(f"fuente {nombre}"):
+            t0 = time.perf_counter()
+            if externo:
+                try:
+                    with etapa(f"{motor} {nombre}") as reg:
+                        diario, filas_in = modulo.procesar(nombre, data, date_from, date_to)
+                        reg["filas_out"] = len(diario)
+                except Exception as e:
+                    raise ErrorLectura(f"{filename}: {e}") from e
+                t1 = t0
+                t2 = time.perf_counter()
+            elif bloques:
+                cuenta = {"filas": 0, "lectura_s": 0.0}
+                diario = process_ventas_por_bloques(
+                    _bloques_ventas(filename, data, cuenta), date_from=date_from, date_to=date_to
+                )
+                t2 = time.perf_counter()
+                t1 = t0 + cuenta["lectura_s"]
+                filas_in = cuenta["filas"]
+            else:
+                try:
+                    with etapa(f"lectura {nombre}") as reg, _abrir(data) as f:
+                        df = cache.load(f, reader, **kwargs) if cache is not None else reader(f, **kwargs)
+                        reg["filas_out"] = len(df)
+                except Exception as e:
+                    raise ErrorLectura(f"{filename}: {e}") from e
+                t1 = time.perf_counter()
+
+                diario = FUENTES[nombre](df, date_from=date_from, date_to=date_to)
+                t2 = time.perf_counter()
+                filas_in = len(df)
+
+    tiempos = {
+        "fuente": nombre,
+        "archivo": filename,
+        "lectura_s": t1 - t0,
+        "proceso_s": t2 - t1,
+        "filas_in": filas_in,
+        "filas_out": len(diario),
+    }
+    stats = cache.stats() if cache is not None else {"hits": 0, "misses": 0, "bytes_saved": 0}
+    registros = propio.registros if propio is not None else []
+    return nombre, diario, tiempos, stats, registros
+
+
+def ingerir(archivos, max_workers=MAX_WORKERS, usar_cache=True, date_from=None, date_to=None, motor=MOTOR):
+    """
+    archivos: {nombre: (filename, bytes o ruta)} con las 10 claves de FUENTES
+    (la app entrega los bytes subidos; el CLI, las rutas en disco).
+    date_from / date_to: solo se procesan las filas de ese rango (None = todo).
+    motor: "pandas", "polars" o "duckdb" para los CSV (ver procesar_fuente).
+
+    Los .xlsx (openpyxl, atado al GIL) van a un pool de procesos; los CSV a un
+    pool de hilos. max_workers=None usa os.cpu_count(); con un solo worker todo
+    corre en serie en el proceso actual.
+
+    Retorna (frames en orden de FUENTES, DataFrame de tiempos por fuente, stats de caché).
+    """
+    t0 = time.perf_counter()
+    resultados = {}
+
+    max_workers = max_workers or os.cpu_count() or 1
+    tracer = actual()
+    cargar_motor(motor)
+
+    with etapa("ingesta"):
+        if max_workers <= 1:
+            for nombre in FUENTES:
+                resultados[nombre] = procesar_fuente(
+                    nombre, *archivos[nombre], usar_cache, date_from=date_from, date_to=date_to, motor=motor
+                )
+        else:
+            excel = [n for n in FUENTES if archivos[n][0].lower().endswith(".xlsx")]
+            csv = [n for n in FUENTES if n not in excel]
+            perfilar = tracer is not None
+            opciones = (date_from, date_to, motor)
+
+            with ProcessPoolExecutor(max_workers=max_workers) as procs, \
+                    ThreadPoolExecutor(max_workers=max_workers) as hilos:
+                futuros = [
+                    procs.submit(procesar_fuente, n, *archivos[n], usar_cache, perfilar, *opciones) for n in excel
+                ] + [
+                    hilos.submit(procesar_fuente, n, *archivos[n], usar_cache, perfilar, *opciones) for n in csv
+                ]
+                for fut in futuros:
+                    r = fut.result()
+                    resultados[r[0]] = r
+
+            if perfilar:
+                for n in FUENTES:
+                    tracer.extender(resultados[n][4])
+
+    frames = [resultados[n][1] for n in FUENTES]
+
+    tiempos = pd.DataFrame([resultados[n][2] for n in FUENTES])
+    tiempos["total_s"] = tiempos["lectura_s"] + tiempos["proceso_s"]
+
+    stats = {"hits": 0, "misses": 0, "bytes_saved": 0}
+    for n in FUENTES:
+        for k, v in resultados[n][3].items():
+            stats[k] += v
+    stats["wall_s"] = time.perf_counter() - t0
+
+    return frames, tiempos, stats
+
@@ -0,0 +1,182 @@
+import os
+import tempfile
+from io import BytesIO
+
+import duckdb
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+from processor import VENTAS_COLS, recortar_rango
+from readers import VALORES_NULOS, columnas_canonicas, preparar_csv
+
+# ============================================================
+# 🦆 MOTOR DUCKDB (OPCIONAL)
+# ============================================================
+#
+# Ventas, Performance y WhatsApp (las fuentes más grandes) como SQL sobre el
+# CSV crudo: DuckDB lo lee con read_csv y agrega por día en paralelo (y fuera
+# de memoria si hace falta), sin materializar filas en Python. Solo vuelve a
+# pandas la tabla diaria, igual a la del process_* correspondiente.
+#
+# Se elige con CLAIRPORT_MOTOR=duckdb (o --motor duckdb en el CLI); las demás
+# fuentes y los .xlsx siguen por pandas. Requiere duckdb.
+
+def _id(columna: str) -> str:
+    return '"' + columna.replace('"', '""') + '"'
+
+
+def _texto(valor: str) -> str:
+    return "'" + valor.replace("'", "''") + "'"
+
+
+def _num(expr: str) -> str:
+    """pd.to_numeric(errors="coerce"): lo que no es número queda NULL."""
+    return f"TRY_CAST({expr} AS DOUBLE)"
+
+
+def _suma(expr: str, condicion: str = None) -> str:
+    """SUM como en pandas: 0 (no NULL) si no hay valores."""
+    filtro = f" FILTER (WHERE {condicion})" if condicion else ""
+    return f"COALESCE(SUM({expr}){filtro}, 0)"
+
+
+def _fecha(con, columna: str, dayfirst: bool = False) -> str:
+    """
+    pd.to_datetime(errors="coerce").dt.normalize() en SQL, con el formato que
+    pandas infiere del primer valor no nulo.
+    """
+    primero = con.execute(f"SELECT {_id(columna)} FROM fuente WHERE {_id(columna)} IS NOT NULL LIMIT 1").fetchone()
+    formato = guess_datetime_format(primero[0], dayfirst=dayfirst) if primero else None
+    if formato is None:
+        valor = f"TRY_CAST({_id(columna)} AS TIMESTAMP)"
+    else:
+        valor = f"TRY_STRPTIME({_id(columna)}, {_texto(formato)})"
+    return f"date_trunc('day', {valor})"
+
+
+# ============================================================
+# 🔎 CONSULTAS POR FUENTE (mismos KPIs que processor.process_*)
+# ============================================================
+
+def _ventas(con, cols):
+    col_fecha = next((c for c in ["tm_start_local_at", "createdAt_local", "date"] if c in cols), None)
+    if col_fecha is None:
+        return None
+
+    if "qt_price_local" in cols:
+        precio = _num("replace(replace(replace(qt_price_local, ',', ''), ' ', ''), '$', '')")
+    else:
+        precio = "NULL::DOUBLE"
+    prod = "lower(trim(ds_product_name))" if "ds_product_name" in cols else "''"
+    dropoff = "upper(trim(finishReason)) = 'FINISH_REASON_DROPOFF'" if "finishReason" in cols else "false"
+    if "journey_id" in cols:
+        q_journeys = f"COUNT(DISTINCT trim(journey_id)) FILTER (WHERE {dropoff} AND trim(journey_id) <> '')"
+    else:
+        q_journeys = "0"
+
+    return _fecha(con, col_fecha, dayfirst=col_fecha == "date"), f"""
+        {_suma(precio)} AS Ventas_Totales,
+        {_suma(precio, f"{prod} = 'van_compartida'")} AS Ventas_Compartidas,
+        {_suma(precio, f"{prod} = 'van_exclusive'")} AS Ventas_Exclusivas,
+        COUNT(*) FILTER (WHERE {dropoff}) AS Q_pasajeros,
+        COUNT(*) FILTER (WHERE {dropoff} AND {prod} = 'van_exclusive') AS Q_pasajeros_exclusives,
+        COUNT(*) FILTER (WHERE {dropoff} AND {prod} = 'van_compartida') AS Q_pasajeros_compartidas,
+        {q_journeys} AS Q_journeys
+    """
+
+
+def _performance(con, cols):
+    return _fecha(con, "Fecha de Referencia"), f"""
+        COUNT(*) FILTER (WHERE CSAT IS NOT NULL OR "NPS Score" IS NOT NULL) AS Q_Encuestas,
+        AVG({_num('CSAT')}) AS CSAT,
+        AVG({_num('"NPS Score"')}) AS "NPS Score",
+        AVG({_num('"Firt (h)"')}) AS "Firt (h)",
+        AVG({_num('"% Firt"')}) AS firt_pct,
+        AVG({_num('"Furt (h)"')}) AS "Furt (h)",
+        AVG({_num('"% Furt"')}) AS furt_pct,
+        {_suma(_num('Reopen'))} AS Reopen,
+        COUNT(*) AS Q_Ticket,
+        COUNT(*) FILTER (WHERE lower(trim(Status)) IS DISTINCT FROM 'pending') AS Q_Tickets_Resueltos
+    """
+
+
+def _whatsapp(con, cols):
+    if "Created At Local Dt" not in cols:
+        return None
+    return _fecha(con, "Created At Local Dt"), "COUNT(*) AS Q_Tickets_WA"
+
+
+CONSULTAS = {
+    "ventas": (_ventas, VENTAS_COLS),
+    "perf": (_performance, None),
+    "wa": (_whatsapp, ["fecha", "Q_Tickets_WA"]),
+}
+
+
+def _fuente(con, nombre: str, ruta: str, sep: str, encabezado) -> list:
+    """
+    Vista "fuente" sobre el CSV con las columnas del esquema renombradas a su
+    nombre canónico (readers.columnas_canonicas). Retorna los nombres
+    canónicos presentes.
+
+    Con el encabezado ya leído (readers.preparar_csv) las columnas se declaran
+    como texto y DuckDB no vuelve a detectar el formato en cada consulta.
+    """
+    nulos = ", ".join(_texto(v) for v in VALORES_NULOS)
+    opciones = f"delim = {_texto(sep)}, header = true, encoding = 'latin-1', nullstr = [{nulos}]"
+    if encabezado and len(set(encabezado)) == len(encabezado):
+        tipos = ", ".join(f"{_texto(h)}: 'VARCHAR'" for h in encabezado)
+        opciones += f", auto_detect = false, quote = '\"', escape = '\"', columns = {{{tipos}}}"
+    else:
+        opciones += ", all_varchar = true"
+    con.execute(f"CREATE VIEW crudo AS SELECT * FROM read_csv({_texto(ruta)}, {opciones})")
+    encabezado = [r[0] for r in con.execute("DESCRIBE crudo").fetchall()]
+
+    columnas = columnas_canonicas(encabezado, nombre)
+    seleccion = ", ".join(f"{_id(h)} AS {_id(canon)}" for canon, h in columnas.items()) or "NULL AS _vacia"
+    con.execute(f"CREATE VIEW fuente AS SELECT {seleccion} FROM crudo")
+    return list(columnas)
+
+
+def procesar(nombre: str, data, date_from=None, date_to=None):
+    """
+    Tabla diaria (pandas) de la fuente a partir de su CSV (bytes o ruta en
+    disco), igual a la del process_* de pandas. Retorna (diario, filas del archivo).
+
+    Con una ruta (CLI), DuckDB lee el archivo directamente y nunca está entero
+    en memoria; los bytes (subidas de la app) se escriben antes a un temporal.
+    El CSV se agrega por día completo en una sola pasada (la lectura del CSV
+    es la misma con o sin rango) y el rango se aplica a esa tabla chica.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        if isinstance(data, (str, os.PathLike)):
+            ruta = os.fspath(data)
+            with open(ruta, "rb") as f:
+                sep, encabezado = preparar_csv(f)
+        else:
+            sep, encabezado = preparar_csv(BytesIO(data))
+            ruta = os.path.join(tmp, f"{nombre}.csv")
+            with open(ruta, "wb") as f:
+                f.write(data)
+
+        # Base en memoria que desborda a tmp si la agregación no cabe en RAM
+        with duckdb.connect(config={"temp_directory": os.path.join(tmp, "spill")}) as con:
+            cols = _fuente(con, nombre, ruta, sep, encabezado)
+            armar, vacia = CONSULTAS[nombre]
+            partes = armar(con, cols)
+            if partes is None:
+                filas = con.execute("SELECT COUNT(*) FROM fuente").fetchone()[0]
+                return pd.DataFrame(columns=vacia), filas
+            fecha, kpis = partes
+
+            diario = con.execute(f"""
+                SELECT {fecha} AS fecha, COUNT(*) AS _filas, {kpis}
+                FROM fuente
+                GROUP BY ALL
+                ORDER BY fecha
+            """).df()
+
+    filas = int(diario.pop("_filas").sum())
+    diario = diario[diario["fecha"].notna()]
+    diario, _ = recortar_rango(diario, diario["fecha"], date_from, date_to)
+    return diario.reset_index(drop=True), filas
@@ -0,0 +1,280 @@
+import os
+from io import BytesIO
+
+import pandas as pd
+import polars as pl
+from pandas.tseries.api import guess_datetime_format
+
+from processor import VENTAS_COLS, parse_fecha_auditorias
+from readers import BOM_UTF8, VALORES_NULOS, columnas_canonicas, preparar_csv
+
+# ============================================================
+# 🐻‍❄️ MOTOR POLARS (OPCIONAL)
+# ============================================================
+#
+# Los 10 process_* como consultas lazy de Polars sobre el CSV crudo:
+# scan_csv + select de las columnas del esquema (proyección en la lectura),
+# filtro de rango apenas se calcula la fecha (predicado empujado al scan) y
+# group_by multihilo. Devuelve la misma tabla diaria (en pandas) que el
+# process_* correspondiente, para completar_diario y las vistas.
+#
+# Se elige con CLAIRPORT_MOTOR=polars (o --motor polars en el CLI); los
+# .xlsx siguen por el lector y el process_* de pandas. Requiere polars.
+
+EMAIL_RESCATES = "emergencias.excellence.cl@cabify.com"
+
+# Filas leídas para inferir el formato de fecha (como pd.to_datetime: el primer valor no nulo)
+FILAS_MUESTRA = 1000
+
+
+def _abrir_csv(nombre: str, data) -> pl.LazyFrame:
+    """
+    LazyFrame del CSV (bytes o ruta) con solo las columnas del esquema de la
+    fuente, ya renombradas a su nombre canónico. El CSV es latin-1 como en
+    read_generic_csv; Polars lee UTF-8, así que se recodifica (en memoria)
+    solo si hay bytes no ASCII.
+    """
+    if isinstance(data, (str, os.PathLike)):
+        with open(data, "rb") as f:
+            data = f.read()
+    sep, encabezado = preparar_csv(BytesIO(data), ";" if nombre == "aud" else None)
+    if data.startswith(BOM_UTF8):
+        data = data[len(BOM_UTF8):]
+    if not data.isascii():
+        data = data.decode("latin-1").encode("utf-8")
+    if encabezado is None:
+        encabezado = pl.read_csv(data, separator=sep, n_rows=0).columns
+
+    columnas = columnas_canonicas(encabezado, nombre)
+    return pl.scan_csv(data, separator=sep, infer_schema=False, null_values=VALORES_NULOS).select(
+        pl.col(h).alias(canon) for canon, h in columnas.items()
+    )
+
+
+def _fecha(columna: str, muestra: pd.DataFrame, dayfirst: bool = False) -> pl.Expr:
+    """pd.to_datetime(errors="coerce").dt.normalize() con el formato inferido del primer valor."""
+    valores = muestra[columna].dropna() if columna in muestra.columns else []
+    formato = guess_datetime_format(valores.iloc[0], dayfirst=dayfirst) if len(valores) else None
+    return pl.col(columna).str.to_datetime(formato, strict=False).dt.truncate("1d")
+
+
+def _num(columna: str) -> pl.Expr:
+    """pd.to_numeric(errors="coerce"): lo que no es número queda nulo."""
+    return pl.col(columna).cast(pl.Float64, strict=False).fill_nan(None)
+
+
+def _texto(columna: str) -> pl.Expr:
+    return pl.col(columna).str.strip_chars()
+
+
+def _en_rango(date_from, date_to) -> pl.Expr:
+    dentro = pl.col("fecha").is_not_null()
+    if date_from is not None:
+        dentro &= pl.col("fecha") >= pd.Timestamp(date_from)
+    if date_to is not None:
+        dentro &= pl.col("fecha") <= pd.Timestamp(date_to)
+    return dentro
+
+
+def _contar(expr: pl.Expr) -> pl.Expr:
+    return expr.fill_null(False).sum().cast(pl.Int64)
+
+
+# ============================================================
+# 🔎 CONSULTAS POR FUENTE (mismos KPIs que processor.process_*)
+# ============================================================
+
+def _ventas(lf, muestra, cols):
+    col_fecha = next((c for c in ["tm_start_local_at", "createdAt_local", "date"] if c in cols), None)
+    if col_fecha is None:
+        return None
+    fecha = _fecha(col_fecha, muestra, dayfirst=col_fecha == "date")
+
+    if "qt_price_local" in cols:
+        precio = (
+            pl.col("qt_price_local")
+            .str.replace_all(",", "", literal=True)
+            .str.replace_all(" ", "", literal=True)
+            .str.replace_all("$", "", literal=True)
+        )
+        precio = precio.cast(pl.Float64, strict=False).fill_nan(None)
+    else:
+        precio = pl.lit(None, dtype=pl.Float64)
+
+    prod = _texto("ds_product_name").str.to_lowercase() if "ds_product_name" in cols else pl.lit("")
+    compartida = (prod == "van_compartida").fill_null(False)
+    exclusiva = (prod == "van_exclusive").fill_null(False)
+
+    if "finishReason" in cols:
+        dropoff = (_texto("finishReason").str.to_uppercase() == "FINISH_REASON_DROPOFF").fill_null(False)
+    else:
+        dropoff = pl.lit(False)
+
+    if "journey_id" in cols:
+        jid = _texto("journey_id")
+        q_journeys = jid.filter(dropoff & jid.is_not_null() & (jid != "")).n_unique().cast(pl.Int64)
+    else:
+        q_journeys = pl.lit(0, dtype=pl.Int64)
+
+    return fecha, [
+        precio.sum().alias("Ventas_Totales"),
+        precio.filter(compartida).sum().alias("Ventas_Compartidas"),
+        precio.filter(exclusiva).sum().alias("Ventas_Exclusivas"),
+        _contar(dropoff).alias("Q_pasajeros"),
+        _contar(dropoff & exclusiva).alias("Q_pasajeros_exclusives"),
+        _contar(dropoff & compartida).alias("Q_pasajeros_compartidas"),
+        q_journeys.alias("Q_journeys"),
+    ]
+
+
+def _performance(lf, muestra, cols):
+    resuelto = (_texto("Status").str.to_lowercase() != "pending").fill_null(True)
+    return _fecha("Fecha de Referencia", muestra), [
+        _contar(pl.col("CSAT").is_not_null() | pl.col("NPS Score").is_not_null()).alias("Q_Encuestas"),
+        _num("CSAT").mean().alias("CSAT"),
+        _num("NPS Score").mean().alias("NPS Score"),
+        _num("Firt (h)").mean().alias("Firt (h)"),
+        _num("% Firt").mean().alias("firt_pct"),
+        _num("Furt (h)").mean().alias("Furt (h)"),
+        _num("% Furt").mean().alias("furt_pct"),
+        _num("Reopen").sum().alias("Reopen"),
+        pl.len().cast(pl.Int64).alias("Q_Ticket"),
+        _contar(resuelto).alias("Q_Tickets_Resueltos"),
+    ]
+
+
+def _auditorias(lf, muestra, cols):
+    if "Date Time Reference" not in cols or "Total Audit Score" not in cols:
+        return None
+    nota = (
+        pl.col("Total Audit Score")
+        .str.replace_all(",", ".", literal=True)
+        .str.replace_all("%", "", literal=True)
+        .str.strip_chars()
+        .cast(pl.Float64, strict=False)
+        .fill_nan(None)
+        .fill_null(0)
+    )
+    # fecha: columna ya resuelta por _resolver_fechas_auditorias
+    return pl.col("fecha"), [
+        pl.len().cast(pl.Int64).alias("Q_Auditorias"),
+        nota.mean().alias("Nota_Auditorias"),
+    ]
+
+
+def _resolver_fechas_auditorias(lf: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Las fechas de auditoría mezclan formatos (y seriales de Excel): se parsean
+    con parse_fecha_auditorias una vez por valor distinto y se unen al scan.
+    """
+    distintos = lf.select(pl.col("Date Time Reference").unique().drop_nulls()).collect().to_series()
+    crudos = pd.Series(distintos.to_list(), dtype="str")
+    # Como read_csv: si todos los valores son números, la columna es numérica (seriales)
+    numeros = pd.to_numeric(crudos, errors="coerce")
+    if numeros.notna().all():
+        crudos = numeros
+    mapa = pl.DataFrame({
+        "Date Time Reference": distintos,
+        "fecha": pl.Series(parse_fecha_auditorias(crudos).to_numpy(), dtype=pl.Datetime("us")),
+    })
+    return lf.join(mapa.lazy(), on="Date Time Reference", how="left")
+
+
+def _offtime(lf, muestra, cols):
+    off = pl.col("Segment Arrived to Airport vs Requested") != "02. A tiempo (0-20 min antes)"
+    return _fecha("tm_start_local_at", muestra), [_contar(off.fill_null(True)).alias("OFF_TIME")]
+
+
+def _duracion(lf, muestra, cols):
+    return _fecha("Start At Local Dt", muestra), [_contar(_num("Duration (Minutes)") > 90).alias("Duracion_90")]
+
+
+def _duracion30(lf, muestra, cols):
+    return _fecha("Day of tm_start_local_at", muestra), [pl.len().cast(pl.Int64).alias("Duracion_30")]
+
+
+def _inspecciones(lf, muestra, cols):
+    kpis = [pl.len().cast(pl.Int64).alias("Inspecciones_Q")]
+    for parte in ["Exterior", "Interior", "Conductor"]:
+        v = _num(f"Cumplimiento {parte}")
+        kpis += [
+            _contar(v == 100).alias(f"Cump_{parte}"),
+            _contar((v < 100) & v.is_not_null()).alias(f"Incump_{parte}"),
+        ]
+    return _fecha("Fecha", muestra), kpis
+
+
+def _abandonados(lf, muestra, cols):
+    return _fecha("Marca temporal", muestra), [pl.len().cast(pl.Int64).alias("Abandonados")]
+
+
+def _rescates(lf, muestra, cols):
+    if "Start At Local Dttm" not in cols or "User Email" not in cols:
+        return None
+    return _fecha("Start At Local Dttm", muestra), [pl.len().cast(pl.Int64).alias("Rescates")]
+
+
+def _whatsapp(lf, muestra, cols):
+    if "Created At Local Dt" not in cols:
+        return None
+    return _fecha("Created At Local Dt", muestra), [pl.len().cast(pl.Int64).alias("Q_Tickets_WA")]
+
+
+CONSULTAS = {
+    "ventas": (_ventas, VENTAS_COLS),
+    "perf": (_performance, None),
+    "aud": (_auditorias, ["fecha", "Q_Auditorias", "Nota_Auditorias"]),
+    "off": (_offtime, None),
+    "dur90": (_duracion, None),
+    "dur30": (_duracion30, None),
+    "ins": (_inspecciones, None),
+    "aband": (_abandonados, None),
+    "resc": (_rescates, ["fecha", "Rescates"]),
+    "wa": (_whatsapp, ["fecha", "Q_Tickets_WA"]),
+}
+
+
+def consulta(nombre: str, data, date_from=None, date_to=None):
+    """
+    (LazyFrame de la tabla diaria de la fuente, LazyFrame con la cantidad de
+    filas del archivo) para un CSV crudo, o (None, ...) si faltan las
+    columnas con las que el process_* devuelve una tabla vacía.
+    """
+    lf = _abrir_csv(nombre, data)
+    cols = lf.collect_schema().names()
+    filas = lf.select(pl.len())
+
+    if nombre == "aud" and "Date Time Reference" in cols:
+        lf = _resolver_fechas_auditorias(lf)
+    elif nombre == "resc" and "User Email" in cols:
+        lf = lf.filter(_texto("User Email").str.to_lowercase() == EMAIL_RESCATES)
+
+    # Primeras filas (ya filtradas, como las ve el process_*) para inferir formatos de fecha
+    muestra = lf.head(FILAS_MUESTRA).collect().to_pandas()
+
+    armar, _ = CONSULTAS[nombre]
+    partes = armar(lf, muestra, cols)
+    if partes is None:
+        return None, filas
+    fecha, kpis = partes
+
+    diario = (
+        lf.with_columns(fecha.alias("fecha"))
+        .filter(_en_rango(date_from, date_to))
+        .group_by("fecha")
+        .agg(kpis)
+        .sort("fecha")
+    )
+    return diario, filas
+
+
+def procesar(nombre: str, data, date_from=None, date_to=None):
+    """
+    Tabla diaria (pandas) de la fuente a partir de su CSV (bytes o ruta), igual
+    a la del process_* de pandas. Retorna (diario, filas del archivo).
+    """
+    diario, filas = consulta(nombre, data, date_from, date_to)
+    if diario is None:
+        return pd.DataFrame(columns=CONSULTAS[nombre][1]), filas.collect().item()
+    diario, filas = pl.collect_all([diario, filas])
+    return diario.to_pandas(), filas.item()
@@ -0,0 +1,155 @@
+import contextvars
+import functools
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# ============================================================
+# 🔬 PERFILADO POR ETAPA (tiempo, CPU, memoria, filas)
+# ============================================================
+#
+# Uso:
+#     tracer = Tracer()
+#     with activar(tracer):
+#         procesar_global(...)
+#     tracer.to_frame() / tracer.to_json()
+#
+# Las funciones decoradas con @trazar y los bloques `with etapa(...)` no hacen
+# nada si no hay un Tracer activo en el contexto actual.
+# tracemalloc es global al proceso: con etapas corriendo en hilos a la vez,
+# el pico de memoria de cada una incluye lo que asignan las demás (y cpu_s,
+# que es CPU de todo el proceso, también suma la de los otros hilos).
+
+_ACTIVO = contextvars.ContextVar("clairport_tracer", default=None)
+
+
+def _rss_max_mb():
+    if resource is None:
+        return None
+    # Linux: KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _filas(obj):
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return len(obj)
+    if isinstance(obj, tuple) and obj and isinstance(obj[0], (pd.DataFrame, pd.Series)):
+        return len(obj[0])
+    return None
+
+
+class Tracer:
+    def __init__(self, memoria: bool = True):
+        self.memoria = memoria
+        self.registros = []
+        self._pila = []
+        self._inicio_tracemalloc = False
+
+    @contextmanager
+    def etapa(self, nombre: str, filas_in=None):
+        if self.memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._inicio_tracemalloc = True
+
+        reg = {"etapa": nombre, "nivel": len(self._pila), "filas_in": filas_in, "filas_out": None}
+        if self.memoria:
+            mem0, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            reg["_mem0"], reg["_pico_hijos"] = mem0, 0
+        rss0 = _rss_max_mb()
+        w0, c0 = time.perf_counter(), time.process_time()
+
+        # en orden de inicio (padre antes que sus etapas hijas)
+        self.registros.append(reg)
+        self._pila.append(reg)
+        try:
+            yield reg
+        finally:
+            self._pila.pop()
+            reg["wall_s"] = time.perf_counter() - w0
+            reg["cpu_s"] = time.process_time() - c0
+            if self.memoria:
+                _, pico = tracemalloc.get_traced_memory()
+                # reset_peak de las etapas hijas borra el pico ya visto por esta
+                pico = max(pico, reg.pop("_pico_hijos"))
+                reg["pico_mem_mb"] = max(pico - reg.pop("_mem0"), 0) / 1024 ** 2
+                if self._pila:
+                    padre = self._pila[-1]
+                    padre["_pico_hijos"] = max(padre["_pico_hijos"], pico)
+            rss1 = _rss_max_mb()
+            if rss1 is not None:
+                reg["rss_max_mb"] = rss1
+                reg["rss_delta_mb"] = rss1 - rss0
+
+            if not self._pila and self._inicio_tracemalloc:
+                tracemalloc.stop()
+                self._inicio_tracemalloc = False
+
+    def extender(self, registros, prefijo: str = ""):
+        """Agrega registros medidos en otro proceso / hilo (p.ej. workers de ingesta)."""
+        for r in registros:
+            r = dict(r)
+            r["etapa"] = prefijo + r["etapa"]
+            r["nivel"] = r.get("nivel", 0) + len(self._pila)
+            self.registros.append(r)
+
+    def to_frame(self) -> pd.DataFrame:
+        cols = ["etapa", "nivel", "wall_s", "cpu_s", "pico_mem_mb", "rss_max_mb", "rss_delta_mb",
+                "filas_in", "filas_out"]
+        df = pd.DataFrame(self.registros)
+        return df.reindex(columns=[c for c in cols if c in df.columns])
+
+    def to_json(self) -> str:
+        return json.dumps(self.registros, ensure_ascii=False, indent=2, default=str)
+
+
+def actual():
+    """Tracer activo en este contexto (o None)."""
+    return _ACTIVO.get()
+
+
+@contextmanager
+def activar(tracer: Tracer):
+    token = _ACTIVO.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _ACTIVO.reset(token)
+
+
+@contextmanager
+def etapa(nombre: str, filas_in=None):
+    """Bloque medido si hay Tracer activo; si no, no hace nada (yield de un dict descartable)."""
+    tracer = _ACTIVO.get()
+    if tracer is None:
+        yield {}
+        return
+    with tracer.etapa(nombre, filas_in) as reg:
+        yield reg
+
+
+def trazar(nombre: str = None):
+    """Decorador: mide la función como etapa (filas_in = primer DataFrame de los argumentos)."""
+    def deco(fn):
+        etiqueta = nombre or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            tracer = _ACTIVO.get()
+            if tracer is None:
+                return fn(*args, **kwargs)
+            filas_in = next((_filas(a) for a in args if _filas(a) is not None), None)
+            with tracer.etapa(etiqueta, filas_in) as reg:
+                out = fn(*args, **kwargs)
+                reg["filas_out"] = _filas(out)
+            return out
+        return wrapper
+    return deco
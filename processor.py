@@ -2,18 +2,34 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+from calendario import MESES, dimension_fechas, semana_humana  # noqa: F401
+from esquemas import nombres_aceptados
+from perfilado import etapa, trazar
+
+# Copy-on-Write (siempre activo desde pandas 3): selecciones, set_axis y
+# assign comparten los datos de origen hasta que alguien los modifica, así
+# que no hacen falta copias defensivas para no tocar el DataFrame del llamador.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
 # ============================================================
 # 🔧 LIMPIEZA DE COLUMNAS
 # ============================================================
 
-def clean_cols(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    df.columns = (
+def clean_cols(df: pd.DataFrame, columnas=None) -> pd.DataFrame:
+    """
+    Encabezados sin BOM ni espacios (sin copiar datos). Con columnas, deja
+    solo esas (las que existan), antes de que el processor agregue derivadas.
+    """
+    df = df.set_axis(
         df.columns.astype(str)
         .str.replace("ï»¿", "", regex=False)
         .str.replace("\ufeff", "", regex=False)
-        .str.strip()
+        .str.strip(),
+        axis=1,
     )
+    if columnas is not None:
+        df = df[[c for c in df.columns.unique() if c in columnas]]
     return df
 
 
@@ -23,11 +39,51 @@ def safe_pct(numer: pd.Series, denom: pd.Series) -> pd.Series:
     return (100.0 * numer / denom2)
 
 
+def texto_normalizado(col: pd.Series, fn) -> pd.Series:
+    """
+    fn(col.astype(str)) como category: fn (operaciones .str sobre un Index)
+    se aplica una vez por valor distinto, no por fila. NaN queda como "nan",
+    igual que con astype(str).
+    """
+    codigos, valores = pd.factorize(col, use_na_sentinel=False)
+    norm = fn(pd.Index(valores).astype(str))
+    codigos_norm, categorias = pd.factorize(norm)
+    return pd.Series(
+        pd.Categorical.from_codes(codigos_norm[codigos], categorias),
+        index=col.index,
+    )
+
+
+def recortar_rango(df: pd.DataFrame, fecha: pd.Series, date_from=None, date_to=None):
+    """
+    (df, fecha) solo con las filas cuya fecha cae en [date_from, date_to]
+    (None = sin cota). Los process_* lo aplican apenas calculan la fecha, antes
+    de limpiar textos o números. Sin rango devuelve ambos tal cual, sin copiar.
+    """
+    if date_from is None and date_to is None:
+        return df, fecha
+    dentro = fecha.notna()
+    if date_from is not None:
+        dentro &= fecha >= pd.Timestamp(date_from)
+    if date_to is not None:
+        dentro &= fecha <= pd.Timestamp(date_to)
+    dentro = dentro.to_numpy()
+    return df[dentro], fecha[dentro]
+
+
 # ============================================================
 # 🟦 PROCESAR VENTAS
 # ============================================================
 
-def process_ventas(df: pd.DataFrame) -> pd.DataFrame:
+VENTAS_COLS = [
+    "fecha",
+    "Ventas_Totales", "Ventas_Compartidas", "Ventas_Exclusivas",
+    "Q_journeys", "Q_pasajeros", "Q_pasajeros_exclusives", "Q_pasajeros_compartidas",
+]
+
+
+@trazar()
+def process_ventas(df: pd.DataFrame, date_from=None, date_to=None) -> pd.DataFrame:
     """
     KPIs existentes:
       - Ventas_Totales (suma qt_price_local)
@@ -39,43 +95,97 @@ def process_ventas(df: pd.DataFrame) -> pd.DataFrame:
       - Q_pasajeros: count registros (dropoff)
       - Q_pasajeros_exclusives: count dropoff con van_exclusive
       - Q_pasajeros_compartidas: count dropoff con van_compartida
+
+    date_from / date_to: solo se procesan las filas de ese rango (ver recortar_rango).
     """
-    df = clean_cols(df)
+    parcial = _ventas_parcial(df, date_from, date_to)
+    if parcial is None:
+        return pd.DataFrame(columns=VENTAS_COLS)
+    return _ventas_diario(*parcial)
+
+
+@trazar()
+def process_ventas_por_bloques(bloques, date_from=None, date_to=None) -> pd.DataFrame:
+    """
+    process_ventas sobre un export leído por partes (iterable de DataFrames,
+    p.ej. readers.read_csv_por_bloques), sin tenerlo entero en memoria.
+    Por bloque se acumulan las sumas diarias y los pares (fecha, journey_id)
+    dropoff distintos, así Q_journeys es exacto aunque un journey cruce
+    bloques. La memoria depende del tamaño del bloque y de la cantidad de
+    días / journeys distintos, no del archivo.
+
+    journey_id debe leerse como texto en todos los bloques (si un bloque lo
+    infiere como número, "123" y "123.0" contarían como journeys distintos).
+    """
+    sumas, pares = None, None
+    pendientes, n_pendientes = [], 0
+    for bloque in bloques:
+        parcial = _ventas_parcial(bloque, date_from, date_to)
+        if parcial is None:
+            continue
+        s, p = parcial
+
+        # Sumas diarias: tabla de a lo más una fila por día
+        if sumas is None or len(sumas) == 0:
+            sumas = s
+        elif len(s):
+            sumas = pd.concat([sumas, s]).groupby("fecha", as_index=False).sum()
+
+        # Pares distintos: se deduplican cuando lo pendiente supera a lo ya
+        # deduplicado (costo amortizado lineal, memoria ≤ 2x los pares distintos)
+        if p is not None:
+            pendientes.append(p)
+            n_pendientes += len(p)
+            if n_pendientes > (0 if pares is None else len(pares)):
+                pares = pd.concat(([] if pares is None else [pares]) + pendientes).drop_duplicates()
+                pendientes, n_pendientes = [], 0
+
+    if sumas is None:
+        return pd.DataFrame(columns=VENTAS_COLS)
+    if pendientes:
+        pares = pd.concat(([] if pares is None else [pares]) + pendientes).drop_duplicates()
+    return _ventas_diario(sumas, pares)
+
+
+def _ventas_parcial(df: pd.DataFrame, date_from=None, date_to=None):
+    """
+    Parte acumulable de process_ventas: (sumas por día, pares (fecha, journey_id)
+    dropoff distintos, o None si no hay journey_id). None si no hay columna de fecha.
+    """
+    df = clean_cols(df, nombres_aceptados("ventas"))
 
     # Fecha base para agrupar por día
     if "tm_start_local_at" in df.columns:
-        df["fecha"] = pd.to_datetime(df["tm_start_local_at"], errors="coerce").dt.normalize()
+        fecha = pd.to_datetime(df["tm_start_local_at"], errors="coerce").dt.normalize()
     elif "createdAt_local" in df.columns:
-        df["fecha"] = pd.to_datetime(df["createdAt_local"], errors="coerce").dt.normalize()
+        fecha = pd.to_datetime(df["createdAt_local"], errors="coerce").dt.normalize()
     elif "date" in df.columns:
         # En algunos exports 'date' viene como DD-MM-YYYY o similar
-        df["fecha"] = pd.to_datetime(df["date"], errors="coerce", dayfirst=True).dt.normalize()
+        fecha = pd.to_datetime(df["date"], errors="coerce", dayfirst=True).dt.normalize()
     else:
-        return pd.DataFrame(columns=[
-            "fecha",
-            "Ventas_Totales", "Ventas_Compartidas", "Ventas_Exclusivas",
-            "Q_journeys", "Q_pasajeros", "Q_pasajeros_exclusives", "Q_pasajeros_compartidas",
-        ])
+        return None
+    df, fecha = recortar_rango(df, fecha, date_from, date_to)
 
     # Monto / precio
     if "qt_price_local" in df.columns:
-        df["qt_price_local"] = (
+        precio = pd.to_numeric(
             df["qt_price_local"]
             .astype(str)
             .str.replace(",", "", regex=False)
             .str.replace(" ", "", regex=False)
-            .str.replace("$", "", regex=False)
+            .str.replace("$", "", regex=False),
+            errors="coerce",
         )
-        df["qt_price_local"] = pd.to_numeric(df["qt_price_local"], errors="coerce")
     else:
-        df["qt_price_local"] = np.nan
+        precio = pd.Series(np.nan, index=df.index)
 
-    # Ventas (monto)
-    prod = df.get("ds_product_name", pd.Series([""] * len(df), index=df.index)).astype(str).str.lower().str.strip()
-
-    df["Ventas_Totales"] = df["qt_price_local"]
-    df["Ventas_Compartidas"] = np.where(prod == "van_compartida", df["qt_price_local"], 0)
-    df["Ventas_Exclusivas"] = np.where(prod == "van_exclusive", df["qt_price_local"], 0)
+    # Producto: 0 otro, 1 van_compartida, 2 van_exclusive
+    prod = texto_normalizado(
+        df.get("ds_product_name", pd.Series([""] * len(df), index=df.index)),
+        lambda s: s.str.lower().str.strip(),
+    )
+    producto = (prod == "van_compartida").to_numpy().astype(np.int8)
+    producto[(prod == "van_exclusive").to_numpy()] = 2
 
     # Dropoff filter (finishReason)
     fr_col = None
@@ -87,40 +197,52 @@ def process_ventas(df: pd.DataFrame) -> pd.DataFrame:
     if fr_col is None:
         is_dropoff = pd.Series([False] * len(df), index=df.index)
     else:
-        is_dropoff = df[fr_col].astype(str).str.strip().str.upper().eq("FINISH_REASON_DROPOFF")
-
-    # Volumen de pasajeros
-    df["Q_pasajeros"] = is_dropoff.astype(int)
-    df["Q_pasajeros_exclusives"] = np.where(is_dropoff & (prod == "van_exclusive"), 1, 0)
-    df["Q_pasajeros_compartidas"] = np.where(is_dropoff & (prod == "van_compartida"), 1, 0)
+        is_dropoff = texto_normalizado(df[fr_col], lambda s: s.str.strip().str.upper()).eq("FINISH_REASON_DROPOFF")
+
+    # Una sola agregación por (fecha, producto, dropoff): suma de precio y
+    # cantidad de filas. Los KPIs salen de esa tabla chica (≤ 6 filas por día)
+    # en vez de columnas derivadas sobre todas las filas.
+    grupos = (
+        precio.groupby([fecha, producto, is_dropoff.to_numpy()])
+        .agg(["sum", "size"])
+        .reset_index(names=["fecha", "producto", "dropoff"])
+    )
+    compartida = grupos["producto"].eq(1)
+    exclusiva = grupos["producto"].eq(2)
+    dropoff = grupos["dropoff"]
+
+    sumas = (
+        pd.DataFrame({
+            "fecha": grupos["fecha"],
+            "Ventas_Totales": grupos["sum"],
+            "Ventas_Compartidas": grupos["sum"].where(compartida, 0),
+            "Ventas_Exclusivas": grupos["sum"].where(exclusiva, 0),
+            "Q_pasajeros": grupos["size"].where(dropoff, 0),
+            "Q_pasajeros_exclusives": grupos["size"].where(dropoff & exclusiva, 0),
+            "Q_pasajeros_compartidas": grupos["size"].where(dropoff & compartida, 0),
+        })
+        .groupby("fecha", as_index=False)
+        .sum()
+    )
 
-    # Journeys (unique journey_id para dropoff)
+    # Pares (fecha, journey_id normalizado) distintos de las filas dropoff
+    pares = None
     if "journey_id" in df.columns:
-        jid = df["journey_id"].astype(str).str.strip()
-        df["_jid"] = jid
-    else:
-        df["_jid"] = ""
-
-    # Agregación diaria base
-    diario = df.groupby("fecha", as_index=False).agg({
-        "Ventas_Totales": "sum",
-        "Ventas_Compartidas": "sum",
-        "Ventas_Exclusivas": "sum",
-        "Q_pasajeros": "sum",
-        "Q_pasajeros_exclusives": "sum",
-        "Q_pasajeros_compartidas": "sum",
-    })
+        jid = df.loc[is_dropoff.to_numpy(), "journey_id"].astype(str).str.strip()
+        validos = (jid.ne("") & jid.notna()).to_numpy()
+        pares = pd.DataFrame({"fecha": fecha[is_dropoff.to_numpy()][validos], "jid": jid[validos]}).drop_duplicates()
 
-    # Q_journeys (nunique)
-    if "journey_id" in df.columns:
-        qj = (
-            df[is_dropoff & df["_jid"].ne("") & df["_jid"].notna()]
-            .groupby("fecha")["_jid"]
-            .nunique()
-            .reset_index()
-            .rename(columns={"_jid": "Q_journeys"})
-        )
-        diario = diario.merge(qj, on="fecha", how="left")
+    return sumas, pares
+
+
+def _ventas_diario(sumas: pd.DataFrame, pares) -> pd.DataFrame:
+    """Tabla diaria de process_ventas a partir de _ventas_parcial (o de sus acumulados)."""
+    diario = sumas
+
+    # Q_journeys: journeys distintos (dropoff) por día
+    if pares is not None:
+        qj = pares["fecha"].value_counts()
+        diario["Q_journeys"] = qj.reindex(diario["fecha"]).to_numpy()
     else:
         diario["Q_journeys"] = 0
 
@@ -133,37 +255,35 @@ def process_ventas(df: pd.DataFrame) -> pd.DataFrame:
 # 🟩 PROCESAR PERFORMANCE
 # ============================================================
 
-def process_performance(df: pd.DataFrame) -> pd.DataFrame:
-    df = clean_cols(df)
+@trazar()
+def process_performance(df: pd.DataFrame, date_from=None, date_to=None) -> pd.DataFrame:
+    df = clean_cols(df, nombres_aceptados("perf"))
 
     df = df.rename(columns={"% Firt": "firt_pct", "% Furt": "furt_pct"})
 
     # Fecha de Referencia (MM/DD/YYYY)
     df["fecha"] = pd.to_datetime(df["Fecha de Referencia"], errors="coerce").dt.normalize()
-
-    df["Q_Ticket"] = 1
+    df, _ = recortar_rango(df, df["fecha"], date_from, date_to)
 
     # Resueltos = todo menos pending (criterio global actual)
-    status = df["Status"].astype(str).str.lower().str.strip()
-    df["Q_Tickets_Resueltos"] = np.where(status != "pending", 1, 0)
+    status = texto_normalizado(df["Status"], lambda s: s.str.lower().str.strip())
+    df["Q_Tickets_Resueltos"] = status != "pending"
 
     # Encuestas
-    df["Q_Encuestas"] = np.where(
-        df["CSAT"].notna() | df["NPS Score"].notna(),
-        1, 0
-    )
-
-    diario = df.groupby("fecha", as_index=False).agg({
-        "Q_Encuestas": "sum",
-        "CSAT": "mean",
-        "NPS Score": "mean",
-        "Firt (h)": "mean",
-        "firt_pct": "mean",
-        "Furt (h)": "mean",
-        "furt_pct": "mean",
-        "Reopen": "sum",
-        "Q_Ticket": "sum",
-        "Q_Tickets_Resueltos": "sum"
+    df["Q_Encuestas"] = df["CSAT"].notna() | df["NPS Score"].notna()
+
+    # Q_Ticket = filas del día (size), sin columna constante
+    diario = df.groupby("fecha", as_index=False).agg(**{
+        "Q_Encuestas": ("Q_Encuestas", "sum"),
+        "CSAT": ("CSAT", "mean"),
+        "NPS Score": ("NPS Score", "mean"),
+        "Firt (h)": ("Firt (h)", "mean"),
+        "firt_pct": ("firt_pct", "mean"),
+        "Furt (h)": ("Furt (h)", "mean"),
+        "furt_pct": ("furt_pct", "mean"),
+        "Reopen": ("Reopen", "sum"),
+        "Q_Ticket": ("Q_Encuestas", "size"),
+        "Q_Tickets_Resueltos": ("Q_Tickets_Resueltos", "sum"),
     })
 
     return diario
@@ -173,42 +293,126 @@ def process_performance(df: pd.DataFrame) -> pd.DataFrame:
 # 🟪 PROCESAR AUDITORÍAS
 # ============================================================
 
-def process_auditorias(df: pd.DataFrame) -> pd.DataFrame:
-    df = clean_cols(df)
-
-    candidates = ["Date Time Reference", "Date Time", "ï»¿Date Time"]
-    col_fecha = next((c for c in candidates if c in df.columns), None)
+FORMATOS_FECHA_AUD = ("%d/%m/%Y", "%d-%m-%Y", "%d/%m/%y", "%d-%m-%y", "%Y-%m-%d", "%Y/%m/%d")
 
-    if col_fecha is None:
-        return pd.DataFrame(columns=["fecha", "Q_Auditorias", "Nota_Auditorias"])
+# Seriales Excel que caben en datetime64[ns] (1982-02-18 .. 2262-04-11)
+_SERIAL_MIN, _SERIAL_MAX = 30000, 132000
+_EXCEL_EPOCH = np.datetime64("1899-12-30", "ns")
+_US_POR_DIA = 86_400_000_000
 
-    def to_date_aud(x):
-        if pd.isna(x):
-            return None
 
-        if isinstance(x, (int, float)):
-            try:
-                if x > 30000:
-                    return (datetime(1899, 12, 30) + timedelta(days=float(x))).date()
-            except:
-                pass
+def _to_date_aud(x):
+    """Parser escalar original de fechas de auditoría (referencia y fallback)."""
+    if pd.isna(x):
+        return None
 
-        s = str(x).strip()
+    if isinstance(x, (int, float)):
+        try:
+            if x > 30000:
+                return (datetime(1899, 12, 30) + timedelta(days=float(x))).date()
+        except:
+            pass
 
-        for fmt in ("%d/%m/%Y", "%d-%m-%Y", "%d/%m/%y", "%d-%m-%y", "%Y-%m-%d", "%Y/%m/%d"):
-            try:
-                return datetime.strptime(s, fmt).date()
-            except:
-                pass
+    s = str(x).strip()
 
+    for fmt in FORMATOS_FECHA_AUD:
         try:
-            return pd.to_datetime(s, dayfirst=True).date()
+            return datetime.strptime(s, fmt).date()
         except:
-            return None
+            pass
+
+    try:
+        return pd.to_datetime(s, dayfirst=True).date()
+    except:
+        return None
+
 
-    df["fecha"] = df[col_fecha].apply(to_date_aud)
+def parse_fecha_auditorias(col: pd.Series) -> pd.Series:
+    """
+    Versión vectorizada de _to_date_aud (mismo resultado como datetime64[ns];
+    NaT si no se resuelve o si cae fuera del rango de pandas):
+      1) Seriales Excel (> 30000) en una sola operación
+      2) Cada formato de FORMATOS_FECHA_AUD como una pasada de pd.to_datetime(format=...)
+         sobre los textos (únicos) aún sin resolver
+      3) Lo que quede se resuelve con _to_date_aud una vez por valor único
+    """
+    out = pd.Series(pd.NaT, index=col.index, dtype="datetime64[ns]")
+    pendiente = col.notna().to_numpy().copy()
+    if not pendiente.any():
+        return out
+
+    tipo = pd.api.types.infer_dtype(col, skipna=True)
+    if tipo in ("integer", "floating", "mixed-integer-float"):
+        es_num = pendiente.copy()
+        es_str = np.zeros(len(col), dtype=bool)
+    elif tipo == "string":
+        es_num = np.zeros(len(col), dtype=bool)
+        es_str = pendiente.copy()
+    else:
+        # Columna mixta (típico de Excel): clasificar por tipo como lo hace el parser escalar
+        es_num = pendiente & col.map(lambda v: isinstance(v, (int, float))).to_numpy(dtype=bool)
+        es_str = pendiente & col.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)
+
+    # 1) Seriales Excel
+    if es_num.any():
+        x = pd.to_numeric(col[es_num], errors="coerce").to_numpy(dtype="float64")
+        ok = (x > _SERIAL_MIN) & (x < _SERIAL_MAX)
+        if ok.any():
+            # timedelta(days=x) redondea la fracción a microsegundos; .date() trunca al día
+            enteros = np.floor(x[ok])
+            us = np.round((x[ok] - enteros) * _US_POR_DIA)
+            dias = enteros.astype("int64") + (us >= _US_POR_DIA)
+            idx = np.flatnonzero(es_num)[ok]
+            out.iloc[idx] = _EXCEL_EPOCH + dias.astype("timedelta64[D]")
+            pendiente[idx] = False
+
+    # 2) Formatos conocidos: una pasada por formato sobre los textos únicos aún sin resolver
+    if es_str.any():
+        pos = np.flatnonzero(es_str)
+        codigos, unicos = pd.factorize(col[es_str].astype(str).str.strip())
+        unicos = pd.Series(unicos)
+        fechas = pd.Series(pd.NaT, index=unicos.index, dtype="datetime64[ns]")
+        for fmt in FORMATOS_FECHA_AUD:
+            resto = fechas.isna()
+            if not resto.any():
+                break
+            fechas[resto] = pd.to_datetime(unicos[resto], format=fmt, errors="coerce")
+
+        hit = fechas.notna().to_numpy()[codigos]
+        out.iloc[pos[hit]] = fechas.to_numpy()[codigos[hit]]
+        pendiente[pos[hit]] = False
+
+    # 3) Fallback escalar sobre valores únicos
+    if pendiente.any():
+        resto = col[pendiente]
+        unicos = pd.unique(resto)
+        mapa = {}
+        for u in unicos:
+            d = _to_date_aud(u)
+            try:
+                mapa[u] = pd.Timestamp(d).as_unit("ns") if d is not None and not pd.isna(d) else pd.NaT
+            except (OverflowError, ValueError):
+                mapa[u] = pd.NaT
+        out.iloc[np.flatnonzero(pendiente)] = pd.to_datetime(
+            resto.map(mapa), errors="coerce"
+        ).astype("datetime64[ns]").to_numpy()
+
+    return out
+
+
+@trazar()
+def process_auditorias(df: pd.DataFrame, date_from=None, date_to=None) -> pd.DataFrame:
+    df = clean_cols(df, nombres_aceptados("aud"))
+
+    candidates = ["Date Time Reference", "Date Time", "ï»¿Date Time"]
+    col_fecha = next((c for c in candidates if c in df.columns), None)
+
+    if col_fecha is None:
+        return pd.DataFrame(columns=["fecha", "Q_Auditorias", "Nota_Auditorias"])
+
+    df["fecha"] = parse_fecha_auditorias(df[col_fecha])
     df = df[df["fecha"].notna()]
-    df["fecha"] = pd.to_datetime(df["fecha"])
+    df, _ = recortar_rango(df, df["fecha"], date_from, date_to)
 
     if "Total Audit Score" not in df.columns:
         return pd.DataFrame(columns=["fecha", "Q_Auditorias", "Nota_Auditorias"])
@@ -222,12 +426,9 @@ def process_auditorias(df: pd.DataFrame) -> pd.DataFrame:
     )
 
     df["Nota_Auditorias"] = pd.to_numeric(score_raw, errors="coerce").fillna(0)
-    df["Q_Auditorias"] = 1
 
-    diario = df.groupby("fecha", as_index=False).agg({
-        "Q_Auditorias": "sum",
-        "Nota_Auditorias": "mean"
-    })
+    g = df.groupby("fecha")["Nota_Auditorias"]
+    diario = pd.DataFrame({"Q_Auditorias": g.size(), "Nota_Auditorias": g.mean()}).reset_index()
 
     return diario
 
@@ -236,234 +437,307 @@ def process_auditorias(df: pd.DataFrame) -> pd.DataFrame:
 # 🟧 OTROS PROCESADORES
 # ============================================================
 
-def process_offtime(df: pd.DataFrame) -> pd.DataFrame:
-    df = clean_cols(df)
+@trazar()
+def process_offtime(df: pd.DataFrame, date_from=None, date_to=None) -> pd.DataFrame:
+    df = clean_cols(df, nombres_aceptados("off"))
     df["fecha"] = pd.to_datetime(df["tm_start_local_at"], errors="coerce").dt.normalize()
-    df["OFF_TIME"] = np.where(
-        df["Segment Arrived to Airport vs Requested"] != "02. A tiempo (0-20 min antes)",
-        1, 0
-    )
+    df, _ = recortar_rango(df, df["fecha"], date_from, date_to)
+    df["OFF_TIME"] = df["Segment Arrived to Airport vs Requested"] != "02. A tiempo (0-20 min antes)"
     return df.groupby("fecha", as_index=False).agg({"OFF_TIME": "sum"})
 
 
-def process_duracion(df: pd.DataFrame) -> pd.DataFrame:
-    df = clean_cols(df)
+@trazar()
+def process_duracion(df: pd.DataFrame, date_from=None, date_to=None) -> pd.DataFrame:
+    df = clean_cols(df, nombres_aceptados("dur90"))
     df["fecha"] = pd.to_datetime(df["Start At Local Dt"], errors="coerce").dt.normalize()
-    df["Duracion_90"] = np.where(pd.to_numeric(df["Duration (Minutes)"], errors="coerce") > 90, 1, 0)
+    df, _ = recortar_rango(df, df["fecha"], date_from, date_to)
+    df["Duracion_90"] = pd.to_numeric(df["Duration (Minutes)"], errors="coerce") > 90
     return df.groupby("fecha", as_index=False).agg({"Duracion_90": "sum"})
 
 
-def process_duracion30(df: pd.DataFrame) -> pd.DataFrame:
-    df = clean_cols(df)
+@trazar()
+def process_duracion30(df: pd.DataFrame, date_from=None, date_to=None) -> pd.DataFrame:
+    df = clean_cols(df, nombres_aceptados("dur30"))
     df["fecha"] = pd.to_datetime(df["Day of tm_start_local_at"], errors="coerce").dt.normalize()
-    df["Duracion_30"] = 1
-    return df.groupby("fecha", as_index=False).agg({"Duracion_30": "sum"})
+    df, _ = recortar_rango(df, df["fecha"], date_from, date_to)
+    return df.groupby("fecha").size().reset_index(name="Duracion_30")
 
 
-def process_inspecciones(df: pd.DataFrame) -> pd.DataFrame:
+@trazar()
+def process_inspecciones(df: pd.DataFrame, date_from=None, date_to=None) -> pd.DataFrame:
     # (se mantiene tu versión actual)
-    df = clean_cols(df)
+    df = clean_cols(df, nombres_aceptados("ins"))
     df["fecha"] = pd.to_datetime(df["Fecha"], errors="coerce").dt.normalize()
+    df, _ = recortar_rango(df, df["fecha"], date_from, date_to)
 
     df["Cumplimiento_Exterior"] = pd.to_numeric(df["Cumplimiento Exterior"], errors="coerce")
     df["Cumplimiento_Interior"] = pd.to_numeric(df["Cumplimiento Interior"], errors="coerce")
     df["Cumplimiento_Conductor"] = pd.to_numeric(df["Cumplimiento Conductor"], errors="coerce")
 
-    df["Inspecciones_Q"] = 1
-
-    df["Cump_Exterior"] = (df["Cumplimiento_Exterior"] == 100).astype(int)
-    df["Incump_Exterior"] = (
-        (df["Cumplimiento_Exterior"] < 100) & df["Cumplimiento_Exterior"].notna()
-    ).astype(int)
-
-    df["Cump_Interior"] = (df["Cumplimiento_Interior"] == 100).astype(int)
-    df["Incump_Interior"] = (
-        (df["Cumplimiento_Interior"] < 100) & df["Cumplimiento_Interior"].notna()
-    ).astype(int)
-
-    df["Cump_Conductor"] = (df["Cumplimiento_Conductor"] == 100).astype(int)
-    df["Incump_Conductor"] = (
-        (df["Cumplimiento_Conductor"] < 100) & df["Cumplimiento_Conductor"].notna()
-    ).astype(int)
-
-    diario = df.groupby("fecha", as_index=False).agg({
-        "Inspecciones_Q": "sum",
-        "Cump_Exterior": "sum",
-        "Incump_Exterior": "sum",
-        "Cump_Interior": "sum",
-        "Incump_Interior": "sum",
-        "Cump_Conductor": "sum",
-        "Incump_Conductor": "sum",
-    })
+    df["Cump_Exterior"] = df["Cumplimiento_Exterior"] == 100
+    df["Incump_Exterior"] = (df["Cumplimiento_Exterior"] < 100) & df["Cumplimiento_Exterior"].notna()
+
+    df["Cump_Interior"] = df["Cumplimiento_Interior"] == 100
+    df["Incump_Interior"] = (df["Cumplimiento_Interior"] < 100) & df["Cumplimiento_Interior"].notna()
+
+    df["Cump_Conductor"] = df["Cumplimiento_Conductor"] == 100
+    df["Incump_Conductor"] = (df["Cumplimiento_Conductor"] < 100) & df["Cumplimiento_Conductor"].notna()
+
+    flags = [
+        "Cump_Exterior", "Incump_Exterior",
+        "Cump_Interior", "Incump_Interior",
+        "Cump_Conductor", "Incump_Conductor",
+    ]
+    g = df.groupby("fecha")
+    diario = g[flags].sum()
+    diario.insert(0, "Inspecciones_Q", g.size())
+    diario = diario.reset_index()
 
     return diario
 
 
-def process_abandonados(df: pd.DataFrame) -> pd.DataFrame:
-    df = clean_cols(df)
+@trazar()
+def process_abandonados(df: pd.DataFrame, date_from=None, date_to=None) -> pd.DataFrame:
+    df = clean_cols(df, nombres_aceptados("aband"))
     df["fecha"] = pd.to_datetime(df["Marca temporal"], errors="coerce").dt.normalize()
-    df["Abandonados"] = 1
-    return df.groupby("fecha", as_index=False).agg({"Abandonados": "sum"})
+    df, _ = recortar_rango(df, df["fecha"], date_from, date_to)
+    return df.groupby("fecha").size().reset_index(name="Abandonados")
 
 
-def process_rescates(df: pd.DataFrame) -> pd.DataFrame:
-    df = clean_cols(df)
+@trazar()
+def process_rescates(df: pd.DataFrame, date_from=None, date_to=None) -> pd.DataFrame:
+    df = clean_cols(df, nombres_aceptados("resc"))
     if "Start At Local Dttm" not in df.columns or "User Email" not in df.columns:
         return pd.DataFrame(columns=["fecha", "Rescates"])
 
-    df["User Email"] = df["User Email"].astype(str).str.lower().str.strip()
-    df = df[df["User Email"] == "emergencias.excellence.cl@cabify.com"]
+    email = texto_normalizado(df["User Email"], lambda s: s.str.lower().str.strip())
+    df = df[(email == "emergencias.excellence.cl@cabify.com").to_numpy()]
 
-    df["fecha"] = pd.to_datetime(df["Start At Local Dttm"], errors="coerce").dt.normalize()
-    df["Rescates"] = 1
-    return df.groupby("fecha", as_index=False).agg({"Rescates": "sum"})
+    fecha = pd.to_datetime(df["Start At Local Dttm"], errors="coerce").dt.normalize()
+    _, fecha = recortar_rango(df, fecha, date_from, date_to)
+    return fecha.groupby(fecha).size().rename_axis("fecha").reset_index(name="Rescates")
 
 
-def process_whatsapp(df: pd.DataFrame) -> pd.DataFrame:
-    df = clean_cols(df)
+@trazar()
+def process_whatsapp(df: pd.DataFrame, date_from=None, date_to=None) -> pd.DataFrame:
+    df = clean_cols(df, nombres_aceptados("wa"))
     if "Created At Local Dt" not in df.columns:
         return pd.DataFrame(columns=["fecha", "Q_Tickets_WA"])
     df["fecha"] = pd.to_datetime(df["Created At Local Dt"], errors="coerce").dt.normalize()
-    df["Q_Tickets_WA"] = 1
-    return df.groupby("fecha", as_index=False).agg({"Q_Tickets_WA": "sum"})
+    df, _ = recortar_rango(df, df["fecha"], date_from, date_to)
+    return df.groupby("fecha").size().reset_index(name="Q_Tickets_WA")
 
 
 # ============================================================
-# 📅 SEMANA HUMANA
+# 🔗 COMBINAR FUENTES
 # ============================================================
 
-def semana_humana(fecha: pd.Timestamp) -> str:
-    lunes = fecha - pd.Timedelta(days=fecha.weekday())
-    domingo = lunes + pd.Timedelta(days=6)
-    meses = {
-        1: "Enero", 2: "Febrero", 3: "Marzo", 4: "Abril", 5: "Mayo", 6: "Junio",
-        7: "Julio", 8: "Agosto", 9: "Septiembre", 10: "Octubre", 11: "Noviembre", 12: "Diciembre"
-    }
-    return f"{lunes.day}-{domingo.day} {meses[domingo.month]}"
+def _indexar_fecha(df: pd.DataFrame) -> pd.DataFrame:
+    """Resultado de un process_* con DatetimeIndex 'fecha' (una fila por día)."""
+    out = df.set_index("fecha")
+    idx = out.index
+    if not isinstance(idx, pd.DatetimeIndex):
+        idx = pd.DatetimeIndex(pd.to_datetime(idx))
+    out.index = idx.astype("datetime64[ns]").rename("fecha")
+    return out
+
+
+@trazar()
+def combinar_por_fecha(frames) -> pd.DataFrame:
+    """
+    Equivalente a encadenar merge(on="fecha", how="outer") sobre frames,
+    pero sin re-hashear ni copiar lo acumulado en cada paso: se arma el
+    calendario (unión de fechas) una vez, cada fuente se reindexa sobre él
+    y se pegan con un único pd.concat(axis=1).
+    Mismas columnas (en el mismo orden) y filas ordenadas por fecha.
+    """
+    indexados = [_indexar_fecha(f) for f in frames]
+
+    fechas = np.unique(np.concatenate([f.index.to_numpy() for f in indexados]))
+    calendario = pd.DatetimeIndex(fechas, name="fecha")
+
+    df = pd.concat([f.reindex(calendario) for f in indexados], axis=1)
+    return df.reset_index()
 
 
 # ============================================================
 # 🔵 PROCESAR GLOBAL
 # ============================================================
 
-def procesar_global(
+# --- columnas base
+SUM_COLS = [
+    # performance / calidad
+    "Q_Encuestas", "Reopen", "Q_Ticket", "Q_Tickets_Resueltos",
+    "Q_Tickets_WA",
+    "Q_Auditorias",
+    # ventas $
+    "Ventas_Totales", "Ventas_Compartidas", "Ventas_Exclusivas",
+    # ventas volumen
+    "Q_journeys", "Q_pasajeros", "Q_pasajeros_exclusives", "Q_pasajeros_compartidas",
+    # otros operativos
+    "OFF_TIME", "Duracion_90", "Duracion_30", "Abandonados", "Rescates",
+    # inspecciones
+    "Inspecciones_Q",
+    "Cump_Exterior", "Incump_Exterior",
+    "Cump_Interior", "Incump_Interior",
+    "Cump_Conductor", "Incump_Conductor",
+]
+
+MEAN_COLS = [
+    "CSAT", "NPS Score", "Firt (h)", "Furt (h)",
+    "firt_pct", "furt_pct", "Nota_Auditorias",
+]
+
+OPERATIVOS = ["OFF_TIME", "Duracion_90", "Duracion_30", "Abandonados", "Rescates"]
+PCT_COLS = [f"{op}_pct_pasajeros" for op in OPERATIVOS]
+
+
+def construir_diario(
     df_ventas, df_perf, df_aud, df_off, df_dur, df_dur30,
     df_insp, df_aband, df_resc, df_whatsapp,
-    date_from, date_to
+    date_from=None, date_to=None,
 ):
-    v = process_ventas(df_ventas)
-    p = process_performance(df_perf)
-    a = process_auditorias(df_aud)
-    o = process_offtime(df_off)
-    d = process_duracion(df_dur)
-    d30 = process_duracion30(df_dur30)
-    insp = process_inspecciones(df_insp)
-    ab = process_abandonados(df_aband)
-    resc = process_rescates(df_resc)
-    wa = process_whatsapp(df_whatsapp)
-
-    # MERGE
-    df = (
-        v.merge(p, on="fecha", how="outer")
-         .merge(a, on="fecha", how="outer")
-         .merge(o, on="fecha", how="outer")
-         .merge(d, on="fecha", how="outer")
-         .merge(d30, on="fecha", how="outer")
-         .merge(insp, on="fecha", how="outer")
-         .merge(ab, on="fecha", how="outer")
-         .merge(resc, on="fecha", how="outer")
-         .merge(wa, on="fecha", how="outer")
-    )
-
-    # Filtrar rango
-    df = df[(df["fecha"] >= date_from) & (df["fecha"] <= date_to)]
-    df = df.sort_values("fecha")
-
-    # --- columnas base
-    sum_cols = [
-        # performance / calidad
-        "Q_Encuestas", "Reopen", "Q_Ticket", "Q_Tickets_Resueltos",
-        "Q_Tickets_WA",
-        "Q_Auditorias",
-        # ventas $
-        "Ventas_Totales", "Ventas_Compartidas", "Ventas_Exclusivas",
-        # ventas volumen
-        "Q_journeys", "Q_pasajeros", "Q_pasajeros_exclusives", "Q_pasajeros_compartidas",
-        # otros operativos
-        "OFF_TIME", "Duracion_90", "Duracion_30", "Abandonados", "Rescates",
-        # inspecciones
-        "Inspecciones_Q",
-        "Cump_Exterior", "Incump_Exterior",
-        "Cump_Interior", "Incump_Interior",
-        "Cump_Conductor", "Incump_Conductor",
-    ]
+    """
+    Etapa 1 (independiente del rango): tabla diaria completa con todos los KPIs
+    de las 10 fuentes. Todo lo que hace es fila a fila, así que se puede
+    calcular una vez y luego recortar con construir_vistas para cualquier rango.
 
-    mean_cols = [
-        "CSAT", "NPS Score", "Firt (h)", "Furt (h)",
-        "firt_pct", "furt_pct", "Nota_Auditorias",
-    ]
+    Con date_from / date_to, cada process_* descarta las filas fuera del rango
+    apenas calcula la fecha y la tabla solo trae esos días (para una sola
+    consulta; si se va a recortar a varios rangos, conviene la tabla completa).
+    """
+    rango = {"date_from": date_from, "date_to": date_to}
+    return completar_diario([
+        process_ventas(df_ventas, **rango),
+        process_performance(df_perf, **rango),
+        process_auditorias(df_aud, **rango),
+        process_offtime(df_off, **rango),
+        process_duracion(df_dur, **rango),
+        process_duracion30(df_dur30, **rango),
+        process_inspecciones(df_insp, **rango),
+        process_abandonados(df_aband, **rango),
+        process_rescates(df_resc, **rango),
+        process_whatsapp(df_whatsapp, **rango),
+    ])
+
+
+@trazar()
+def completar_diario(frames):
+    """
+    Une los resultados diarios de los process_* (en el orden de construir_diario)
+    y agrega rellenos y ratios por pasajeros.
+    """
+    # MERGE: un solo concat alineado por fecha (en vez de 9 merges encadenados)
+    df = combinar_por_fecha(frames)
 
     # Relleno sumas
-    for c in sum_cols:
+    for c in SUM_COLS:
         if c in df.columns:
             df[c] = df[c].fillna(0)
 
     # Promedios: NO convertir Nota_Auditorias 0 en NaN
-    for c in mean_cols:
+    for c in MEAN_COLS:
         if c in df.columns and c != "Nota_Auditorias":
             df[c] = df[c].replace({0: np.nan})
 
     # ---------------------------------------------------------
     # % Operativos respecto a pasajeros (NUEVO)
     # ---------------------------------------------------------
-    operativos = ["OFF_TIME", "Duracion_90", "Duracion_30", "Abandonados", "Rescates"]
-    pct_cols = []
-    for op in operativos:
+    for op in OPERATIVOS:
         colp = f"{op}_pct_pasajeros"
         df[colp] = safe_pct(df[op], df["Q_pasajeros"]).round(4)
-        pct_cols.append(colp)
 
-    # ---------------------------------------------------------
-    # SEMANAL
-    # ---------------------------------------------------------
-    df_sem = df.copy()
-    df_sem["Semana"] = df_sem["fecha"].apply(semana_humana)
+    return df
+
+
+@trazar()
+def resumen_semanal(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vista semanal (lun-dom): agrupa por la clave entera de semana del
+    calendario (orden cronológico, sin choques entre años) y toma la
+    etiqueta ya rotulada de cada semana.
+    """
+    cal = dimension_fechas(df["fecha"])
+    clave = cal["clave_semana"].to_numpy()
 
-    agg = {c: "sum" for c in sum_cols}
-    agg.update({c: "mean" for c in mean_cols})
-    df_sem = df_sem.groupby("Semana", as_index=False).agg(agg)
+    agg = {c: "sum" for c in SUM_COLS}
+    agg.update({c: "mean" for c in MEAN_COLS})
+    df_sem = df.groupby(clave).agg(agg)
+
+    etiquetas = pd.Series(cal["etiqueta_semana"].array, index=clave)
+    etiquetas = etiquetas[~etiquetas.index.duplicated()]
+    df_sem.insert(0, "Semana", etiquetas.reindex(df_sem.index).array)
+    df_sem = df_sem.reset_index(drop=True)
 
     # recalcular % operativos en semanal como (sum op / sum pasajeros)
-    for op in operativos:
+    for op in OPERATIVOS:
         colp = f"{op}_pct_pasajeros"
         df_sem[colp] = safe_pct(df_sem[op], df_sem["Q_pasajeros"]).round(4)
+    return df_sem
+
+
+def construir_vistas(df_full, date_from, date_to):
+    """
+    Etapa 2 (barata): recorta la tabla diaria al rango y arma las vistas
+    semanal, periodo y traspuesta.
+    """
+    # Filtrar rango
+    with etapa("filtro_rango", len(df_full)) as reg:
+        df = df_full[(df_full["fecha"] >= date_from) & (df_full["fecha"] <= date_to)]
+        df = df.sort_values("fecha")
+        reg["filas_out"] = len(df)
 
     # ---------------------------------------------------------
-    # PERIODO
+    # SEMANAL
     # ---------------------------------------------------------
-    df_per = df.copy()
-    df_per["Periodo"] = f"{date_from.date()} → {date_to.date()}"
+    with etapa("vista_semanal", len(df)) as reg:
+        df_sem = resumen_semanal(df)
+        reg["filas_out"] = len(df_sem)
 
-    agg2 = {c: "sum" for c in sum_cols}
-    agg2.update({c: "mean" for c in mean_cols})
-    df_per = df_per.groupby("Periodo", as_index=False).agg(agg2)
+    # ---------------------------------------------------------
+    # PERIODO
+    # ---------------------------------------------------------
+    with etapa("vista_periodo", len(df)) as reg:
+        agg2 = {c: "sum" for c in SUM_COLS}
+        agg2.update({c: "mean" for c in MEAN_COLS})
+        df_per = (
+            df.assign(Periodo=f"{date_from.date()} → {date_to.date()}")
+            .groupby("Periodo", as_index=False)
+            .agg(agg2)
+        )
 
-    for op in operativos:
-        colp = f"{op}_pct_pasajeros"
-        df_per[colp] = safe_pct(df_per[op], df_per["Q_pasajeros"]).round(4)
+        for op in OPERATIVOS:
+            colp = f"{op}_pct_pasajeros"
+            df_per[colp] = safe_pct(df_per[op], df_per["Q_pasajeros"]).round(4)
+        reg["filas_out"] = len(df_per)
 
     # ---------------------------------------------------------
     # Vista Traspuesta
     # ---------------------------------------------------------
-    df_transp = build_transposed_view(df, sum_cols=sum_cols, mean_cols=mean_cols, pct_cols=pct_cols)
+    df_transp = build_transposed_view(df, sum_cols=SUM_COLS, mean_cols=MEAN_COLS, pct_cols=PCT_COLS)
 
     return df, df_sem, df_per, df_transp
 
 
+def procesar_global(
+    df_ventas, df_perf, df_aud, df_off, df_dur, df_dur30,
+    df_insp, df_aband, df_resc, df_whatsapp,
+    date_from, date_to
+):
+    # El rango se empuja a los process_*: no se procesan filas que el recorte descartaría
+    df_full = construir_diario(
+        df_ventas, df_perf, df_aud, df_off, df_dur, df_dur30,
+        df_insp, df_aband, df_resc, df_whatsapp,
+        date_from, date_to,
+    )
+    return construir_vistas(df_full, date_from, date_to)
+
+
 # ============================================================
 # 📐 VISTA TRASPUESTA
 # ============================================================
 
+@trazar()
 def build_transposed_view(df_diario, sum_cols, mean_cols, pct_cols=None):
     """
     Vista traspuesta:
@@ -476,12 +750,14 @@ def build_transposed_view(df_diario, sum_cols, mean_cols, pct_cols=None):
       - KPIs en mean_cols: promedio
       - Ratios *_pct_pasajeros: se recalculan como 100 * sum(numerador) / sum(Q_pasajeros)
         (NO se promedian porcentajes diarios)
+
+    Todos los resúmenes semanales / mensuales salen de un groupby por clave
+    (domingo de la semana, mes) y la vista se arma con un único concat.
     """
     if df_diario is None or df_diario.empty:
         return pd.DataFrame()
 
-    df = df_diario.copy()
-    df["fecha"] = pd.to_datetime(df["fecha"]).dt.normalize()
+    df = df_diario.assign(fecha=pd.to_datetime(df_diario["fecha"]).dt.normalize())
     df = df.sort_values("fecha")
 
     # KPIs = todas las columnas excepto fecha
@@ -494,75 +770,63 @@ def build_transposed_view(df_diario, sum_cols, mean_cols, pct_cols=None):
     else:
         pct_cols = [c for c in pct_cols if c in df.columns]
 
-    meses = {
-        1: "Enero", 2: "Febrero", 3: "Marzo", 4: "Abril", 5: "Mayo", 6: "Junio",
-        7: "Julio", 8: "Agosto", 9: "Septiembre", 10: "Octubre", 11: "Noviembre", 12: "Diciembre"
-    }
+    # Columnas numéricas para los resúmenes (objetos -> numérico, p.ej. fuentes vacías)
+    valores = df[kpis].apply(
+        lambda s: pd.to_numeric(s, errors="coerce") if s.dtype == object else s
+    )
 
-    def week_label(start_date, end_date):
-        return f"Semana {start_date.day:02d} al {end_date.day:02d} {meses[end_date.month]} {end_date.year}"
-
-    def month_label(any_date):
-        return f"Mes {meses[any_date.month]} {any_date.year}"
-
-    def recompute_pct(subdf, op_name):
-        denom = subdf.get("Q_pasajeros", pd.Series([0] * len(subdf), index=subdf.index)).sum()
-        if denom == 0:
-            return np.nan
-        return (subdf[op_name].sum() / denom) * 100.0
-
-    all_dates = sorted(df["fecha"].unique())
-    all_dates = [pd.to_datetime(d).normalize() for d in all_dates]
-
-    result = pd.DataFrame(index=kpis)
-
-    for i, d in enumerate(all_dates):
-        day_df = df[df["fecha"] == d]
-        col_day = d.strftime("%d/%m/%Y")
-
-        # Columna diaria
-        row = day_df[kpis]
-        result[col_day] = row.iloc[0] if len(row) > 0 else np.nan
-
-        # Columna semanal (si domingo)
-        if d.weekday() == 6:
-            ws = d - pd.Timedelta(days=6)
-            week_df = df[(df["fecha"] >= ws) & (df["fecha"] <= d)]
-
-            label = week_label(ws, d)
-            vals = []
-            for k in kpis:
-                if k in pct_cols:
-                    op = k.replace("_pct_pasajeros", "")
-                    vals.append(recompute_pct(week_df, op))
-                elif k in sum_cols:
-                    vals.append(week_df[k].sum())
-                elif k in mean_cols:
-                    vals.append(week_df[k].mean())
-                else:
-                    vals.append(np.nan)
-            result[label] = vals
-
-        # Columna mensual (cuando cambia el mes EN LA SERIE)
-        next_d = all_dates[i + 1] if i + 1 < len(all_dates) else None
-        is_month_boundary = (next_d is None) or (next_d.month != d.month) or (next_d.year != d.year)
-        if is_month_boundary:
-            ms = d.replace(day=1)
-            month_df = df[(df["fecha"] >= ms) & (df["fecha"] <= d)]
-
-            label = month_label(d)
-            vals = []
-            for k in kpis:
-                if k in pct_cols:
-                    op = k.replace("_pct_pasajeros", "")
-                    vals.append(recompute_pct(month_df, op))
-                elif k in sum_cols:
-                    vals.append(month_df[k].sum())
-                elif k in mean_cols:
-                    vals.append(month_df[k].mean())
-                else:
-                    vals.append(np.nan)
-            result[label] = vals
+    def resumir(clave: pd.Series) -> pd.DataFrame:
+        """Fila por clave con la regla de agregación de cada KPI."""
+        g = valores.groupby(clave.to_numpy())
+        sumas = g.sum()
+        medias = g.mean()
+        denom = sumas["Q_pasajeros"] if "Q_pasajeros" in sumas.columns else pd.Series(0.0, index=sumas.index)
+        denom = denom.where(denom != 0)
+
+        cols = {}
+        for k in kpis:
+            if k in pct_cols:
+                op = k.replace("_pct_pasajeros", "")
+                cols[k] = (sumas[op] / denom) * 100.0
+            elif k in sum_cols:
+                cols[k] = sumas[k]
+            elif k in mean_cols:
+                cols[k] = medias[k]
+            else:
+                cols[k] = pd.Series(np.nan, index=sumas.index)
+        return pd.DataFrame(cols, index=sumas.index).astype(float)
+
+    fechas = df["fecha"]
+    unicas = pd.DatetimeIndex(fechas.drop_duplicates())
+    cal = dimension_fechas(fechas)
+    # Una fila del calendario por fecha presente (en orden)
+    cal_unicas = cal[~fechas.duplicated().to_numpy()].set_index(unicas)
+
+    # Diario: primera fila de cada fecha
+    dias = df.drop_duplicates("fecha").set_index("fecha")[kpis]
+    bloque_dias = dias.T
+    bloque_dias.columns = cal_unicas["etiqueta_dia"].to_numpy()
+    orden = [(unicas, np.zeros(len(unicas), dtype=int))]
+
+    # Semanal: semanas lun-dom cuyo domingo está en la serie
+    cierres = cal_unicas[cal_unicas["domingo_en_serie"]]
+    sem = resumir(cal["clave_semana"]).loc[cierres["clave_semana"].to_numpy()]
+    bloque_sem = sem.T
+    bloque_sem.columns = cierres["etiqueta_semana_traspuesta"].to_numpy()
+    orden.append((cierres.index, np.ones(len(cierres), dtype=int)))
+
+    # Mensual: se cierra en la última fecha del mes presente en la serie
+    cierres = cal_unicas[cal_unicas["fin_mes_en_serie"]]
+    mes = resumir(cal["clave_mes"]).loc[cierres["clave_mes"].to_numpy()]
+    bloque_mes = mes.T
+    bloque_mes.columns = cierres["etiqueta_mes"].to_numpy()
+    orden.append((cierres.index, np.full(len(cierres), 2)))
+
+    # Orden de columnas: por fecha y, dentro de la fecha, día -> semana -> mes
+    claves_fecha = np.concatenate([o[0].to_numpy() for o in orden])
+    claves_tipo = np.concatenate([o[1] for o in orden])
+    result = pd.concat([bloque_dias, bloque_sem, bloque_mes], axis=1)
+    result = result.iloc[:, np.lexsort((claves_tipo, claves_fecha))]
 
     # Grupos de KPI (mantener orden + asegurar KPIs nuevos)
     grupos = {
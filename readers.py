@@ -0,0 +1,168 @@
+import csv
+import importlib.util
+from io import StringIO
+
+import pandas as pd
+
+from esquemas import ESQUEMAS, nombres_aceptados
+from perfilado import trazar
+
+# ============================================================
+# 📥 LECTURA DE ARCHIVOS
+# ============================================================
+
+BOM_UTF8 = b"\xef\xbb\xbf"
+
+# Textos que read_csv toma como NaN por defecto (los motores opcionales leen
+# los CSV como texto y los marcan nulos igual que pandas)
+VALORES_NULOS = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+# Bytes iniciales usados para adivinar el separador
+PREFIJO_SNIFF = 64 * 1024
+
+# calamine (Rust) si está instalado; si no, openpyxl (pandas lo abre en modo read_only)
+EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else "openpyxl"
+
+
+def normalizar_header(col) -> str:
+    """Misma limpieza de encabezados que clean_cols (BOM + espacios)."""
+    return str(col).replace("ï»¿", "").replace("\ufeff", "").strip()
+
+
+def preparar_csv(uploaded_file, sep=None):
+    """
+    Lee solo un prefijo acotado del archivo para detectar el BOM, el encabezado
+    y (si no se indica) el separador. Deja el cursor justo después del BOM.
+    Retorna (sep, encabezado); encabezado es None si no cabe en el prefijo.
+    """
+    uploaded_file.seek(0)
+    head = uploaded_file.read(PREFIJO_SNIFF)
+
+    inicio = len(BOM_UTF8) if head.startswith(BOM_UTF8) else 0
+    muestra = head[inicio:]
+
+    if sep is None:
+        # Solo líneas completas del prefijo (si el archivo es más largo)
+        completa = muestra
+        if len(head) == PREFIJO_SNIFF and b"\n" in completa:
+            completa = completa[: completa.rfind(b"\n")]
+        sep = ";" if completa.count(b";") > completa.count(b",") else ","
+
+    encabezado = None
+    if b"\n" in muestra or len(head) < PREFIJO_SNIFF:
+        primera = muestra.split(b"\n", 1)[0].rstrip(b"\r").decode("latin-1")
+        encabezado = next(csv.reader(StringIO(primera), delimiter=sep), [])
+
+    uploaded_file.seek(inicio)
+    return sep, encabezado
+
+
+def proyectar(encabezado, fuente: str):
+    """
+    (usecols, dtype) con los nombres tal como vienen en el archivo, para las
+    columnas del esquema de la fuente (match tolerante a BOM / espacios / alias).
+    """
+    aceptados = nombres_aceptados(fuente)
+    dtypes = ESQUEMAS[fuente]["dtypes"]
+
+    usecols, dtype = [], {}
+    for h in encabezado:
+        canon = aceptados.get(normalizar_header(h))
+        if canon is None:
+            continue
+        usecols.append(h)
+        if canon in dtypes:
+            dtype[h] = dtypes[canon]
+    return usecols, dtype
+
+
+def columnas_canonicas(encabezado, fuente: str) -> dict:
+    """
+    {nombre canónico: columna del archivo} para las columnas del esquema de la
+    fuente. Entre varias que corresponden al mismo nombre canónico queda la que
+    usa el process_*: el canónico antes que sus alias (orden de
+    nombres_aceptados) y, entre iguales, la primera del archivo. Los motores
+    opcionales la usan para renombrar las columnas antes de consultarlas.
+    """
+    aceptados = nombres_aceptados(fuente)
+    prioridad = {n: i for i, n in enumerate(aceptados)}
+    usecols, _ = proyectar(encabezado, fuente)
+    columnas = {}
+    for h in sorted(usecols, key=lambda h: prioridad[normalizar_header(h)]):
+        columnas.setdefault(aceptados[normalizar_header(h)], h)
+    return columnas
+
+
+@trazar()
+def read_generic_csv(uploaded_file, sep=None, fuente=None, **kwargs):
+    """
+    CSV latin-1 con separador ';' o ',' (el más frecuente en el prefijo).
+    Los bytes se entregan directo al parser C de pandas, sin copias intermedias.
+    Con fuente (clave de ESQUEMAS) solo se parsean las columnas que usa su processor.
+    """
+    sep, encabezado = preparar_csv(uploaded_file, sep)
+    if fuente is not None and encabezado is not None:
+        usecols, dtype = proyectar(encabezado, fuente)
+        kwargs.setdefault("usecols", usecols)
+        kwargs.setdefault("dtype", dtype)
+    try:
+        return pd.read_csv(uploaded_file, sep=sep, encoding="latin-1", engine="c", **kwargs)
+    finally:
+        uploaded_file.seek(0)
+
+
+def read_csv_por_bloques(uploaded_file, filas: int, sep=None, fuente=None, dtype=None, **kwargs):
+    """
+    Igual que read_generic_csv, pero entrega el archivo en DataFrames de a lo
+    más filas filas (read_csv con chunksize): nunca hay más de un bloque
+    parseado en memoria. dtype se suma a los dtypes del esquema de la fuente.
+    """
+    sep, encabezado = preparar_csv(uploaded_file, sep)
+    tipos = {}
+    if fuente is not None and encabezado is not None:
+        usecols, tipos = proyectar(encabezado, fuente)
+        kwargs.setdefault("usecols", usecols)
+    tipos.update(dtype or {})
+    try:
+        with pd.read_csv(
+            uploaded_file, sep=sep, encoding="latin-1", engine="c", chunksize=filas, dtype=tipos or None, **kwargs
+        ) as lector:
+            yield from lector
+    finally:
+        uploaded_file.seek(0)
+
+
+def read_auditorias_csv(uploaded_file, **kwargs):
+    # Auditorías viene tabulado con ';'
+    return read_generic_csv(uploaded_file, sep=";", **kwargs)
+
+
+@trazar()
+def read_excel_source(uploaded_file, usecols=None, fuente=None, engine=None, **kwargs):
+    """
+    .xlsx con el motor más rápido disponible. usecols: nombres de columnas a
+    conservar (comparados con el header normalizado); el resto no se materializa.
+    Con fuente, usecols y dtypes salen de ESQUEMAS.
+    """
+    engine = engine or EXCEL_ENGINE
+    aceptados = nombres_aceptados(fuente) if fuente is not None else None
+    if usecols is None and aceptados is not None:
+        usecols = aceptados
+    if usecols is not None:
+        wanted = set(usecols)
+        usecols = lambda c: normalizar_header(c) in wanted  # noqa: E731
+    try:
+        df = pd.read_excel(uploaded_file, engine=engine, usecols=usecols, **kwargs)
+    finally:
+        uploaded_file.seek(0)
+
+    if aceptados is not None:
+        dtypes = ESQUEMAS[fuente]["dtypes"]
+        for c in df.columns:
+            canon = aceptados.get(normalizar_header(c))
+            if canon in dtypes:
+                df[c] = df[c].astype(dtypes[canon])
+    return df
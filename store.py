@@ -0,0 +1,139 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+
+import pandas as pd
+
+from ingesta import FUENTES
+from processor import completar_diario
+
+# ============================================================
+# 📚 HISTÓRICO INCREMENTAL DE KPIs DIARIOS (SQLite)
+# ============================================================
+
+STORE_PATH = os.environ.get("CLAIRPORT_STORE", "clairport_kpis.sqlite")
+
+
+def _tabla(fuente: str) -> str:
+    return f'"diario_{fuente}"'
+
+
+def _col(nombre: str) -> str:
+    return '"' + nombre.replace('"', '""') + '"'
+
+
+class KpiStore:
+    """
+    Agregados diarios por fuente (lo que devuelve cada process_*), una tabla
+    por fuente con fecha como clave primaria.
+
+      - upsert: el período que cubre el export nuevo de una fuente reemplaza
+        al guardado de esa fuente (también los días en que ahora no tiene
+        filas); el resto del histórico no se toca
+      - construir_diario: tabla diaria completa (igual a construir_diario)
+        armada desde el histórico, lista para construir_vistas
+    """
+
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+
+    @contextmanager
+    def _conn(self):
+        con = sqlite3.connect(self.path, timeout=30)
+        try:
+            with con:  # commit / rollback
+                yield con
+        finally:
+            con.close()
+
+    def _columnas(self, con, fuente: str) -> list:
+        filas = con.execute(f"PRAGMA table_info({_tabla(fuente)})").fetchall()
+        return [f[1] for f in filas if f[1] != "fecha"]
+
+    def _asegurar_tabla(self, con, fuente: str, diario: pd.DataFrame) -> None:
+        kpis = [c for c in diario.columns if c != "fecha"]
+        tipos = {
+            c: "INTEGER" if diario[c].dtype.kind in "iub" else "REAL"
+            for c in kpis
+        }
+        existentes = self._columnas(con, fuente)
+        if not existentes:
+            cols = ", ".join(["fecha TEXT PRIMARY KEY"] + [f"{_col(c)} {tipos[c]}" for c in kpis])
+            con.execute(f"CREATE TABLE IF NOT EXISTS {_tabla(fuente)} ({cols})")
+            return
+        # KPIs nuevos en una versión posterior del processor
+        for c in kpis:
+            if c not in existentes:
+                con.execute(f"ALTER TABLE {_tabla(fuente)} ADD COLUMN {_col(c)} {tipos[c]}")
+
+    def upsert(self, fuente: str, diario: pd.DataFrame, desde=None, hasta=None) -> int:
+        """
+        Reemplaza el período [desde, hasta] de la fuente por los días de
+        diario. Retorna días escritos.
+
+        Los process_* no devuelven fila para un día sin eventos: los días del
+        período que no vengan en diario quedan borrados (KPI 0 / sin dato),
+        no con el valor de una carga anterior. Sin desde / hasta, el período
+        es el de las fechas de diario.
+        """
+        diario = diario[diario["fecha"].notna()]
+        kpis = [c for c in diario.columns if c != "fecha"]
+
+        fechas = pd.to_datetime(diario["fecha"]).dt.strftime("%Y-%m-%d")
+        valores = diario[kpis].astype(object).where(diario[kpis].notna(), None)
+        filas = [(f, *fila) for f, fila in zip(fechas, valores.itertuples(index=False, name=None))]
+
+        if desde is None and len(fechas):
+            desde = fechas.min()
+        if hasta is None and len(fechas):
+            hasta = fechas.max()
+
+        cols = ", ".join(["fecha"] + [_col(c) for c in kpis])
+        marcas = ", ".join(["?"] * (len(kpis) + 1))
+        update = ", ".join(f"{_col(c)} = excluded.{_col(c)}" for c in kpis)
+        sql = f"INSERT INTO {_tabla(fuente)} ({cols}) VALUES ({marcas})"
+        sql += f" ON CONFLICT(fecha) DO UPDATE SET {update}" if kpis else " ON CONFLICT(fecha) DO NOTHING"
+
+        with self._conn() as con:
+            self._asegurar_tabla(con, fuente, diario)
+            if desde is not None and hasta is not None:
+                con.execute(
+                    f"DELETE FROM {_tabla(fuente)} WHERE fecha BETWEEN ? AND ?",
+                    (pd.Timestamp(desde).strftime("%Y-%m-%d"), pd.Timestamp(hasta).strftime("%Y-%m-%d")),
+                )
+            con.executemany(sql, filas)
+        return len(filas)
+
+    def upsert_frames(self, frames, desde=None, hasta=None) -> dict:
+        """
+        frames en el orden de FUENTES (como los entrega ingesta.ingerir).
+
+        Cada fuente reemplaza solo el período que cubre su propio export
+        (primera a última fecha de su tabla diaria): una fuente que trae días
+        anteriores no borra esos días de las demás. Con desde / hasta, ese
+        período explícito se reemplaza en todas las fuentes (p.ej. para dejar
+        en 0 una fuente que ahora no tiene filas en toda la carga).
+        """
+        return {fuente: self.upsert(fuente, df, desde, hasta) for fuente, df in zip(FUENTES, frames)}
+
+    def leer(self, fuente: str) -> pd.DataFrame:
+        with self._conn() as con:
+            if not self._columnas(con, fuente):
+                return pd.DataFrame(columns=["fecha"])
+            df = pd.read_sql(f"SELECT * FROM {_tabla(fuente)} ORDER BY fecha", con)
+        df["fecha"] = pd.to_datetime(df["fecha"])
+        return df
+
+    def frames(self) -> list:
+        return [self.leer(f) for f in FUENTES]
+
+    def version(self):
+        """Cambia con cada escritura (mtime y tamaño del archivo): clave para memoizar lecturas."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def construir_diario(self) -> pd.DataFrame:
+        return completar_diario(self.frames())